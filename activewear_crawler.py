@@ -1,14 +1,33 @@
 import requests
-from bs4 import BeautifulSoup
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-import time
-import csv
+import asyncio
 import json
-from datetime import datetime
+import threading
+import time
+from collections import Counter
+from functools import partial
+from itertools import islice
+from urllib.parse import urlparse
+from shopify_client import ShopifyClient, product_to_record, product_url_for, base_url_of
+from brand_engine import BrandEngine
+from async_fetcher import AsyncFetcher
+from crawl_scheduler import CrawlScheduler, DriverPool, ResultStore
+from crawl_state import CrawlState
+from snapshot_store import SnapshotStore, print_diff_summary
+from checkpoint import CrawlCheckpoint
+from record_sinks import SinkPipeline
+from crawl_metrics import CrawlMetrics, ProductProfiler
+from fixture_corpus import FixtureRecorder
+from failures import ERROR_KINDS, CrawlError, DeadLetterQueue, RetryPolicy
+from fabric_analysis import DEFAULT_ANALYZER, analyze_fabric
+from parse_pipeline import ParsePipeline
+from variants import as_variants
+from url_frontier import UrlFrontier, canonical_product_url, collection_name
+from crawler_config import CRAWL_CONFIG, BRAND_CONFIGS, EXPORT_CONFIG
+from browser_profile import build_chrome_options, block_resources, BROWSER_PROFILES
+from robots import RobotsCache
+from sitemap import SitemapReader
+from pacing import AdaptivePacer, wait_for_ready, scroll_until_stable, PRODUCT_READY_SELECTOR, PRODUCT_LINK_SELECTOR
 
 class ActivewearCrawler:
     """
@@ -16,482 +35,944 @@ class ActivewearCrawler:
     Extracts product details with focus on Fabric Details
     """
 
-    def __init__(self, headless=True):
-        """Initialize the crawler with Selenium WebDriver"""
-        self.chrome_options = Options()
-        if headless:
-            self.chrome_options.add_argument("--headless")
-        self.chrome_options.add_argument("--no-sandbox")
-        self.chrome_options.add_argument("--disable-dev-shm-usage")
-        self.chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-
-        self.results = []
+    # Fields the browser fallback fills in when the JSON endpoints don't carry them
+    FALLBACK_FIELDS = ["Product Name", "Price", "Fabric Details", "Description"]
+
+    # Files run_full_crawl() streams records into when no outputs were given
+    DEFAULT_OUTPUTS = ["activewear_products.csv", "activewear_products.json"]
+
+    def __init__(self, headless=True, engine="http", browser_fallback=True, workers=None, per_domain_limit=None,
+                 incremental=False, state_path=None, resume=False, checkpoint_dir=None,
+                 outputs=None, keep_results=True, max_per_category=None, browser_profile="light",
+                 metrics_path=None, metrics_port=None, profile=None, record_to=None, base_urls=None,
+                 parse_processes=None, rows=None, snapshot_db=None, categories=None):
+        """
+        Initialize the crawler
+
+        engine: "http" reads the Shopify JSON endpoints and only opens Chrome for missing fields,
+                "async" does the same over asyncio, parsing product HTML instead of opening Chrome,
+                "browser" renders every page with Selenium
+        browser_fallback: render the product page when the JSON lacks a field (e.g. fabric details)
+        workers: size of the product worker pool (and of the WebDriver pool)
+        per_domain_limit: max concurrent requests against any one brand site (given explicitly, it also caps the
+                          async engine's connections per host, which otherwise default to CRAWL_CONFIG['async_per_host'])
+        incremental: skip products unchanged since the last run (state kept in SQLite at state_path)
+        resume: continue an interrupted crawl from its checkpoint instead of starting fresh
+        checkpoint_dir: where the frontier and record journal are written as the crawl proceeds
+        outputs: files to stream records into as they are extracted (.csv, .json, .jsonl, optionally .gz)
+        keep_results: also hold every record in self.results; turn off for flat memory on huge catalogs
+        max_per_category: cap on products discovered per category (default CRAWL_CONFIG['max_products_per_category'],
+                          None for the full catalog)
+        browser_profile: "light" blocks images, media, fonts and analytics and hands pages over at
+                         DOMContentLoaded; "full" loads pages like a normal browser
+        metrics_path: append a JSON-lines metrics snapshot here after each brand and at close()
+        metrics_port: serve Prometheus metrics at http://127.0.0.1:<port>/metrics while crawling
+        profile: cProfile every product crawl and save the merged stats to this path at close()
+        record_to: save every fetched page into a compressed fixture corpus in this directory
+                   (replay it offline with benchmarks/bench_corpus.py)
+        base_urls: {brand key: base URL} to crawl instead of the configured sites, e.g. a local
+                   mock_shopify.MockShopifyServer's base_urls (default CRAWL_CONFIG['base_url_overrides'])
+        parse_processes: parse and extract fetched product pages in this many worker processes instead of on
+                         the fetch threads (default CRAWL_CONFIG['parse_processes']; 0 parses inline)
+        rows: "product" exports one row per product (variants summarized), "variant" one row per
+              size/colour variant (default EXPORT_CONFIG['rows'])
+        snapshot_db: append every record to this SQLite history of all crawls (default
+                     EXPORT_CONFIG['snapshot_db']; False keeps no history)
+        categories: only crawl these of each brand's configured collections, by handle or path
+                    (e.g. ["leggings", "sports-bras"]; default all of them)
+        """
+        self.engine = engine
+        self.browser_fallback = browser_fallback
+        base_urls = base_urls or CRAWL_CONFIG.get('base_url_overrides') or {}
+        brand_configs = {key: dict(config, base_url=base_urls.get(key, config['base_url']))
+                         for key, config in BRAND_CONFIGS.items()}
+        if categories:
+            wanted = {collection_name(category) for category in categories}
+            for config in brand_configs.values():
+                config['categories'] = [path for path in config['categories'] if collection_name(path) in wanted]
+        self.brands = {
+            key: BrandEngine(key, config, parser=CRAWL_CONFIG.get('parser', 'lxml'))
+            for key, config in brand_configs.items()
+        }
+
+        # Stage timings and per-brand counters (pages, errors, fabric found vs "N/A", ...)
+        self.metrics = CrawlMetrics({urlparse(brand.base_url).netloc: brand.name for brand in self.brands.values()})
+        self.metrics_path = metrics_path or CRAWL_CONFIG.get('metrics_jsonl')
+        metrics_port = metrics_port or CRAWL_CONFIG.get('metrics_port')
+        self.metrics_server = self.metrics.serve_prometheus(metrics_port) if metrics_port else None
+        self.profile_path = profile
+        self.profiler = ProductProfiler() if profile else None
+
+        self.recorder = None
+        if record_to:
+            self.recorder = FixtureRecorder(record_to, {urlparse(b.base_url).netloc: key for key, b in self.brands.items()})
+
+        # Fetch threads hand product pages to worker processes through a bounded queue
+        if parse_processes is None:
+            parse_processes = CRAWL_CONFIG.get('parse_processes', 0)
+        self.parse_pipeline = None
+        if parse_processes:
+            self.parse_pipeline = ParsePipeline(
+                brand_configs,
+                processes=parse_processes,
+                queue_size=CRAWL_CONFIG.get('parse_queue_size', 64),
+                parser=CRAWL_CONFIG.get('parser', 'lxml'),
+                metrics=self.metrics,
+            )
+
+        robots = RobotsCache(CRAWL_CONFIG['user_agent']) if CRAWL_CONFIG.get('respect_robots_txt', True) else None
+        self.pacer = AdaptivePacer.from_config(CRAWL_CONFIG, robots=robots, metrics=self.metrics)
+        self.shopify = ShopifyClient(user_agent=CRAWL_CONFIG['user_agent'], timeout=CRAWL_CONFIG.get('request_timeout', 15),
+                                     pacer=self.pacer, metrics=self.metrics, recorder=self.recorder)
+        # Transient failures are retried with backoff; products that still fail are queued for a later retry pass
+        self.retry = RetryPolicy.from_config(CRAWL_CONFIG)
+        self.failures = DeadLetterQueue(CRAWL_CONFIG.get('dead_letter_queue', 'crawl_failures.jsonl'))
+        self.sitemaps = (SitemapReader(self.shopify, robots=robots, retry=self.retry)
+                         if CRAWL_CONFIG.get('use_sitemaps', True) else None)
+        # Sitemap <lastmod> per product found through a sitemap, standing in for updated_at
+        self.lastmods = {}
+
+        workers = workers or CRAWL_CONFIG.get('workers', 1)
+        self.per_host_limit = per_domain_limit or CRAWL_CONFIG.get('async_per_host', 16)
+        per_domain_limit = per_domain_limit or CRAWL_CONFIG.get('per_domain_concurrency', workers)
+        self.scheduler = CrawlScheduler(workers=workers, per_domain_limit=per_domain_limit)
+
+        self.drivers = DriverPool(self.init_driver, size=workers, max_pages=CRAWL_CONFIG.get('driver_max_pages'))
+
+        self.state = None
+        if incremental:
+            self.state = CrawlState(state_path or CRAWL_CONFIG.get('state_db', 'crawl_state.db'))
+            self.state.start_run()
+
+        # Append-only history across runs: price/stock changes and diffs between any two crawls
+        snapshot_db = EXPORT_CONFIG.get('snapshot_db') if snapshot_db is None else snapshot_db
+        self.snapshots = None
+        if snapshot_db:
+            self.snapshots = SnapshotStore(snapshot_db)
+            if resume:
+                # The interrupted attempt's crawl is carried on, not left behind as a partial one
+                self.snapshots.resume_latest()
+            else:
+                self.snapshots.start_crawl()
+
+        self.browser_profile = browser_profile
+        self.chrome_options = build_chrome_options(
+            browser_profile,
+            headless=headless,
+            window_size=CRAWL_CONFIG.get('window_size'),
+            user_agent=CRAWL_CONFIG['user_agent'],
+        )
+
+        self.rows = rows or EXPORT_CONFIG.get('rows', 'product')
+        # Brand keys whose crawl discovered no products at all
+        self.failed_brands = []
+        self.results = ResultStore(keep=keep_results)
+        self.frontier = UrlFrontier()
+        self.max_per_category = max_per_category or CRAWL_CONFIG.get('max_products_per_category')
+
+        self.checkpoint = CrawlCheckpoint(checkpoint_dir or CRAWL_CONFIG.get('checkpoint_dir', 'crawl_checkpoint'),
+                                          resume=resume)
+        self.resume = resume
+        # A resumed crawl's journal is replayed once, into the results and the outputs open at the time
+        self._replayed = not resume
+        self._replay_lock = threading.Lock()
+
+        self.sinks = None
+        if outputs:
+            self.open_outputs(outputs)
+        self._closed = False
 
     def init_driver(self):
-        """Initialize Chrome WebDriver"""
-        return webdriver.Chrome(options=self.chrome_options)
-
-    # ==================== KICA ACTIVE ====================
-    def crawl_kica(self):
-        """Crawl all products from Kica Active"""
-        print("\n=== Starting Kica Active Crawl ===")
-
-        categories = [
-            "https://kicaactive.com/collections/all",
-            "https://kicaactive.com/collections/sports-bras",
-            "https://kicaactive.com/collections/leggings",
-            "https://kicaactive.com/collections/tops",
-            "https://kicaactive.com/collections/flare-pants",
-            "https://kicaactive.com/collections/shorts",
-            "https://kicaactive.com/collections/tracks",
-            "https://kicaactive.com/collections/co-ord-sets"
-        ]
-
-        driver = self.init_driver()
+        """Initialize Chrome WebDriver with the crawler's browser profile"""
+        driver = webdriver.Chrome(options=self.chrome_options)
+        # A hung page raises TimeoutException (retried) instead of blocking its worker forever
+        driver.set_page_load_timeout(CRAWL_CONFIG.get('page_load_timeout', 30))
+        driver.set_script_timeout(CRAWL_CONFIG.get('page_load_timeout', 30))
+        if BROWSER_PROFILES[self.browser_profile]['block_resources']:
+            block_resources(driver)
+        return driver
+
+    def open_outputs(self, paths):
+        """Start streaming records into the given files (a resumed crawl replays its journal when a brand starts)"""
+        self.sinks = SinkPipeline.from_paths(paths, batch_size=EXPORT_CONFIG.get('flush_every', 50), rows=self.rows)
+
+    def replay_journal(self):
+        """
+        Feed the records an interrupted attempt journaled to self.results and the open outputs
+        Runs once, before the first brand is crawled; a retry pass never replays (its outputs hold only retried URLs).
+        Streams the journal record by record, so keep_results=False stays flat in memory.
+        """
+        with self._replay_lock:
+            if self._replayed:
+                return
+            self._replayed = True
+            for record in self.checkpoint.completed_records():
+                self.results.append(record)
+                if self.sinks:
+                    self.sinks.write(record)
+        print(f"Resuming crawl: {self.results.total} products already extracted")
+
+    def close_outputs(self):
+        """Finish the streaming outputs, exporting the pages still being parsed first"""
+        if self.parse_pipeline:
+            self.parse_pipeline.close()
+            self.parse_pipeline = None
+        if self.sinks:
+            self.sinks.close()
+            self.sinks = None
+
+    def close(self):
+        """
+        Stop the worker pool, quit every pooled WebDriver, finish the streaming outputs and close the
+        checkpoint, crawl state and snapshot store (once; later calls do nothing)
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.scheduler.shutdown()
+        self.close_outputs()
+        self.drivers.close()
+        if self.state:
+            self.state.finish_run()
+            self.state.close()
+        if self.snapshots:
+            self.snapshots.finish_crawl()
+            self.snapshots.close()
+        self.checkpoint.close()
+        if self.metrics_path:
+            self.metrics.write_jsonl(self.metrics_path)
+        if self.profiler:
+            self.profiler.dump(self.profile_path)
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+        if self.metrics_server:
+            self.metrics_server.shutdown()
+            self.metrics_server = None
+
+    def crawl_products(self, brand, product_links):
+        """Crawl product pages in parallel, each worker borrowing a driver from the pool"""
+        self.scheduler.map_urls(lambda url: self.profiled(self.crawl_product, brand, None, url),
+                                self.pending(product_links))
+
+    # ==================== CHECKPOINT ====================
+    def track_frontier(self, brand, category_url, urls):
+        """
+        Record a category's discovered product URLs (durably, and in the global seen-set)
+        Returns only the products no earlier category listed, so each product is crawled once.
+        """
+        self.checkpoint.add_frontier(brand.name, category_url, urls)
+        new_urls = self.frontier.add_all(urls, category_url)
+        print(f"Found {len(urls)} products in this category ({len(new_urls)} new)")
+        return new_urls
+
+    def pending(self, urls):
+        """Drop URLs a previous (interrupted) attempt already finished"""
+        pending = [url for url in urls if not self.checkpoint.is_done(url)]
+        if len(pending) < len(urls):
+            print(f"Skipping {len(urls) - len(pending)} products completed before resume")
+        return pending
+
+    def category_done(self, category_url):
+        """True if a resumed crawl already finished every product of this category"""
+        if self.checkpoint.is_category_done(category_url):
+            print(f"\nSkipping completed category: {category_url}")
+            return True
+        return False
+
+    # ==================== CATEGORY DISCOVERY ====================
+    def discover_brand(self, brand):
+        """
+        Discover every category of a brand before crawling any product, fetching categories in parallel
+        Returns {url: product JSON or None} for each product no earlier category listed, in category order.
+        Categories without products.json fall back to the brand's sitemap, and are rendered only if it has none.
+        """
+        category_urls = [url for url in brand.category_urls if not self.category_done(url)]
+        discovered = self.scheduler.map_urls(lambda url: self.discover_category(brand, url), category_urls)
+
+        sitemap = None
+        unlisted = [i for i, found in enumerate(discovered) if not found]
+        if unlisted:
+            sitemap = self.discover_sitemap(brand)
+            if sitemap is None and (self.engine == "browser" or self.browser_fallback):
+                rendered = self.scheduler.map_urls(lambda i: self.discover_rendered(brand, category_urls[i]),
+                                                   unlisted, url_of=lambda i: category_urls[i])
+                for i, found in zip(unlisted, rendered):
+                    discovered[i] = found
+
+        items = {}
+        for category_url, category_items in zip(category_urls, discovered):
+            print(f"\nCrawling category: {category_url}")
+            if category_items is None:
+                continue
+            for url in self.track_frontier(brand, category_url, list(category_items)):
+                items[url] = category_items[url]
+
+        self.count(brand.name, 'discovered', len(items))
+
+        if sitemap:
+            items.update(dict.fromkeys(self.track_sitemap(brand, sitemap)))
+        return items
+
+    def track_sitemap(self, brand, sitemap):
+        """Track a brand's sitemap products like a category; returns the new ones still to crawl"""
+        sitemap_url = f"{brand.base_url.rstrip('/')}/sitemap.xml"
+        print(f"\nCrawling sitemap: {sitemap_url}")
+        new_urls = self.track_frontier(brand, sitemap_url, list(sitemap))
+        self.count(brand.name, 'discovered', len(new_urls))
+
+        pending = []
+        for url in new_urls:
+            self.lastmods[url] = sitemap[url]
+            # <lastmod> no newer than the updated_at stored last run: unchanged, without fetching anything
+            fresh = bool(self.state and self.state.is_fresh(url, sitemap[url]))
+            if not self.skip_unchanged(brand, url, not_modified=fresh):
+                pending.append(url)
+        return pending
+
+    def discover_category(self, brand, category_url):
+        """
+        Every product in one category as {canonical url: product JSON or None}, up to max_per_category
+        Reads /products.json page by page until exhausted; {} if the store does not serve it.
+        """
+        # A resumed browser crawl reuses the links found before the interruption instead of re-rendering
+        if self.engine == "browser":
+            links = self.checkpoint.discovered_links(category_url)
+            if links is not None:
+                return dict.fromkeys(links)
 
         try:
-            for category_url in categories:
+            products = self.retry.call(
+                lambda: list(islice(self.shopify.iter_collection_products(category_url), self.max_per_category)),
+                on_retry=lambda *retry: self.retrying(brand, category_url, *retry),
+            )
+        except requests.RequestException as e:
+            self.fail_category(brand, category_url, e)
+            products = []
+
+        base_url = base_url_of(category_url)
+        return {product_url_for(base_url, product): product for product in products}
+
+    def discover_sitemap(self, brand):
+        """Every product in the brand's sitemaps as {canonical url: lastmod}, or None if it has no sitemap"""
+        if not self.sitemaps:
+            return None
+        sitemap = self.sitemaps.product_urls(brand.base_url, limit=self.max_per_category)
+        if sitemap is None:
+            print(f"• No product sitemap for {brand.name}")
+        else:
+            print(f"✓ {brand.name}: {len(sitemap)} products in sitemap")
+        return sitemap
+
+    def discover_rendered(self, brand, category_url):
+        """Product links from the rendered collection pages, or None if rendering failed"""
+        try:
+            return dict.fromkeys(self.retry.call(self.render_category, brand, category_url,
+                                                 on_retry=partial(self.retrying, brand, category_url)))
+        except Exception as e:
+            self.fail_category(brand, category_url, e)
+            return None
+
+    def render_category(self, brand, category_url):
+        """Product links from rendered collection pages, following ?page=N until a page adds no new products"""
+        links = {}
+        with self.drivers.driver() as driver:
+            for page in range(1, CRAWL_CONFIG.get('max_collection_pages', 50) + 1):
+                page_url = category_url if page == 1 else f"{category_url}?page={page}"
+                self.load_page(driver, page_url, PRODUCT_LINK_SELECTOR)
+
+                # Infinite-scroll collections load the rest of the page as we scroll
+                self.scroll_to_end(driver)
+
+                page_links = brand.product_links(self.parse_page(brand, self.page_source(driver, page_url)))
+                new_links = [url for url in page_links if url not in links]
+                if not new_links:
+                    break
+                links.update(dict.fromkeys(new_links))
+                if self.max_per_category and len(links) >= self.max_per_category:
+                    break
+
+        return list(links)[:self.max_per_category]
+
+    def count(self, brand_name, key, n=1):
+        """Add to one of a brand's product counts"""
+        self.metrics.inc(brand_name, key, n)
+
+    def report_counts(self, brand):
+        """Print how many of a brand's discovered products were crawled"""
+        counts = Counter(self.metrics.counts(brand.name))
+        line = f"✓ {brand.name}: {counts['discovered']} products discovered, {counts['crawled']} crawled"
+        if counts['unchanged']:
+            line += f", {counts['unchanged']} unchanged"
+        if counts['failed']:
+            kinds = ", ".join(f"{counts['failed_' + kind]} {kind}" for kind in ERROR_KINDS if counts['failed_' + kind])
+            line += f", {counts['failed']} failed ({kinds})" if kinds else f", {counts['failed']} failed"
+        if counts['failed_categories']:
+            line += f", {counts['failed_categories']} categories failed"
+        if counts['retries']:
+            line += f", {counts['retries']} retries"
+        if counts['crawled']:
+            line += f" (fabric details on {counts['fabric_found']}, \"N/A\" on {counts['fabric_na']})"
+        print(line)
+
+    # ==================== INSTRUMENTED STAGES ====================
+    def page_source(self, driver, url):
+        """The rendered page's HTML (saved to the fixture corpus when recording)"""
+        html = driver.page_source
+        if self.recorder:
+            self.recorder.record(url, 200, html)
+        return html
+
+    def parse_page(self, brand, html):
+        """Parse page HTML with the brand's parser backend (timed as the "parse" stage)"""
+        with self.metrics.stage('parse'):
+            return brand.parse(html)
+
+    def extract_page(self, brand, doc, url, html=None):
+        """Run the brand's extractor on a parsed page (timed as the "extract" stage)"""
+        with self.metrics.stage('extract'):
+            return brand.parse_product(doc, url, html)
+
+    def json_record(self, brand, product, url):
+        """Build a record from product JSON (timed as the "extract" stage)"""
+        with self.metrics.stage('extract'):
+            return product_to_record(brand.name, product, url, brand.fabric_keywords)
+
+    def analyze_record(self, record):
+        """Add the structured fabric fields parsed from Fabric Details (timed as the "analyze" stage)"""
+        with self.metrics.stage('analyze'):
+            record.update(analyze_fabric(record.get("Fabric Details")).to_fields())
+
+    def profiled(self, fn, *args):
+        """Run one product crawl under the cProfile hook when profiling is on"""
+        if self.profiler:
+            return self.profiler.run(fn, *args)
+        return fn(*args)
+
+    # ==================== SHOPIFY JSON ENGINE ====================
+    def save_record(self, record, etag=None, last_modified=None, updated_at=None):
+        """Keep an extracted record (and remember it in the crawl state in incremental mode)"""
+        record["Categories"] = " | ".join(self.frontier.categories_of(record['URL'])) or "N/A"
+        self.analyze_record(record)
+        with self.metrics.stage('export'):
+            self.results.append(record)
+            self.checkpoint.journal(record)
+            if self.sinks:
+                self.sinks.write(record)
+            if self.state:
+                self.state.record(record['URL'], record, etag=etag, last_modified=last_modified, updated_at=updated_at)
+            if self.snapshots:
+                self.snapshots.add(record)
+
+        self.count(record['Brand'], 'crawled')
+        self.count(record['Brand'], 'fabric_found' if record.get("Fabric Details", "N/A") != "N/A" else 'fabric_na')
+        print(f"✓ Extracted: {record['Product Name']}")
+
+    def skip_unchanged(self, brand, url, updated_at=None, not_modified=False):
+        """In incremental mode, True (and the product is marked seen) if it hasn't changed since the last run"""
+        if not self.state:
+            return False
+        if not_modified or self.state.is_unchanged(url, updated_at):
+            self.state.mark_seen(url)
+            record = self.stored_record(url)
+            if record:
+                self.keep_unchanged(record)
+            else:
+                self.checkpoint.mark_done(url)
+            self.snapshot_unchanged(url, record)
+            self.count(brand.name, 'unchanged')
+            print(f"• Unchanged: {url}")
+            return True
+        return False
+
+    # ==================== FAILURES ====================
+    def attempt(self, brand, url, fn, *args):
+        """Run one product's crawl, retrying transient failures; a product that still fails is dead-lettered"""
+        try:
+            self.retry.call(fn, *args, on_retry=partial(self.retrying, brand, url))
+        except Exception as e:
+            self.fail(brand, url, e)
+
+    def retrying(self, brand, url, attempt, kind, error, delay):
+        self.count(brand.name, 'retries')
+        print(f"• Retrying {url} in {delay:.1f}s after attempt {attempt} ({kind}: {str(error)})")
+
+    def fail(self, brand, url, error):
+        """Count a product that failed for good and queue it for --retry-failed"""
+        entry = self.failures.add(url, brand.key, error, attempts=getattr(error, 'attempts', 1),
+                                  categories=self.frontier.categories_of(url))
+        self.count(brand.name, 'failed')
+        self.count(brand.name, f"failed_{entry['kind']}")
+        print(f"✗ Error crawling {url} ({entry['kind']}): {entry['error']}")
+
+    def fail_category(self, brand, category_url, error):
+        """Queue a collection whose product listing failed for good, so --retry-failed discovers it again"""
+        entry = self.failures.add(category_url, brand.key, error, attempts=getattr(error, 'attempts', 1),
+                                  categories=(category_url,), entry_type='category')
+        self.count(brand.name, 'failed_categories')
+        print(f"✗ Error reading {category_url} ({entry['kind']}): {entry['error']}")
+
+    def stored_record(self, url):
+        """The record saved for a product on the run that last extracted it, or None"""
+        stored = self.state.get(url)
+        if not stored or not stored['record_json']:
+            return None
+        record = json.loads(stored['record_json'])
+        if "Variants" in record:
+            record["Variants"] = as_variants(record["Variants"])
+        return record
+
+    def keep_unchanged(self, record):
+        """Write an unchanged product's stored record to the outputs, so every run exports the full catalog"""
+        record["Categories"] = " | ".join(self.frontier.categories_of(record['URL'])) or record.get("Categories", "N/A")
+        with self.metrics.stage('export'):
+            self.results.append(record)
+            self.checkpoint.journal(record)
+            if self.sinks:
+                self.sinks.write(record)
+
+    def snapshot_unchanged(self, url, record=None):
+        """Keep an unchanged product in this crawl's snapshot: its last snapshot, else its stored record"""
+        if not self.snapshots or self.snapshots.carry(url):
+            return
+        if record:
+            self.snapshots.add(record)
+
+    def missing_fields(self, record):
+        """Return the fallback fields that are still "N/A" in a record"""
+        return [field for field in self.FALLBACK_FIELDS if record.get(field, "N/A") == "N/A"]
+
+    def load_page(self, driver, url, ready_selector):
+        """Load a page once the domain's backoff allows it, then wait for it to be ready (not a fixed sleep)"""
+        self.pacer.wait(url)
+        self.drivers.count_page(driver)
+        self.count(self.metrics.brand_of(url), 'pages')
+        start = time.monotonic()
+        driver.get(url)
+        wait_for_ready(driver, ready_selector, CRAWL_CONFIG.get('ready_timeout', 10))
+        elapsed = time.monotonic() - start
+        self.metrics.observe('render', elapsed)
+        self.pacer.record(url, 200, elapsed)
+        time.sleep(CRAWL_CONFIG.get('page_load_delay', 0))
+
+    def scroll_to_end(self, driver):
+        """Scroll a collection page until no more products load"""
+        with self.metrics.stage('scroll'):
+            return scroll_until_stable(
+                driver,
+                PRODUCT_LINK_SELECTOR,
+                max_scrolls=CRAWL_CONFIG.get('scroll_iterations', 10),
+                scroll_delay=CRAWL_CONFIG.get('scroll_delay', 0.15),
+                timeout=CRAWL_CONFIG.get('scroll_timeout', 2.0),
+            )
+
+    def render_product(self, driver, url):
+        """Load a product page in Chrome (on the given driver or a pooled one) and return its HTML"""
+        if driver is not None:
+            self.load_page(driver, url, PRODUCT_READY_SELECTOR)
+            return self.page_source(driver, url)
+        with self.drivers.driver() as pooled:
+            return self.render_product(pooled, url)
+
+    def save_page_record(self, brand, url, html, record, **state):
+        """
+        Fill a record's gaps from a fetched product page and save it
+        With parse workers the page is queued for a worker process and saved later from the pipeline's export thread.
+        """
+        def finish(page_record):
+            self.save_record(self.merge_records(record, page_record), **state)
+
+        def failed(error):
+            self.fail(brand, url, error)
+
+        if self.parse_pipeline:
+            self.parse_pipeline.submit(brand.key, url, html, finish, on_error=failed)
+        else:
+            finish(self.extract_page(brand, self.parse_page(brand, html), url, html))
+
+    def merge_records(self, record, page_record):
+        """Fill the "N/A" fields (and missing variants) of a JSON record from a rendered-page record"""
+        if record is None:
+            return page_record
+        for field in self.missing_fields(record):
+            record[field] = page_record.get(field, "N/A")
+        if not record.get("Variants"):
+            record["Variants"] = page_record.get("Variants", ())
+        return record
+
+    def crawl_product(self, brand, driver, url):
+        """
+        Extract one product - JSON endpoint first, browser only for what the JSON lacks
+        driver may be None; a pooled browser is then borrowed only if it is needed
+        """
+        if self.checkpoint.is_done(url):
+            return
+        self.attempt(brand, url, self._crawl_product, brand, driver, url)
+
+    def _crawl_product(self, brand, driver, url):
+        record = None
+        etag = last_modified = updated_at = None
+
+        # In incremental mode the JSON endpoint is also the cheap change check before any rendering
+        if self.engine != "browser" or self.state:
+            headers = self.state.conditional_headers(url) if self.state else None
+            status, product, etag, last_modified = self.shopify.fetch_product(url, headers=headers)
+            updated_at = (product.get('updated_at') if product else None) or self.lastmods.get(url)
+            if self.skip_unchanged(brand, url, updated_at, not_modified=(status == 304)):
+                return
+            if product and self.engine != "browser":
+                record = self.json_record(brand, product, url)
+
+        state = {'etag': etag, 'last_modified': last_modified, 'updated_at': updated_at}
+        if record is not None and not (self.browser_fallback and self.missing_fields(record)):
+            self.save_record(record, **state)
+        elif self.engine == "http" and not self.browser_fallback:
+            # No JSON product, and Chrome is not allowed to look for it on the page
+            raise CrawlError(f"Product not found: {url}", 'other')
+        elif self.engine == "async":
+            # The async engine never opens Chrome: parse the served HTML (only reached when retrying failures)
+            response = self.shopify.get(url)
+            response.raise_for_status()
+            self.save_page_record(brand, url, response.text, record, **state)
+        else:
+            self.save_page_record(brand, url, self.render_product(driver, url), record, **state)
+
+    def crawl_brand_json(self, brand):
+        """Crawl a brand through /collections/<x>/products.json, opening Chrome only as a fallback"""
+        def crawl_json(url, product):
+            if self.skip_unchanged(brand, url, product.get('updated_at')):
+                return
+
+            record = self.json_record(brand, product, url)
+            if self.browser_fallback and self.missing_fields(record):
+                self.save_page_record(brand, url, self.render_product(None, url), record,
+                                      updated_at=product.get('updated_at'))
+            else:
+                self.save_record(record, updated_at=product.get('updated_at'))
+
+        def crawl(item):
+            url, product = item
+            if product is None:
+                # Found on a rendered collection page or in a sitemap rather than in products.json
+                self.crawl_product(brand, None, url)
+            else:
+                self.attempt(brand, url, crawl_json, url, product)
+
+        # Discover every category first, so each product is crawled once with its full category list
+        items = self.discover_brand(brand)
+        pending = [(url, items[url]) for url in self.pending(list(items))]
+        self.scheduler.map_urls(lambda item: self.profiled(crawl, item), pending, url_of=lambda item: item[0])
+
+    # ==================== ASYNC HTTP ENGINE ====================
+    def crawl_brand_async(self, brand):
+        """Crawl a brand with hundreds of JSON/HTML fetches in flight over keep-alive connections"""
+        # robots.txt is fetched with blocking requests: inside the loop it would stall every coroutine
+        self.pacer.warm(brand.base_url)
+        asyncio.run(self._crawl_brand_async(brand))
+
+    async def _crawl_brand_async(self, brand):
+        fetcher = AsyncFetcher(
+            max_in_flight=CRAWL_CONFIG.get('async_max_in_flight', 200),
+            per_host_limit=self.per_host_limit,
+            timeout=CRAWL_CONFIG.get('request_timeout', 15),
+            user_agent=CRAWL_CONFIG['user_agent'],
+            pacer=self.pacer,
+            metrics=self.metrics,
+            recorder=self.recorder,
+        )
+        async with fetcher:
+            category_urls = [url for url in brand.category_urls if not self.category_done(url)]
+            collections = await fetcher.gather(
+                self.retry.acall(partial(fetcher.get_collection_products, url, max_products=self.max_per_category),
+                                 on_retry=partial(self.retrying, brand, url))
+                for url in category_urls
+            )
+
+            tasks = []
+            unlisted = False
+            for category_url, products in zip(category_urls, collections):
                 print(f"\nCrawling category: {category_url}")
-                driver.get(category_url)
-                time.sleep(3)
-
-                # Scroll to load all products
-                for _ in range(3):
-                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-                # Find all product links
-                product_links = []
-                product_cards = soup.find_all('a', class_='product-card')
-                if not product_cards:
-                    product_cards = soup.find_all('a', href=lambda x: x and '/products/' in str(x))
-
-                for card in product_cards:
-                    href = card.get('href', '')
-                    if href and '/products/' in href:
-                        full_url = f"https://kicaactive.com{href}" if not href.startswith('http') else href
-                        if full_url not in product_links:
-                            product_links.append(full_url)
+                if isinstance(products, Exception):
+                    self.fail_category(brand, category_url, products)
+                    unlisted = True
+                    continue
+                unlisted = unlisted or not products
+
+                base_url = base_url_of(category_url)
+                items = {product_url_for(base_url, product): product for product in products}
+                new_urls = self.track_frontier(brand, category_url, list(items))
+                self.count(brand.name, 'discovered', len(new_urls))
+                for url in self.pending(new_urls):
+                    tasks.append(self._crawl_product_async(fetcher, brand, url, items[url]))
+
+            if unlisted:
+                # Same fallback as discover_brand; the sitemap reader is synchronous, so it runs on a thread
+                sitemap = await asyncio.to_thread(self.discover_sitemap, brand)
+                if sitemap:
+                    for url in self.pending(self.track_sitemap(brand, sitemap)):
+                        tasks.append(self._crawl_product_async(fetcher, brand, url, None))
+
+            await fetcher.gather(tasks)
+
+    async def _crawl_product_async(self, fetcher, brand, url, product):
+        """
+        Build a record from product JSON; fetch and parse the product HTML only for missing fields
+        product is None for sitemap products, whose JSON is then fetched from /products/<handle>.json
+        """
+        try:
+            await self.retry.acall(self._extract_product_async, fetcher, brand, url, product,
+                                   on_retry=partial(self.retrying, brand, url))
+        except Exception as e:
+            self.fail(brand, url, e)
 
-                print(f"Found {len(product_links)} products in this category")
+    async def _extract_product_async(self, fetcher, brand, url, product):
+        if product is None:
+            data = await fetcher.fetch_json(f"{url}.json")
+            product = data.get('product') if data else None
 
-                # Crawl each product
-                for product_url in product_links[:5]:  # Limit for testing, remove [:5] for full crawl
-                    self.crawl_kica_product(driver, product_url)
-                    time.sleep(1)
+        updated_at = (product.get('updated_at') if product else None) or self.lastmods.get(url)
+        if self.skip_unchanged(brand, url, updated_at):
+            return
 
-        finally:
-            driver.quit()
+        record = self.json_record(brand, product, url) if product else None
+        html = None
+        if record is None or (self.browser_fallback and self.missing_fields(record)):
+            html = await fetcher.fetch_text(url)
+            if record is None and html is None:
+                raise CrawlError(f"Product not found: {url}", 'other')
+
+        if not html:
+            self.save_record(record, updated_at=updated_at)
+        elif self.parse_pipeline:
+            # submit() blocks while the parse queue is full - wait on a thread, not the event loop
+            await asyncio.to_thread(self.save_page_record, brand, url, html, record, updated_at=updated_at)
+        else:
+            self.save_page_record(brand, url, html, record, updated_at=updated_at)
+
+    # ==================== BRAND CRAWL ====================
+    def crawl_brand(self, key):
+        """Crawl every category of one brand config (see BRAND_CONFIGS in crawler_config.py)"""
+        brand = self.brands[key]
+        self.replay_journal()
+        print(f"\n=== Starting {brand.name} Crawl ===")
+
+        if self.engine == "http":
+            self.crawl_brand_json(brand)
+        elif self.engine == "async":
+            self.crawl_brand_async(brand)
+        else:
+            # Discover every category first, so each product is rendered once with its full category list
+            product_links = list(self.discover_brand(brand))
+
+            # Crawl each product
+            self.crawl_products(brand, product_links)
+
+        if self.parse_pipeline:
+            # Counts are final once this brand's queued pages are exported
+            self.parse_pipeline.drain()
+        self.report_counts(brand)
+        if not self.metrics.counts(brand.name).get('discovered') \
+                and not any(self.checkpoint.is_category_done(url) for url in brand.category_urls):
+            # Every category and the sitemap came back empty (or failed): the crawl missed the whole brand
+            self.failed_brands.append(brand.key)
+            print(f"✗ {brand.name}: no products discovered")
+        if self.metrics_path:
+            self.metrics.write_jsonl(self.metrics_path)
+
+    def crawl_brand_product(self, key, driver, url):
+        """Extract product details from one product page of a brand"""
+        brand = self.brands[key]
+        self.profiled(self.crawl_product, brand, driver, canonical_product_url(url, brand.base_url))
+
+    # ==================== BRAND SHORTCUTS ====================
+    def crawl_kica(self):
+        """Crawl all products from Kica Active"""
+        self.crawl_brand('kica')
 
     def crawl_kica_product(self, driver, url):
         """Extract product details from Kica product page"""
-        try:
-            driver.get(url)
-            time.sleep(2)
-
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-            # Extract product name
-            product_name = soup.find('h1', class_='product-title')
-            if not product_name:
-                product_name = soup.find('h1')
-            product_name = product_name.text.strip() if product_name else "N/A"
-
-            # Extract price
-            price = soup.find('span', class_='price')
-            if not price:
-                price = soup.find('span', class_='money')
-            price_text = price.text.strip() if price else "N/A"
-
-            # Extract fabric details - CRITICAL SECTION
-            fabric_details = "N/A"
-
-            # Method 1: Look for "Fabric" or "Material" headings
-            fabric_section = soup.find(text=lambda x: x and ('fabric' in x.lower() or 'material' in x.lower()))
-            if fabric_section:
-                parent = fabric_section.find_parent()
-                if parent:
-                    # Get next siblings or children
-                    details_list = parent.find_next('ul') or parent.find_next('div')
-                    if details_list:
-                        fabric_details = details_list.get_text(separator=" | ", strip=True)
-
-            # Method 2: Check product description for fabric info
-            if fabric_details == "N/A":
-                description = soup.find('div', class_='product-description')
-                if description:
-                    desc_text = description.get_text()
-                    # Look for fabric percentages
-                    import re
-                    fabric_match = re.search(r'(\d+%.*?(?:cotton|polyester|nylon|spandex|elastane).*?)(?:\.|\n)', desc_text, re.IGNORECASE)
-                    if fabric_match:
-                        fabric_details = fabric_match.group(1).strip()
-
-            # Extract other details
-            description = soup.find('div', class_='product-description')
-            description_text = description.get_text(strip=True) if description else "N/A"
-
-            # Store result
-            product_data = {
-                "Brand": "Kica Active",
-                "Product Name": product_name,
-                "Price": price_text,
-                "Fabric Details": fabric_details,
-                "Description": description_text[:200],  # First 200 chars
-                "URL": url,
-                "Crawled At": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-
-            self.results.append(product_data)
-            print(f"✓ Extracted: {product_name}")
+        self.crawl_brand_product('kica', driver, url)
 
-        except Exception as e:
-            print(f"✗ Error crawling {url}: {str(e)}")
-
-    # ==================== BLISSCLUB ====================
     def crawl_blissclub(self):
         """Crawl all products from BlissClub"""
-        print("\n=== Starting BlissClub Crawl ===")
-
-        categories = [
-            "https://blissclub.com/collections/all",
-            "https://blissclub.com/collections/sports-bras",
-            "https://blissclub.com/collections/leggings",
-            "https://blissclub.com/collections/tops",
-            "https://blissclub.com/collections/shorts",
-            "https://blissclub.com/collections/undies"
-        ]
-
-        driver = self.init_driver()
-
-        try:
-            for category_url in categories:
-                print(f"\nCrawling category: {category_url}")
-                driver.get(category_url)
-                time.sleep(3)
-
-                # Scroll to load products
-                for _ in range(3):
-                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-                # Find product links
-                product_links = []
-                product_cards = soup.find_all('a', href=lambda x: x and '/products/' in str(x))
-
-                for card in product_cards:
-                    href = card.get('href', '')
-                    if href and '/products/' in href:
-                        full_url = f"https://blissclub.com{href}" if not href.startswith('http') else href
-                        if full_url not in product_links:
-                            product_links.append(full_url)
-
-                print(f"Found {len(product_links)} products in this category")
-
-                # Crawl each product
-                for product_url in product_links[:5]:  # Limit for testing
-                    self.crawl_blissclub_product(driver, product_url)
-                    time.sleep(1)
-
-        finally:
-            driver.quit()
+        self.crawl_brand('blissclub')
 
     def crawl_blissclub_product(self, driver, url):
         """Extract product details from BlissClub product page"""
-        try:
-            driver.get(url)
-            time.sleep(2)
-
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-            # Extract product name
-            product_name = soup.find('h1')
-            product_name = product_name.text.strip() if product_name else "N/A"
-
-            # Extract price
-            price = soup.find('span', class_='price') or soup.find('span', class_='money')
-            price_text = price.text.strip() if price else "N/A"
-
-            # Extract fabric details - CRITICAL SECTION
-            fabric_details = "N/A"
-
-            # BlissClub typically has "FABRIC DETAILS" section
-            fabric_heading = soup.find(text=lambda x: x and 'fabric details' in x.lower())
-            if fabric_heading:
-                parent = fabric_heading.find_parent()
-                # Look for list or div containing fabric info
-                fabric_list = parent.find_next('ul') or parent.find_next_sibling()
-                if fabric_list:
-                    fabric_items = fabric_list.find_all('li') if fabric_list.name == 'ul' else [fabric_list]
-                    fabric_details = " | ".join([item.get_text(strip=True) for item in fabric_items])
-
-            # Alternative: Check for accordion or tab content
-            if fabric_details == "N/A":
-                accordion_items = soup.find_all('div', class_=lambda x: x and ('accordion' in str(x).lower() or 'tab' in str(x).lower()))
-                for item in accordion_items:
-                    text = item.get_text()
-                    if 'fabric' in text.lower():
-                        fabric_details = item.get_text(separator=" | ", strip=True)
-                        break
-
-            description = soup.find('div', class_=lambda x: x and 'description' in str(x).lower())
-            description_text = description.get_text(strip=True) if description else "N/A"
-
-            product_data = {
-                "Brand": "BlissClub",
-                "Product Name": product_name,
-                "Price": price_text,
-                "Fabric Details": fabric_details,
-                "Description": description_text[:200],
-                "URL": url,
-                "Crawled At": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-
-            self.results.append(product_data)
-            print(f"✓ Extracted: {product_name}")
-
-        except Exception as e:
-            print(f"✗ Error crawling {url}: {str(e)}")
+        self.crawl_brand_product('blissclub', driver, url)
 
-    # ==================== SILVERTRAQ ====================
     def crawl_silvertraq(self):
         """Crawl all products from SilverTraq"""
-        print("\n=== Starting SilverTraq Crawl ===")
-
-        categories = [
-            "https://www.silvertraq.com/collections/all",
-            "https://www.silvertraq.com/collections/sports-bras",
-            "https://www.silvertraq.com/collections/leggings",
-            "https://www.silvertraq.com/collections/tops",
-            "https://www.silvertraq.com/collections/jackets",
-            "https://www.silvertraq.com/collections/shorts"
-        ]
-
-        driver = self.init_driver()
-
-        try:
-            for category_url in categories:
-                print(f"\nCrawling category: {category_url}")
-                driver.get(category_url)
-                time.sleep(3)
-
-                # Scroll to load products
-                for _ in range(3):
-                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-                # Find product links
-                product_links = []
-                product_cards = soup.find_all('a', href=lambda x: x and '/products/' in str(x))
-
-                for card in product_cards:
-                    href = card.get('href', '')
-                    if href and '/products/' in href:
-                        full_url = f"https://www.silvertraq.com{href}" if not href.startswith('http') else href
-                        if full_url not in product_links:
-                            product_links.append(full_url)
-
-                print(f"Found {len(product_links)} products in this category")
-
-                # Crawl each product
-                for product_url in product_links[:5]:  # Limit for testing
-                    self.crawl_silvertraq_product(driver, product_url)
-                    time.sleep(1)
-
-        finally:
-            driver.quit()
+        self.crawl_brand('silvertraq')
 
     def crawl_silvertraq_product(self, driver, url):
         """Extract product details from SilverTraq product page"""
-        try:
-            driver.get(url)
-            time.sleep(2)
-
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-            # Extract product name
-            product_name = soup.find('h1')
-            product_name = product_name.text.strip() if product_name else "N/A"
-
-            # Extract price
-            price = soup.find('span', class_='price') or soup.find('span', class_='money')
-            price_text = price.text.strip() if price else "N/A"
-
-            # Extract fabric details
-            fabric_details = "N/A"
-
-            # Look for fabric/material section
-            fabric_section = soup.find(text=lambda x: x and ('fabric' in x.lower() or 'material' in x.lower() or 'composition' in x.lower()))
-            if fabric_section:
-                parent = fabric_section.find_parent()
-                details = parent.find_next('ul') or parent.find_next('div')
-                if details:
-                    fabric_details = details.get_text(separator=" | ", strip=True)
-
-            description = soup.find('div', class_=lambda x: x and 'description' in str(x).lower())
-            description_text = description.get_text(strip=True) if description else "N/A"
-
-            product_data = {
-                "Brand": "SilverTraq",
-                "Product Name": product_name,
-                "Price": price_text,
-                "Fabric Details": fabric_details,
-                "Description": description_text[:200],
-                "URL": url,
-                "Crawled At": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-
-            self.results.append(product_data)
-            print(f"✓ Extracted: {product_name}")
+        self.crawl_brand_product('silvertraq', driver, url)
 
-        except Exception as e:
-            print(f"✗ Error crawling {url}: {str(e)}")
-
-    # ==================== TERRA-ACTIVE ====================
     def crawl_terractive(self):
         """Crawl all products from Terra-active"""
-        print("\n=== Starting Terra-active Crawl ===")
-
-        categories = [
-            "https://terractive.in/collections/all",
-            "https://terractive.in/collections/tees",
-            "https://terractive.in/collections/bottoms",
-            "https://terractive.in/collections/women",
-            "https://terractive.in/collections/men"
-        ]
-
-        driver = self.init_driver()
-
-        try:
-            for category_url in categories:
-                print(f"\nCrawling category: {category_url}")
-                driver.get(category_url)
-                time.sleep(3)
-
-                # Scroll to load products
-                for _ in range(3):
-                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-                # Find product links
-                product_links = []
-                product_cards = soup.find_all('a', href=lambda x: x and '/products/' in str(x))
-
-                for card in product_cards:
-                    href = card.get('href', '')
-                    if href and '/products/' in href:
-                        full_url = f"https://terractive.in{href}" if not href.startswith('http') else href
-                        if full_url not in product_links:
-                            product_links.append(full_url)
-
-                print(f"Found {len(product_links)} products in this category")
-
-                # Crawl each product
-                for product_url in product_links[:5]:  # Limit for testing
-                    self.crawl_terractive_product(driver, product_url)
-                    time.sleep(1)
-
-        finally:
-            driver.quit()
+        self.crawl_brand('terractive')
 
     def crawl_terractive_product(self, driver, url):
         """Extract product details from Terra-active product page"""
-        try:
-            driver.get(url)
-            time.sleep(2)
-
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-            # Extract product name
-            product_name = soup.find('h1')
-            product_name = product_name.text.strip() if product_name else "N/A"
-
-            # Extract price
-            price = soup.find('span', class_='price') or soup.find('span', class_='money')
-            price_text = price.text.strip() if price else "N/A"
-
-            # Extract fabric details - Terra-active emphasizes their TerraSoft fabric
-            fabric_details = "N/A"
-
-            # Look for fabric section
-            fabric_section = soup.find(text=lambda x: x and ('fabric' in x.lower() or 'terrasoft' in x.lower() or 'material' in x.lower()))
-            if fabric_section:
-                parent = fabric_section.find_parent()
-                details = parent.find_next('ul') or parent.find_next('div')
-                if details:
-                    fabric_details = details.get_text(separator=" | ", strip=True)
-
-            description = soup.find('div', class_=lambda x: x and 'description' in str(x).lower())
-            description_text = description.get_text(strip=True) if description else "N/A"
-
-            product_data = {
-                "Brand": "Terra-active",
-                "Product Name": product_name,
-                "Price": price_text,
-                "Fabric Details": fabric_details,
-                "Description": description_text[:200],
-                "URL": url,
-                "Crawled At": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-
-            self.results.append(product_data)
-            print(f"✓ Extracted: {product_name}")
-
-        except Exception as e:
-            print(f"✗ Error crawling {url}: {str(e)}")
+        self.crawl_brand_product('terractive', driver, url)
 
     # ==================== EXPORT METHODS ====================
+    def export_records(self, records, filename):
+        """Write records to one file through its streaming sink, one row per product or per variant (self.rows)"""
+        sinks = SinkPipeline.from_paths([filename], batch_size=EXPORT_CONFIG.get('flush_every', 50), rows=self.rows)
+        for record in records:
+            sinks.write(record)
+        sinks.close()
+
     def export_to_csv(self, filename="activewear_products.csv"):
         """Export results to CSV"""
         if not self.results:
             print("No results to export")
             return
-
-        keys = self.results[0].keys()
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            writer.writeheader()
-            writer.writerows(self.results)
-
-        print(f"\n✓ Exported {len(self.results)} products to {filename}")
+        self.export_records(self.results.snapshot(), filename)
 
     def export_to_json(self, filename="activewear_products.json"):
         """Export results to JSON"""
         if not self.results:
             print("No results to export")
             return
+        self.export_records(self.results.snapshot(), filename)
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False)
+    def export_to_parquet(self, root="activewear_parquet"):
+        """Export results as a typed Parquet dataset partitioned by brand and crawl date (needs pyarrow)"""
+        from columnar_export import write_parquet_dataset
 
-        print(f"✓ Exported {len(self.results)} products to {filename}")
+        if not self.results:
+            print("No results to export")
+            return
+
+        rows = write_parquet_dataset(self.results.snapshot(), root)
+        print(f"✓ Exported {rows} products to {root}/")
+
+    def export_changes(self, filename="activewear_changes.csv"):
+        """Export only the products that are new or changed since the last run (incremental mode)"""
+        if not self.state:
+            print("Change export needs incremental=True")
+            return
+
+        changes = self.state.changed_records()
+        if not changes:
+            print("No changes since last run")
+        # Rewritten even when empty, so nothing re-reads the previous run's changes
+        self.export_records(changes, filename)
+
+    def retry_failed(self, brands=None):
+        """
+        Crawl the dead-letter queue again, on its own (no discovery); URLs that fail again are re-queued
+        brands: only retry these brand keys (default all); the other entries stay queued as they were.
+        Records stream to the outputs opened for this crawler; returns how many URLs were retried.
+        """
+        brands = [key for key in brands or self.brands if key in self.brands]
+        entries = []
+        for entry in self.failures.take():
+            if entry.get('brand') in brands:
+                entries.append(entry)
+            else:
+                self.failures.requeue(entry)
+        if not entries:
+            print("No failed products to retry")
+            self.failures.finish_retry()
+            return 0
+
+        print(f"Retrying {len(entries)} failed URLs from {self.failures.path}")
+        if self.snapshots:
+            # Retried products belong to the crawl they failed in
+            self.snapshots.resume_latest()
+
+        products = [entry for entry in entries if entry.get('type', 'product') == 'product']
+        for entry in products:
+            for category in entry.get('categories') or ():
+                self.frontier.add(entry['url'], category)
+        # A failed category is discovered again; its products are then crawled one by one like the others
+        for entry in entries:
+            if entry.get('type') == 'category':
+                brand = self.brands[entry['brand']]
+                found = self.discover_category(brand, entry['url'])
+                products += [{'brand': entry['brand'], 'url': url}
+                             for url in self.track_frontier(brand, entry['url'], list(found))]
+
+        self.scheduler.map_urls(lambda entry: self.crawl_brand_product(entry['brand'], None, entry['url']),
+                                products, url_of=lambda entry: entry['url'])
+        if self.parse_pipeline:
+            self.parse_pipeline.drain()
+        self.failures.finish_retry()
+
+        for key in dict.fromkeys(entry['brand'] for entry in entries):
+            self.report_counts(self.brands[key])
+        self.report_failures()
+        return len(entries)
+
+    def report_failures(self):
+        """Print what is left in the dead-letter queue"""
+        queued = self.failures.summary()
+        if queued:
+            kinds = ", ".join(f"{n} {kind}" for kind, n in queued.most_common())
+            print(f"• {sum(queued.values())} failed URLs in {self.failures.path} ({kinds}) - "
+                  f"rerun them with: python run_crawler.py --retry-failed")
+
+    def export_diff(self, filename="activewear_diff.csv"):
+        """Report what changed since the previous crawl in the snapshot store (added, removed, price, stock)"""
+        if not self.snapshots:
+            print("Diff report needs a snapshot store (EXPORT_CONFIG['snapshot_db'])")
+            return
 
-    def run_full_crawl(self):
-        """Run complete crawl for all brands"""
+        previous = self.snapshots.latest_crawl(before=self.snapshots.crawl_id)
+        if previous is None:
+            print("No earlier crawl to compare with")
+            return
+
+        rows = self.snapshots.write_diff(previous, self.snapshots.crawl_id, filename)
+        print(f"✓ Crawl {previous} -> {self.snapshots.crawl_id}: {len(rows)} changes written to {filename}")
+        print_diff_summary(rows)
+
+    def run_full_crawl(self, brands=None, changes_file="activewear_changes.csv", diff_file="activewear_diff.csv"):
+        """
+        Run complete crawl for all brands (or the given brand keys)
+        changes_file / diff_file: where the incremental change export and the crawl-to-crawl diff go
+        """
+        brands = brands or list(self.brands)
         print("="*60)
         print("ACTIVEWEAR CRAWLER - FABRIC DETAILS EXTRACTOR")
         print("="*60)
 
-        # Crawl all brands
-        self.crawl_kica()
-        self.crawl_blissclub()
-        self.crawl_silvertraq()
-        self.crawl_terractive()
+        # Records stream to disk as they are extracted
+        if self.sinks is None:
+            self.open_outputs(self.DEFAULT_OUTPUTS)
+        if not self.resume:
+            # A fresh crawl starts a fresh dead-letter queue; a resumed one keeps adding to it
+            self.failures.clear()
 
-        # Export results
-        self.export_to_csv()
-        self.export_to_json()
+        # Crawl all brands in parallel; product pages share one worker/driver pool
+        try:
+            try:
+                self.scheduler.run_parallel([
+                    lambda key=key: self.crawl_brand(key) for key in brands
+                ])
+            finally:
+                self.close_outputs()
+
+            # Every record is on disk; the reports still need the state and snapshot stores open
+            if self.state:
+                self.export_changes(changes_file)
+            if self.snapshots:
+                self.export_diff(diff_file)
+        finally:
+            self.close()
 
         print(f"\n{'='*60}")
-        print(f"CRAWL COMPLETE - Total Products: {len(self.results)}")
+        print(f"CRAWL COMPLETE - Total Products: {self.results.total}")
+        for key in brands:
+            self.report_counts(self.brands[key])
+        print(f"• Fabric analysis: {DEFAULT_ANALYZER.misses} distinct fabric texts, "
+              f"{DEFAULT_ANALYZER.hit_rate():.0%} cache hits")
+        self.report_failures()
+        self.metrics.print_summary()
         print(f"{'='*60}")
 
 
@@ -509,3 +990,4 @@ if __name__ == "__main__":
     # crawler.crawl_silvertraq()
     # crawler.crawl_terractive()
     # crawler.export_to_csv()
+    # crawler.close()
@@ -0,0 +1,114 @@
+"""
+Async HTTP Fetcher for Activewear Crawler
+asyncio + aiohttp with keep-alive connection pooling and bounded in-flight requests per host
+"""
+
+import asyncio
+import json
+import time
+import aiohttp
+from pacing import parse_retry_after
+
+
+class AsyncFetcher:
+    """
+    One aiohttp session per crawl; the connector keeps connections to each brand host alive
+    and caps how many requests are in flight per host and overall.
+
+    Usage:
+        async with AsyncFetcher(per_host_limit=16) as fetcher:
+            html = await fetcher.fetch_text(url)
+    """
+
+    def __init__(self, max_in_flight=200, per_host_limit=16, timeout=20,
+                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+                 pacer=None, max_backoff_retries=3, metrics=None, recorder=None):
+        self.pacer = pacer
+        self.metrics = metrics
+        self.recorder = recorder
+        self.max_backoff_retries = max_backoff_retries
+        self.max_in_flight = max_in_flight
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.max_in_flight,
+            limit_per_host=self.per_host_limit,
+            keepalive_timeout=60,
+            ttl_dns_cache=300,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={'User-Agent': self.user_agent},
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+
+    async def get(self, url, params=None, headers=None, as_json=False):
+        """
+        GET through the pacer, backing off and retrying while the site throttles us
+        Returns (status, body) with the body already read as text or JSON.
+        """
+        for attempt in range(self.max_backoff_retries + 1):
+            if self.pacer:
+                delay = self.pacer.reserve(url)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            start = time.monotonic()
+            async with self.session.get(url, params=params, headers=headers) as response:
+                status = response.status
+                if self.metrics:
+                    self.metrics.record_fetch(url, status, time.monotonic() - start)
+                if self.pacer:
+                    self.pacer.record(url, status, time.monotonic() - start,
+                                      parse_retry_after(response.headers.get('Retry-After')))
+                    if self.pacer.should_retry(status) and attempt < self.max_backoff_retries:
+                        continue
+
+                if status == 404:
+                    return status, None
+                response.raise_for_status()
+                text = await response.text()
+                if self.recorder:
+                    self.recorder.record(url, status, text, params=params)
+                if as_json:
+                    try:
+                        return status, json.loads(text)
+                    except ValueError:
+                        return status, None
+                return status, text
+
+    async def fetch_text(self, url, params=None):
+        """GET a page body as text, None for 404s"""
+        _, body = await self.get(url, params=params)
+        return body
+
+    async def fetch_json(self, url, params=None):
+        """GET a JSON document, None for 404s and non-JSON responses"""
+        _, body = await self.get(url, params=params, headers={'Accept': 'application/json'}, as_json=True)
+        return body
+
+    async def get_collection_products(self, collection_url, limit=250, max_products=None):
+        """Return every product in a collection (or the first max_products), following ?page=N until exhausted"""
+        base = collection_url.split('?')[0].rstrip('/')
+        products = []
+        page = 1
+        while True:
+            data = await self.fetch_json(f"{base}/products.json", params={'page': page, 'limit': limit})
+            batch = data.get('products', []) if data else []
+            products.extend(batch)
+            if len(batch) < limit or (max_products and len(products) >= max_products):
+                break
+            page += 1
+        return products[:max_products] if max_products else products
+
+    async def gather(self, coroutines):
+        """Run coroutines concurrently, returning exceptions in place of failed results"""
+        return await asyncio.gather(*coroutines, return_exceptions=True)
@@ -0,0 +1,156 @@
+"""
+Corpus Replay Benchmark for Activewear Crawler
+Replays a recorded fixture corpus through discovery and extraction offline, with regression thresholds
+
+Record a corpus:  ActivewearCrawler(record_to="benchmarks/corpus").run_full_crawl()
+Replay it:        python benchmarks/bench_corpus.py [--corpus benchmarks/corpus] [--parser lxml]
+Exit status is 1 when a threshold in benchmarks/thresholds.json is missed.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from brand_engine import BrandEngine  # noqa: E402
+from crawler_config import BRAND_CONFIGS, CRAWL_CONFIG  # noqa: E402
+from fixture_corpus import (  # noqa: E402
+    COLLECTION_HTML, COLLECTION_JSON, PRODUCT_HTML, corpus_brands, iter_corpus,
+)
+from shopify_client import base_url_of, product_to_record, product_url_for  # noqa: E402
+from url_frontier import UrlFrontier  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process, or None where the platform can't tell"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def replay_brand(engine, pages):
+    """Run one brand's pages through discovery and extraction; returns timing totals"""
+    frontier = UrlFrontier()
+    totals = {'pages': 0, 'html_pages': 0, 'parse': 0.0, 'discover': 0.0, 'extract': 0.0,
+              'products': 0, 'records': 0, 'fabric_found': 0}
+
+    for page in pages:
+        kind, url, body = page['kind'], page['url'], page['body']
+        totals['pages'] += 1
+
+        if kind in (COLLECTION_HTML, PRODUCT_HTML):
+            start = time.perf_counter()
+            doc = engine.parse(body)
+            totals['parse'] += time.perf_counter() - start
+            totals['html_pages'] += 1
+
+        start = time.perf_counter()
+        if kind == COLLECTION_HTML:
+            totals['products'] += len(frontier.add_all(engine.product_links(doc), url))
+            totals['discover'] += time.perf_counter() - start
+            continue
+        if kind == COLLECTION_JSON:
+            base_url = base_url_of(url)
+            urls = [product_url_for(base_url, product) for product in json.loads(body).get('products', [])]
+            totals['products'] += len(frontier.add_all(urls, url.split('/products.json')[0]))
+            totals['discover'] += time.perf_counter() - start
+            continue
+
+        if kind == PRODUCT_HTML:
+            record = engine.parse_product(doc, url, body)
+        else:
+            data = json.loads(body)
+            record = product_to_record(engine.name, data.get('product', data), url, engine.fabric_keywords)
+        totals['extract'] += time.perf_counter() - start
+        totals['records'] += 1
+        totals['fabric_found'] += record["Fabric Details"] != "N/A"
+
+    return totals
+
+
+def check_thresholds(results, thresholds):
+    """Names of the thresholds this run missed"""
+    failures = []
+    for name, limit in thresholds.items():
+        value = results.get(name[4:])
+        if value is None:
+            continue
+        if name.startswith('min_') and value < limit:
+            failures.append(f"{name[4:]} = {value:.2f} (minimum {limit})")
+        elif name.startswith('max_') and value > limit:
+            failures.append(f"{name[4:]} = {value:.2f} (maximum {limit})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded fixture corpus offline and benchmark it")
+    parser.add_argument('--corpus', default=os.path.join(HERE, 'corpus'), help="corpus directory")
+    parser.add_argument('--parser', default=CRAWL_CONFIG.get('parser', 'lxml'), help="HTML parser backend")
+    parser.add_argument('--rounds', type=int, default=3, help="replays of the whole corpus (default: 3)")
+    parser.add_argument('--thresholds', default=os.path.join(HERE, 'thresholds.json'), help="regression limits")
+    args = parser.parse_args()
+
+    brands = [key for key in corpus_brands(args.corpus) if key in BRAND_CONFIGS]
+    if not brands:
+        sys.exit(f"No recorded corpus in {args.corpus} - record one with ActivewearCrawler(record_to=...)")
+
+    # Decompress up front so the timings are parse/extract only
+    corpus = {key: list(iter_corpus(args.corpus, key)) for key in brands}
+    engines = {key: BrandEngine(key, BRAND_CONFIGS[key], parser=args.parser) for key in brands}
+
+    print(f"Replaying {sum(len(p) for p in corpus.values())} pages x {args.rounds} rounds "
+          f"with the {args.parser} parser\n")
+    print(f"{'brand':<12}{'pages':>7}{'products':>10}{'records':>9}{'fabric':>8}"
+          f"{'parse ms':>10}{'extract ms':>12}{'pages/s':>10}")
+
+    grand = {'pages': 0, 'html_pages': 0, 'records': 0, 'parse': 0.0, 'extract': 0.0, 'elapsed': 0.0}
+    for key in brands:
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            totals = replay_brand(engines[key], corpus[key])
+        elapsed = (time.perf_counter() - start) / args.rounds
+
+        for name in ('pages', 'html_pages', 'records', 'parse', 'extract'):
+            grand[name] += totals[name]
+        grand['elapsed'] += elapsed
+
+        parse_ms = totals['parse'] / max(totals['html_pages'], 1) * 1000
+        extract_ms = totals['extract'] / max(totals['records'], 1) * 1000
+        print(f"{key:<12}{totals['pages']:>7}{totals['products']:>10}{totals['records']:>9}"
+              f"{totals['fabric_found']:>8}{parse_ms:>10.2f}{extract_ms:>12.3f}{totals['pages'] / elapsed:>10.1f}")
+
+    results = {
+        'pages_per_sec': grand['pages'] / grand['elapsed'] if grand['elapsed'] else 0.0,
+        'parse_ms': grand['parse'] / max(grand['html_pages'], 1) * 1000,
+        'extract_ms': grand['extract'] / max(grand['records'], 1) * 1000,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    rss = f"{results['peak_rss_mb']:.1f} MB" if results['peak_rss_mb'] is not None else "n/a"
+    print(f"\n• {results['pages_per_sec']:.1f} pages/s, parse {results['parse_ms']:.2f} ms/page, "
+          f"extract {results['extract_ms']:.3f} ms/record, peak RSS {rss}")
+
+    if os.path.exists(args.thresholds):
+        with open(args.thresholds, encoding='utf-8') as f:
+            failures = check_thresholds(results, json.load(f))
+        if failures:
+            for failure in failures:
+                print(f"✗ Regression: {failure}")
+            sys.exit(1)
+        print("✓ Within thresholds")
+
+
+if __name__ == "__main__":
+    main()
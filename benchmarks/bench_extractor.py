@@ -0,0 +1,114 @@
+"""
+Extractor Micro-Benchmark for Activewear Crawler
+Times product-page extraction on saved HTML fixtures: the old per-field tree scans vs the compiled single pass
+
+Usage: python benchmarks/bench_extractor.py [--rounds 200]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from bs4 import BeautifulSoup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from brand_engine import BrandEngine  # noqa: E402
+from crawler_config import BRAND_CONFIGS  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def legacy_parse(soup, url):
+    """The original crawl_*_product extraction: every field is its own scan of the whole tree"""
+    product_name = soup.find('h1', class_='product-title')
+    if not product_name:
+        product_name = soup.find('h1')
+    product_name = product_name.text.strip() if product_name else "N/A"
+
+    price = soup.find('span', class_='price')
+    if not price:
+        price = soup.find('span', class_='money')
+    price_text = price.text.strip() if price else "N/A"
+
+    fabric_details = "N/A"
+    fabric_section = soup.find(string=lambda x: x and ('fabric' in x.lower() or 'material' in x.lower()))
+    if fabric_section:
+        parent = fabric_section.find_parent()
+        if parent:
+            details_list = parent.find_next('ul') or parent.find_next('div')
+            if details_list:
+                fabric_details = details_list.get_text(separator=" | ", strip=True)
+
+    if fabric_details == "N/A":
+        accordions = soup.find_all('div', class_=lambda x: x and ('accordion' in x.lower() or 'tab' in x.lower()))
+        for item in accordions:
+            if 'fabric' in item.get_text().lower():
+                fabric_details = item.get_text(separator=" | ", strip=True)
+                break
+
+    if fabric_details == "N/A":
+        description = soup.find('div', class_='product-description')
+        if description:
+            import re
+            fabric_match = re.search(r'(\d+%.*?(?:cotton|polyester|nylon|spandex|elastane).*?)(?:\.|\n)',
+                                     description.get_text(), re.IGNORECASE)
+            if fabric_match:
+                fabric_details = fabric_match.group(1).strip()
+
+    description = soup.find('div', class_='product-description')
+    description_text = description.get_text(strip=True) if description else "N/A"
+
+    return {
+        "Product Name": product_name,
+        "Price": price_text,
+        "Fabric Details": fabric_details,
+        "Description": description_text[:200],
+        "URL": url,
+    }
+
+
+def time_per_call(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark product-page extraction on saved fixtures")
+    parser.add_argument('--rounds', type=int, default=200, help="extractions per fixture (default: 200)")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(FIXTURES, '*_product.html')))
+    if not paths:
+        sys.exit(f"No fixtures found in {FIXTURES}")
+
+    print(f"{'fixture':<14}{'parse ms':>10}{'legacy ms':>11}{'compiled ms':>13}{'speedup':>9}")
+    totals = [0.0, 0.0, 0.0]
+    for path in paths:
+        key = os.path.basename(path)[:-len('_product.html')]
+        engine = BrandEngine(key, BRAND_CONFIGS[key])
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+
+        url = f"{engine.base_url}/products/fixture"
+        soup = BeautifulSoup(html, 'html.parser')
+        parse_ms = time_per_call(lambda: BeautifulSoup(html, 'html.parser'), max(args.rounds // 10, 1))
+        legacy_ms = time_per_call(lambda: legacy_parse(soup, url), args.rounds)
+        compiled_ms = time_per_call(lambda: engine.parse_product(soup, url), args.rounds)
+
+        for i, value in enumerate((parse_ms, legacy_ms, compiled_ms)):
+            totals[i] += value
+        print(f"{key:<14}{parse_ms:>10.2f}{legacy_ms:>11.3f}{compiled_ms:>13.3f}{legacy_ms / compiled_ms:>8.1f}x")
+        print(f"  • Fabric Details: {engine.parse_product(soup, url)['Fabric Details']}")
+
+    n = len(paths)
+    print(f"{'mean':<14}{totals[0] / n:>10.2f}{totals[1] / n:>11.3f}{totals[2] / n:>13.3f}"
+          f"{totals[1] / totals[2]:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Parser Backend Benchmark for Activewear Crawler
+Parse and extract time per product page for each HTML parser backend, on the saved fixtures
+
+Usage: python benchmarks/bench_parsers.py [--rounds 50] [--parsers html.parser lxml selectolax]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from brand_engine import BrandEngine  # noqa: E402
+from crawler_config import BRAND_CONFIGS  # noqa: E402
+from parsers import PARSER_BACKENDS  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+COMPARED_FIELDS = ["Product Name", "Price", "Fabric Details", "Description"]
+
+
+def time_per_call(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on saved product pages")
+    parser.add_argument('--rounds', type=int, default=50, help="parses per fixture and backend (default: 50)")
+    parser.add_argument('--parsers', nargs='+', default=list(PARSER_BACKENDS), help="backends to compare")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(FIXTURES, '*_product.html')))
+    if not paths:
+        sys.exit(f"No fixtures found in {FIXTURES}")
+
+    print(f"{'fixture':<14}{'parser':<13}{'parse ms':>10}{'extract ms':>12}{'total ms':>10}")
+    totals = {}
+    for path in paths:
+        key = os.path.basename(path)[:-len('_product.html')]
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+
+        reference = None
+        for name in args.parsers:
+            try:
+                engine = BrandEngine(key, BRAND_CONFIGS[key], parser=name)
+            except ImportError as e:
+                print(f"{key:<14}{name:<13}  ✗ not installed ({e.name})")
+                continue
+
+            url = f"{engine.base_url}/products/fixture"
+            doc = engine.parse(html)
+            parse_ms = time_per_call(lambda: engine.parse(html), args.rounds)
+            extract_ms = time_per_call(lambda: engine.parse_product(doc, url), args.rounds)
+
+            parse_total, extract_total = totals.get(name, (0.0, 0.0))
+            totals[name] = (parse_total + parse_ms, extract_total + extract_ms)
+            print(f"{key:<14}{name:<13}{parse_ms:>10.2f}{extract_ms:>12.3f}{parse_ms + extract_ms:>10.2f}")
+
+            # Every backend must produce the same record
+            record = {field: engine.parse_product(doc, url)[field] for field in COMPARED_FIELDS}
+            if reference is None:
+                reference = record
+            else:
+                for field in COMPARED_FIELDS:
+                    if record[field] != reference[field]:
+                        print(f"  ✗ {field} differs: {record[field]!r} vs {reference[field]!r}")
+
+    print()
+    for name, (parse_total, extract_total) in totals.items():
+        n = len(paths)
+        print(f"{'mean':<14}{name:<13}{parse_total / n:>10.2f}{extract_total / n:>12.3f}"
+              f"{(parse_total + extract_total) / n:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Load Test for Activewear Crawler
+Crawls local mock Shopify stores at catalog sizes and worker counts you choose, without touching the real sites
+
+Run:  python benchmarks/load_test.py --products 10000 --workers 4 8 16 [--engine async] [--latency 0.05]
+Each worker count gets a fresh crawler against the same mock stores; the table compares throughput,
+completeness and how many 429s/errors the stores handed out.
+"""
+
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from activewear_crawler import ActivewearCrawler  # noqa: E402
+from crawler_config import BRAND_CONFIGS, CRAWL_CONFIG  # noqa: E402
+from mock_shopify import MockShopifyServer  # noqa: E402
+
+
+def run_once(server, engine, workers, parse_processes=0, verbose=False):
+    """One full crawl of every mock store; returns (seconds, crawled, failed, metrics)"""
+    checkpoint_dir = tempfile.mkdtemp(prefix="load_test_")
+    if engine == "async":
+        CRAWL_CONFIG['async_per_host'] = workers
+    crawler = ActivewearCrawler(
+        engine=engine,
+        # The http engine's fallback is Chrome; keep the load on the HTTP paths
+        browser_fallback=(engine == "async"),
+        workers=workers,
+        per_domain_limit=workers,
+        checkpoint_dir=checkpoint_dir,
+        keep_results=False,
+        base_urls=server.base_urls,
+        parse_processes=parse_processes,
+        # Mock catalogs stay out of the crawl history
+        snapshot_db=False,
+    )
+
+    start = time.perf_counter()
+    try:
+        with contextlib.ExitStack() as stack:
+            if not verbose:
+                stack.enter_context(contextlib.redirect_stdout(open(os.devnull, 'w', encoding='utf-8')))
+            crawler.scheduler.run_parallel([lambda key=key: crawler.crawl_brand(key) for key in crawler.brands])
+    finally:
+        crawler.close()
+        shutil.rmtree(checkpoint_dir, ignore_errors=True)
+    elapsed = time.perf_counter() - start
+
+    counts = [crawler.metrics.counts(brand.name) for brand in crawler.brands.values()]
+    return (elapsed, sum(c.get('crawled', 0) for c in counts), sum(c.get('failed', 0) for c in counts),
+            crawler.metrics)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the crawler against local mock Shopify stores")
+    parser.add_argument('--products', type=int, default=10000, help="products across all brands (default: 10000)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[CRAWL_CONFIG.get('workers', 4)],
+                        help="worker counts to compare (async engine: connections per host)")
+    parser.add_argument('--engine', choices=['http', 'async'], default='async')
+    parser.add_argument('--rate', type=float, default=200.0, help="requests_per_second per store (default: 200)")
+    parser.add_argument('--burst', type=int, default=50, help="token-bucket burst per store (default: 50)")
+    parser.add_argument('--latency', type=float, default=0.02, help="mock response latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.01, help="uniform +- seconds on the latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of mock responses that are 500/503")
+    parser.add_argument('--throttle-every', type=int, default=0, help="mock 429 burst after every N requests")
+    parser.add_argument('--throttle-burst', type=int, default=5, help="429s per burst")
+    parser.add_argument('--fabric-in-json', type=float, default=0.8,
+                        help="share of products whose JSON carries the fabric (the rest need the product page)")
+    parser.add_argument('--parse-processes', type=int, default=0,
+                        help="parse product pages in this many worker processes (default: 0, inline)")
+    parser.add_argument('--verbose', action='store_true', help="show the crawler's own output")
+    args = parser.parse_args()
+
+    CRAWL_CONFIG['requests_per_second'] = args.rate
+    CRAWL_CONFIG['burst'] = args.burst
+    CRAWL_CONFIG['circuit_cooldown'] = 1.0
+
+    per_brand = max(1, args.products // len(BRAND_CONFIGS))
+    print(f"Mock stores: {per_brand} products x {len(BRAND_CONFIGS)} brands, latency {args.latency}s "
+          f"+-{args.jitter}s, error rate {args.error_rate}, 429 burst every {args.throttle_every or '-'} requests")
+    print(f"Crawler: engine={args.engine}, {args.rate} req/s per store (burst {args.burst}), "
+          f"{args.parse_processes or 'inline'} parse processes\n")
+    print(f"{'workers':>8}{'seconds':>9}{'crawled':>9}{'missing':>9}{'failed':>8}{'products/s':>12}"
+          f"{'requests':>10}{'429s':>7}{'5xx':>6}")
+
+    for workers in args.workers:
+        # Fresh stores per run so request and fault counts are per run
+        with MockShopifyServer(products=per_brand, latency=args.latency, jitter=args.jitter,
+                               error_rate=args.error_rate, throttle_every=args.throttle_every,
+                               throttle_burst=args.throttle_burst, fabric_in_json=args.fabric_in_json) as server:
+            elapsed, crawled, failed, metrics = run_once(server, args.engine, workers, args.parse_processes, args.verbose)
+            stats = server.stats().values()
+
+        expected = per_brand * len(BRAND_CONFIGS)
+        requests = sum(s.get('requests', 0) for s in stats)
+        throttled = sum(s.get(429, 0) for s in stats)
+        errors = sum(n for s in stats for status, n in s.items() if isinstance(status, int) and status >= 500)
+        print(f"{workers:>8}{elapsed:>9.1f}{crawled:>9}{expected - crawled:>9}{failed:>8}"
+              f"{crawled / elapsed:>12.1f}{requests:>10}{throttled:>7}{errors:>6}")
+
+    # Stage breakdown of the last run
+    metrics.print_summary()
+
+
+if __name__ == "__main__":
+    main()
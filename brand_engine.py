@@ -0,0 +1,134 @@
+"""
+Config-Driven Brand Engine for Activewear Crawler
+One extraction path for every brand config in crawler_config.py
+"""
+
+from datetime import datetime
+from extractor import fabric_pattern_text
+from parsers import get_parser
+from url_frontier import canonical_product_url
+from variants import variants_from_html
+
+# ==================== FABRIC EXTRACTOR PLUGINS ====================
+# Brand-specific fabric extraction, keyed by the config's 'fabric_extractor' name (defaults to the brand key).
+# Each extractor is called as extractor(page, brand) with the extractor.ExtractedPage from the
+# single document walk and returns the fabric text or "N/A". page.soup is the parsed document for anything
+# custom - a BeautifulSoup tree, unless the brand uses the selectolax parser (see parsers.py).
+FABRIC_EXTRACTORS = {}
+
+
+def register_fabric_extractor(name):
+    """Decorator registering a fabric extractor plugin under a name"""
+    def decorator(fn):
+        FABRIC_EXTRACTORS[name] = fn
+        return fn
+    return decorator
+
+
+def extract_fabric_generic(page, brand):
+    """Heading containing a fabric keyword, then the list/block after it, then FABRIC_PATTERNS matches"""
+    if page.fabric_node is not None:
+        details = page.next_ul or page.next_div
+        if details is not None:
+            return details.get_text(separator=" | ", strip=True)
+        # Heading and details share one element, e.g. "<p>Fabric: 79% Nylon...</p>"
+        text = page.fabric_node.parent.get_text(separator=" ", strip=True)
+        if len(text) > len(page.fabric_node.strip()):
+            return text
+
+    description = page.get('description')
+    return fabric_pattern_text(description.get_text() if description is not None else None)
+
+
+@register_fabric_extractor('blissclub')
+def extract_fabric_blissclub(page, brand):
+    """BlissClub has a "FABRIC DETAILS" heading followed by a list, or an accordion panel"""
+    if page.fabric_node is not None:
+        # Look for list or div containing fabric info
+        fabric_list = page.next_ul or page.fabric_node.parent.find_next_sibling()
+        if fabric_list:
+            fabric_items = fabric_list.find_all('li') if fabric_list.name == 'ul' else [fabric_list]
+            return " | ".join([item.get_text(strip=True) for item in fabric_items])
+
+    # Alternative: Check for accordion or tab content
+    for item in page.accordions:
+        if 'fabric' in item.get_text().lower():
+            return item.get_text(separator=" | ", strip=True)
+
+    return "N/A"
+
+
+# ==================== BRAND ENGINE ====================
+class BrandEngine:
+    """
+    Compiles one brand config (base_url, categories, product_selectors) into a ready-to-run extractor
+    Selectors are compiled once; every product page of every brand goes through parse_product().
+    Comma-separated selectors are ordered fallbacks, so 'h1.product-title, h1' prefers the product title.
+    The HTML parser is the config's 'parser' (see parsers.PARSER_BACKENDS), else the `parser` argument.
+    """
+
+    def __init__(self, key, config, parser='lxml'):
+        selectors = config['product_selectors']
+
+        self.key = key
+        self.name = config['name']
+        self.base_url = config['base_url'].rstrip('/')
+        self.category_urls = [self.base_url + path for path in config['categories']]
+
+        self.parser = get_parser(config.get('parser', parser))
+        self.link_selector = selectors['product_link']
+        self.fabric_keywords = [k.lower() for k in selectors['fabric_keywords']]
+        self.extractor = self.parser.extractor(
+            {
+                'product_name': selectors['product_name'],
+                'price': selectors['price'],
+                'description': selectors['description'],
+            },
+            self.fabric_keywords,
+        )
+
+        extractor_name = config.get('fabric_extractor', key)
+        self.fabric_extractor = FABRIC_EXTRACTORS.get(extractor_name, extract_fabric_generic)
+
+    def parse(self, html):
+        """Parse page HTML with this brand's parser backend"""
+        return self.parser.parse(html)
+
+    def product_links(self, soup):
+        """Canonical product URLs on a collection page, de-duplicated in page order"""
+        links = {}
+        for card in self.parser.select(soup, self.link_selector):
+            href = card.get('href', '')
+            if href and '/products/' in href:
+                links[canonical_product_url(href, self.base_url)] = None
+        return list(links)
+
+    def parse_product(self, soup, url, html=None):
+        """
+        Extract the product record from a rendered product page in a single document walk
+        Variants come from the product JSON embedded in the page's HTML, when it is passed.
+        """
+        page = self.extractor.extract(soup)
+
+        product_name = page.get('product_name')
+        product_name = product_name.text.strip() if product_name is not None else "N/A"
+
+        price = page.get('price')
+        price_text = price.text.strip() if price is not None else "N/A"
+
+        # Fabric details - CRITICAL FIELD
+        fabric_details = self.fabric_extractor(page, self)
+
+        description = page.get('description')
+        description_text = description.get_text(strip=True) if description is not None else "N/A"
+
+        return {
+            "Brand": self.name,
+            "Product Name": product_name,
+            "Price": price_text,
+            "Fabric Details": fabric_details,
+            "Description": description_text[:200],
+            "URL": url,
+            "Crawled At": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "Variants": variants_from_html(html),
+        }
@@ -0,0 +1,83 @@
+"""
+Browser Profile for Activewear Crawler
+Lightweight Chrome setup for the Selenium fallback: no images, media, fonts or analytics, eager page loads
+"""
+
+from selenium.webdriver.chrome.options import Options
+
+# Chrome DevTools URL patterns ("*" wildcards) that never carry product data
+BLOCKED_RESOURCE_PATTERNS = [
+    # Images
+    '*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.avif*', '*.svg*', '*.ico*',
+    # Video and audio
+    '*.mp4*', '*.webm*', '*.mov*', '*.m3u8*', '*.mp3*',
+    # Fonts
+    '*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*',
+]
+
+BLOCKED_ANALYTICS_DOMAINS = [
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'googleadservices.com',
+    'connect.facebook.net',
+    'facebook.com/tr',
+    'analytics.tiktok.com',
+    'bat.bing.com',
+    'clarity.ms',
+    'hotjar.com',
+    'static.klaviyo.com',
+    'sc-static.net',
+    'criteo.com',
+    'monorail-edge.shopifysvc.com',
+    'shopify.com/s/trekkie',
+]
+
+# name -> settings; 'light' is the default for every pooled driver
+BROWSER_PROFILES = {
+    'light': {
+        'block_resources': True,
+        'page_load_strategy': 'eager',   # Hand the page over at DOMContentLoaded; readiness waits do the rest
+    },
+    'full': {
+        'block_resources': False,
+        'page_load_strategy': 'normal',
+    },
+}
+
+
+def blocked_url_patterns():
+    """Every URL pattern the light profile blocks"""
+    return BLOCKED_RESOURCE_PATTERNS + [f"*{domain}*" for domain in BLOCKED_ANALYTICS_DOMAINS]
+
+
+def build_chrome_options(profile='light', headless=True, window_size='1920,1080', user_agent=None):
+    """Chrome options for a browser profile (see BROWSER_PROFILES)"""
+    settings = BROWSER_PROFILES[profile]
+
+    options = Options()
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    if window_size:
+        options.add_argument(f"--window-size={window_size}")
+    if user_agent:
+        options.add_argument(f"user-agent={user_agent}")
+
+    options.page_load_strategy = settings['page_load_strategy']
+
+    if settings['block_resources']:
+        # Images are also switched off at the renderer, so they are never even requested
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--mute-audio")
+        options.add_argument("--disable-extensions")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+    return options
+
+
+def block_resources(driver, patterns=None):
+    """Block media, fonts and analytics requests for this driver through the DevTools protocol"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns or blocked_url_patterns()})
@@ -0,0 +1,133 @@
+"""
+Checkpoint and Resume for Activewear Crawler
+Durable URL frontier plus an append-only record journal, written as the crawl proceeds
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from variants import as_variants
+
+
+class CrawlCheckpoint:
+    """
+    Everything needed to resume a crawl that died part-way through
+
+      frontier.db   - every category crawled and the product URLs discovered in it, with done flags
+      records.jsonl - every extracted record, one JSON object per line, flushed as it is written
+
+    Opening with resume=False starts a fresh checkpoint; resume=True keeps the existing one.
+    Only these files are ever removed - anything else in the directory is left alone.
+    """
+
+    FILES = ("frontier.db", "frontier.db-wal", "frontier.db-shm", "records.jsonl")
+
+    def __init__(self, directory="crawl_checkpoint", resume=False):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        if not resume:
+            self.discard()
+
+        self.journal_path = os.path.join(directory, "records.jsonl")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, "frontier.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                url TEXT NOT NULL,
+                brand TEXT,
+                category TEXT NOT NULL,
+                done INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (category, url)
+            );
+            CREATE INDEX IF NOT EXISTS idx_frontier_url ON frontier (url);
+        """)
+        self._conn.commit()
+
+        self._done = {row[0] for row in self._conn.execute("SELECT DISTINCT url FROM frontier WHERE done = 1")}
+        self._done.update(record['URL'] for record in self.completed_records())
+
+        self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        if self._journal.tell() and not self._ends_with_newline():
+            # Crashed mid-write: terminate the torn line so the next record starts clean
+            self._journal.write("\n")
+
+    def discard(self):
+        """Delete the previous checkpoint's files"""
+        for name in self.FILES:
+            path = os.path.join(self.directory, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    # ==================== FRONTIER ====================
+    def add_frontier(self, brand, category_url, urls):
+        """Remember the product URLs discovered in a category"""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO frontier (url, brand, category, done) VALUES (?, ?, ?, ?)",
+                [(url, brand, category_url, int(url in self._done)) for url in urls],
+            )
+            self._conn.commit()
+
+    def discovered_links(self, category_url):
+        """Product URLs found in a category on an earlier attempt, or None if it was never discovered"""
+        with self._lock:
+            rows = self._conn.execute("SELECT url FROM frontier WHERE category = ? ORDER BY rowid", (category_url,)).fetchall()
+        return [row[0] for row in rows] or None
+
+    def is_category_done(self, category_url):
+        """True once a category was discovered and every product in it is done"""
+        with self._lock:
+            total, pending = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(done = 0), 0) FROM frontier WHERE category = ?", (category_url,)
+            ).fetchone()
+        return total > 0 and pending == 0
+
+    def is_done(self, url):
+        with self._lock:
+            return url in self._done
+
+    def mark_done(self, url):
+        """Mark a URL finished without a record (e.g. skipped as unchanged)"""
+        with self._lock:
+            self._mark_done(url)
+            self._conn.commit()
+
+    def _mark_done(self, url):
+        self._done.add(url)
+        self._conn.execute("UPDATE frontier SET done = 1 WHERE url = ?", (url,))
+
+    # ==================== RECORD JOURNAL ====================
+    def journal(self, record):
+        """Append a record to the journal and mark its URL done"""
+        with self._lock:
+            self._journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._journal.flush()
+            self._mark_done(record['URL'])
+            self._conn.commit()
+
+    def completed_records(self):
+        """Stream the records journaled by earlier attempts, skipping a torn last line from a crash"""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if "Variants" in record:
+                    # Journaled as JSON arrays; back to compact Variant tuples
+                    record["Variants"] = as_variants(record["Variants"])
+                yield record
+
+    def _ends_with_newline(self):
+        with open(self.journal_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def close(self):
+        with self._lock:
+            self._journal.close()
+            self._conn.close()
@@ -0,0 +1,160 @@
+"""
+Columnar Export for Activewear Crawler
+Typed Parquet datasets (via pyarrow), partitioned by brand and crawl date
+
+pyarrow is optional - install it with: pip install pyarrow
+"""
+
+import re
+import uuid
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from fabric_analysis import analyze_fabric
+from variants import as_variants
+
+PRICE_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)')
+
+CURRENCY_MARKERS = [
+    ('₹', 'INR'),
+    ('rs', 'INR'),
+    ('inr', 'INR'),
+    ('$', 'USD'),
+    ('€', 'EUR'),
+    ('£', 'GBP'),
+]
+
+SCHEMA = pa.schema([
+    ('brand', pa.dictionary(pa.int32(), pa.string())),
+    ('product_name', pa.string()),
+    ('price', pa.float64()),
+    ('currency', pa.dictionary(pa.int8(), pa.string())),
+    ('fabric_details', pa.string()),
+    ('fabric_composition', pa.map_(pa.string(), pa.float32())),
+    ('fibers', pa.list_(pa.string())),
+    ('proprietary_fabrics', pa.list_(pa.string())),
+    ('fabric_properties', pa.list_(pa.string())),
+    ('description', pa.string()),
+    ('url', pa.string()),
+    ('categories', pa.list_(pa.string())),
+    ('variants', pa.list_(pa.struct([
+        ('id', pa.int64()),
+        ('sku', pa.string()),
+        ('title', pa.string()),
+        ('size', pa.dictionary(pa.int16(), pa.string())),
+        ('colour', pa.dictionary(pa.int16(), pa.string())),
+        ('price', pa.float64()),
+        ('compare_at_price', pa.float64()),
+        ('available', pa.bool_()),
+    ]))),
+    ('crawled_at', pa.timestamp('s')),
+    ('crawl_date', pa.string()),
+])
+
+PARTITION_COLS = ['brand', 'crawl_date']
+
+
+# ==================== FIELD PARSING ====================
+def parse_price(text, default_currency='INR'):
+    """"₹1,299" / "Rs. 1,299.50" -> (1299.0, "INR"); (None, None) when there is no amount"""
+    if not text or text == "N/A":
+        return None, None
+    match = PRICE_RE.search(text)
+    if not match:
+        return None, None
+
+    lowered = text.lower()
+    currency = next((code for marker, code in CURRENCY_MARKERS if marker in lowered), default_currency)
+    return float(match.group(1).replace(',', '')), currency
+
+
+def parse_composition(fabric_text):
+    """"79% Nylon | 21% Lycra" -> [("nylon", 79.0), ("elastane", 21.0)] (see fabric_analysis.py)"""
+    return [(fiber, float(percent)) for fiber, percent in analyze_fabric(fabric_text).composition.items()]
+
+
+def parse_categories(text):
+    """"all | leggings" -> ["all", "leggings"]"""
+    if not text or text == "N/A":
+        return []
+    return [name.strip() for name in text.split('|') if name.strip()]
+
+
+def parse_crawled_at(text):
+    try:
+        return datetime.strptime(text, "%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return None
+
+
+def records_to_table(records):
+    """Convert crawler record dicts into a typed Arrow table"""
+    columns = {name: [] for name in SCHEMA.names}
+    for record in records:
+        price, currency = parse_price(record.get("Price"))
+        crawled_at = parse_crawled_at(record.get("Crawled At"))
+        fabric = analyze_fabric(record.get("Fabric Details"))
+
+        columns['brand'].append(record.get("Brand"))
+        columns['product_name'].append(record.get("Product Name"))
+        columns['price'].append(price)
+        columns['currency'].append(currency)
+        columns['fabric_details'].append(record.get("Fabric Details"))
+        columns['fabric_composition'].append(parse_composition(record.get("Fabric Details")))
+        columns['fibers'].append(list(fabric.fibers))
+        columns['proprietary_fabrics'].append(list(fabric.proprietary))
+        columns['fabric_properties'].append(list(fabric.properties))
+        columns['description'].append(record.get("Description"))
+        columns['url'].append(record.get("URL"))
+        columns['categories'].append(parse_categories(record.get("Categories")))
+        columns['variants'].append([v._asdict() for v in as_variants(record.get("Variants"))])
+        columns['crawled_at'].append(crawled_at)
+        columns['crawl_date'].append(crawled_at.strftime("%Y-%m-%d") if crawled_at else "unknown")
+
+    return pa.table(columns, schema=SCHEMA)
+
+
+def write_parquet_dataset(records, root):
+    """Write records into root/brand=<brand>/crawl_date=<YYYY-MM-DD>/part-*.parquet"""
+    table = records_to_table(records)
+    if table.num_rows:
+        pq.write_to_dataset(
+            table,
+            root_path=root,
+            partition_cols=PARTITION_COLS,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        )
+    return table.num_rows
+
+
+# ==================== STREAMING SINK ====================
+class ParquetSink:
+    """
+    Streaming Parquet dataset writer with the same interface as record_sinks.RecordSink
+    Each batch becomes one file per brand/date partition, so keep batches large.
+    Variants are kept as a nested list column, so it takes whole records in either export mode.
+    """
+
+    nested = True
+
+    def __init__(self, path, batch_size=5000):
+        self.path = path
+        self.batch_size = batch_size
+        self.count = 0
+        self._buffer = []
+
+    def write(self, record):
+        self._buffer.append(record)
+        self.count += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            write_parquet_dataset(self._buffer, self.path)
+            self._buffer = []
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,230 @@
+"""
+Crawl Metrics for Activewear Crawler
+Per-stage latency histograms and per-brand counters, exported as JSON lines or Prometheus text
+"""
+
+import cProfile
+import json
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# Where the time goes: network, rate limiting, Chrome, HTML parsing, field extraction, fabric analysis, writing outputs
+STAGES = ('throttle', 'fetch', 'render', 'scroll', 'parse', 'extract', 'analyze', 'export')
+
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus layout)"""
+
+    __slots__ = ('counts', 'count', 'sum', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Upper bucket bound containing the q-th observation (an estimate, like Prometheus)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'max': round(self.max, 6),
+            'buckets': dict(zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], self.counts)),
+        }
+
+
+class CrawlMetrics:
+    """
+    Thread-safe metrics for one crawl
+
+      stage(name)              - context manager timing one stage (see STAGES) into its histogram
+      inc(brand, event, n)     - per-brand counters: discovered, crawled, pages, errors, fabric_found, fabric_na, ...
+      record_fetch(url, ...)   - one HTTP response: fetch latency, pages and errors for the host's brand
+    """
+
+    def __init__(self, brand_hosts=None):
+        self.brand_hosts = dict(brand_hosts or {})
+        self.started = time.time()
+        self._histograms = {stage: Histogram() for stage in STAGES}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    # ==================== RECORDING ====================
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, brand, event, n=1):
+        with self._lock:
+            counters = self._counters.setdefault(brand, {})
+            counters[event] = counters.get(event, 0) + n
+
+    def brand_of(self, url):
+        return self.brand_hosts.get(urlparse(url).netloc, urlparse(url).netloc)
+
+    def record_fetch(self, url, status, seconds):
+        """Count one HTTP response against the brand that owns the URL's host"""
+        self.observe('fetch', seconds)
+        brand = self.brand_of(url)
+        self.inc(brand, 'pages')
+        if status is None or status >= 400:
+            self.inc(brand, 'errors')
+
+    def counts(self, brand):
+        with self._lock:
+            return dict(self._counters.get(brand, {}))
+
+    # ==================== EXPORT ====================
+    def snapshot(self):
+        with self._lock:
+            return {
+                'time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'elapsed': round(time.time() - self.started, 3),
+                'counters': {brand: dict(counters) for brand, counters in self._counters.items()},
+                'stages': {name: h.to_dict() for name, h in self._histograms.items() if h.count},
+            }
+
+    def write_jsonl(self, path):
+        """Append one snapshot as a JSON line"""
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.snapshot(), ensure_ascii=False) + "\n")
+
+    def prometheus_text(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP crawler_stage_seconds Time spent in each crawl stage",
+            "# TYPE crawler_stage_seconds histogram",
+        ]
+        with self._lock:
+            for name, h in self._histograms.items():
+                cumulative = 0
+                for bound, n in zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], h.counts):
+                    cumulative += n
+                    lines.append(f'crawler_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'crawler_stage_seconds_sum{{stage="{name}"}} {h.sum:.6f}')
+                lines.append(f'crawler_stage_seconds_count{{stage="{name}"}} {h.count}')
+
+            lines.append("# HELP crawler_events_total Products and pages per brand by outcome")
+            lines.append("# TYPE crawler_events_total counter")
+            for brand, counters in sorted(self._counters.items()):
+                label = brand.replace('\\', '\\\\').replace('"', '\\"')
+                for event, n in sorted(counters.items()):
+                    lines.append(f'crawler_events_total{{brand="{label}",event="{event}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+    def serve_prometheus(self, port, host='127.0.0.1'):
+        """Serve GET /metrics on a background thread; returns the server (call shutdown() to stop)"""
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = metrics.prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True, name="metrics-server").start()
+        print(f"• Metrics at http://{host}:{port}/metrics")
+        return server
+
+    def print_summary(self):
+        """Stage timing table: where the crawl's time went"""
+        stages = self.snapshot()['stages']
+        if not stages:
+            return
+        print(f"\n{'stage':<10}{'count':>8}{'total s':>10}{'mean ms':>10}{'p95 ms':>9}")
+        for name, h in stages.items():
+            print(f"{name:<10}{h['count']:>8}{h['sum']:>10.2f}{h['mean'] * 1000:>10.1f}{h['p95'] * 1000:>9.0f}")
+
+
+# ==================== PROFILING ====================
+class ProductProfiler:
+    """
+    Optional cProfile hook around per-product crawl calls
+    Each call is profiled on its own and merged into one pstats.Stats; calls that overlap a call already
+    being profiled on another thread run unprofiled (cProfile is one profiler per process on 3.12+).
+    """
+
+    def __init__(self):
+        self.stats = None
+        self.calls = 0
+        self._active = threading.Lock()
+        self._lock = threading.Lock()
+
+    def run(self, fn, *args, **kwargs):
+        if not self._active.acquire(blocking=False):
+            return fn(*args, **kwargs)
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(fn, *args, **kwargs)
+        finally:
+            self._active.release()
+            with self._lock:
+                self.calls += 1
+                if self.stats is None:
+                    self.stats = pstats.Stats(profile)
+                else:
+                    self.stats.add(profile)
+
+    def dump(self, path, top=25):
+        """Save the merged profile (open with pstats or snakeviz) and print the hottest functions"""
+        with self._lock:
+            if self.stats is None:
+                return
+            self.stats.dump_stats(path)
+            print(f"\n✓ Profiled {self.calls} product crawls -> {path}")
+            self.stats.sort_stats('cumulative').print_stats(top)
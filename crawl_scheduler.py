@@ -0,0 +1,257 @@
+"""
+Concurrent Crawl Scheduler for Activewear Crawler
+Runs brands and product pages in parallel over a bounded pool of reusable WebDrivers
+"""
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+class ResultStore:
+    """
+    Thread-safe replacement for the shared results list
+    With keep=False records are only counted, not held - for streaming crawls whose
+    records go straight to the output sinks.
+    """
+
+    def __init__(self, keep=True):
+        self.keep = keep
+        self.total = 0
+        self._records = []
+        self._lock = threading.Lock()
+
+    def append(self, record):
+        with self._lock:
+            self.total += 1
+            if self.keep:
+                self._records.append(record)
+
+    def extend(self, records):
+        records = list(records)
+        with self._lock:
+            self.total += len(records)
+            if self.keep:
+                self._records.extend(records)
+
+    def snapshot(self):
+        """Return a plain list copy that is safe to iterate while workers keep appending"""
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self.total = 0
+            self._records.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._records)
+
+    def __getitem__(self, index):
+        with self._lock:
+            return self._records[index]
+
+    def __iter__(self):
+        return iter(self.snapshot())
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+class DriverPool:
+    """
+    Bounded pool of reusable WebDrivers
+    Drivers are created lazily (up to `size`) and handed back to the pool after each use,
+    so a page load never pays for a fresh Chrome start. With max_pages set, a driver that has
+    loaded that many pages is quit on return and replaced on the next borrow, capping Chrome's memory growth.
+    """
+
+    def __init__(self, factory, size, max_pages=None):
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def driver(self):
+        """Borrow a driver; it goes back to the pool unless the caller raised or it is due for recycling"""
+        self._slots.acquire()
+        try:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self.factory()
+
+            try:
+                yield driver
+            except BaseException:
+                # A driver that blew up mid-page may be wedged - don't hand it to the next worker
+                self._quit(driver)
+                raise
+            else:
+                if self._worn_out(driver):
+                    self._quit(driver)
+                else:
+                    self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    def count_page(self, driver):
+        """Note one page load on a borrowed driver"""
+        with self._lock:
+            self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+
+    def _worn_out(self, driver):
+        with self._lock:
+            return bool(self.max_pages) and self._pages.get(id(driver), 0) >= self.max_pages
+
+    def close(self):
+        """Quit every idle driver"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
+
+    def _quit(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+class CrawlScheduler:
+    """
+    Fans product work out over a shared worker pool with a per-domain concurrency cap
+    Brands run on their own threads so one brand's category discovery never waits on another's.
+
+    Work for a host that already has per_domain_limit items running waits in that host's queue,
+    not on a worker thread, so free workers always go to hosts with a free slot. On Ctrl+C (or
+    cancel()) queued work is dropped and nothing new is started.
+    """
+
+    def __init__(self, workers=4, per_domain_limit=2):
+        self.workers = workers
+        self.per_domain_limit = per_domain_limit
+        self.cancelled = False
+        self._executor = None
+        self._job_executor = None
+        self._running = {}
+        self._waiting = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, item, url):
+        """Run fn(item) on the pool once the URL's host has a free slot; returns a Future"""
+        host = urlparse(url).netloc
+        future = Future()
+        with self._lock:
+            if self.cancelled:
+                future.cancel()
+                future.set_running_or_notify_cancel()
+                return future
+            self._pending.add(future)
+            if self._running.get(host, 0) < self.per_domain_limit:
+                self._running[host] = self._running.get(host, 0) + 1
+                self._start(host, fn, item, future)
+            else:
+                self._waiting.setdefault(host, deque()).append((fn, item, future))
+        return future
+
+    def _start(self, host, fn, item, future):
+        """Hand one item to the pool (lock held; the host's slot is already taken)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crawl-worker")
+        self._executor.submit(self._run, host, fn, item, future)
+
+    def _run(self, host, fn, item, future):
+        try:
+            with self._lock:
+                start = not future.done() and future.set_running_or_notify_cancel()
+            if start:
+                try:
+                    future.set_result(fn(item))
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            with self._lock:
+                self._pending.discard(future)
+                waiting = self._waiting.get(host)
+                if waiting and not self.cancelled:
+                    # The slot passes straight to the host's next item
+                    self._start(host, *waiting.popleft())
+                else:
+                    self._running[host] -= 1
+
+    def map_urls(self, fn, items, url_of=lambda item: item):
+        """Run fn(item) for every item on the worker pool, wait for all of them and return their results
+        in item order (None where fn raised); raises CancelledError once the scheduler is cancelled"""
+        futures = [self.submit(fn, item, url_of(item)) for item in items]
+        try:
+            wait(futures)
+        except BaseException:
+            # Ctrl+C: drop the queued work instead of waiting for all of it
+            self.cancel()
+            raise
+        if self.cancelled:
+            raise CancelledError("crawl cancelled")
+
+        results = []
+        for future in futures:
+            if future.exception():
+                print(f"✗ Worker error: {future.exception()}")
+                results.append(None)
+            else:
+                results.append(future.result())
+        return results
+
+    def run_parallel(self, jobs):
+        """Run independent jobs (e.g. one per brand) concurrently and wait for all of them"""
+        executor = ThreadPoolExecutor(max_workers=max(len(jobs), 1), thread_name_prefix="crawl-brand")
+        with self._lock:
+            self._job_executor = executor
+        futures = [executor.submit(job) for job in jobs]
+        try:
+            wait(futures)
+        except BaseException:
+            self.cancel()
+            raise
+        executor.shutdown(wait=True)
+        for future in futures:
+            if future.cancelled():
+                continue
+            if future.exception() and not isinstance(future.exception(), CancelledError):
+                print(f"✗ Brand crawl error: {future.exception()}")
+
+    def cancel(self):
+        """Stop starting work: queued items are cancelled and later submissions refused (running ones finish)"""
+        with self._lock:
+            self.cancelled = True
+            self._waiting.clear()
+            for future in self._pending:
+                # A cancelled Future only wakes wait() once notified; running ones refuse and finish normally
+                if future.cancel():
+                    future.set_running_or_notify_cancel()
+            self._pending.clear()
+            executors = [e for e in (self._executor, self._job_executor) if e]
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """Stop the worker threads, waiting for the items still running; the pool is recreated on the next
+        map_urls call"""
+        with self._lock:
+            executors = [e for e in (self._executor, self._job_executor) if e]
+            self._executor = self._job_executor = None
+        for executor in executors:
+            executor.shutdown(wait=True)
@@ -0,0 +1,159 @@
+"""
+Persistent Crawl State for Activewear Crawler
+SQLite store keyed by product URL, used to skip unchanged products on recrawls
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from sitemap import parse_lastmod
+
+# Fields that change on every crawl and must not count as a product change
+VOLATILE_FIELDS = ('Crawled At',)
+
+
+def record_hash(record):
+    """Stable hash of a record's content, ignoring crawl timestamps"""
+    content = {k: v for k, v in record.items() if k not in VOLATILE_FIELDS}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class CrawlState:
+    """
+    Remembers what every product looked like on previous runs
+
+    Per product URL it keeps the ETag / Last-Modified headers, the Shopify updated_at value,
+    a hash of the extracted record and the run in which the record last changed.
+    """
+
+    def __init__(self, path="crawl_state.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at TEXT NOT NULL,
+                finished_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS products (
+                url TEXT PRIMARY KEY,
+                brand TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                updated_at TEXT,
+                record_hash TEXT,
+                record_json TEXT,
+                last_crawled_run INTEGER,
+                last_changed_run INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_products_changed ON products (last_changed_run);
+        """)
+        self._conn.commit()
+        self.run_id = None
+
+    # ==================== RUNS ====================
+    def start_run(self):
+        """Open a new run; changes recorded from now on are attributed to it"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (started_at) VALUES (?)",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),),
+            )
+            self._conn.commit()
+            self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def finish_run(self):
+        if self.run_id is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET finished_at = ? WHERE id = ?",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), self.run_id),
+            )
+            self._conn.commit()
+
+    # ==================== LOOKUPS ====================
+    def get(self, url):
+        """Stored state for a product URL, or None if it has never been crawled"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM products WHERE url = ?", (url,)).fetchone()
+        return dict(row) if row else None
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since headers for a conditional GET"""
+        state = self.get(url)
+        headers = {}
+        if state and state['etag']:
+            headers['If-None-Match'] = state['etag']
+        if state and state['last_modified']:
+            headers['If-Modified-Since'] = state['last_modified']
+        return headers
+
+    def is_unchanged(self, url, updated_at):
+        """True when Shopify reports the same updated_at as the last crawl"""
+        if not updated_at:
+            return False
+        state = self.get(url)
+        return bool(state and state['updated_at'] == updated_at)
+
+    def is_fresh(self, url, lastmod):
+        """True when a sitemap <lastmod> is no newer than the updated_at stored on the last crawl"""
+        lastmod = parse_lastmod(lastmod)
+        if lastmod is None:
+            return False
+        state = self.get(url)
+        stored = parse_lastmod(state['updated_at']) if state else None
+        return bool(stored and stored >= lastmod)
+
+    def mark_seen(self, url):
+        """Record that an unchanged product was checked in this run"""
+        with self._lock:
+            self._conn.execute("UPDATE products SET last_crawled_run = ? WHERE url = ?", (self.run_id, url))
+            self._conn.commit()
+
+    # ==================== UPDATES ====================
+    def record(self, url, record, etag=None, last_modified=None, updated_at=None):
+        """Store a freshly extracted record; returns True if its content changed since the last crawl"""
+        new_hash = record_hash(record)
+        with self._lock:
+            row = self._conn.execute("SELECT record_hash, last_changed_run FROM products WHERE url = ?", (url,)).fetchone()
+            changed = row is None or row['record_hash'] != new_hash
+            last_changed_run = self.run_id if changed else row['last_changed_run']
+
+            self._conn.execute("""
+                INSERT INTO products (url, brand, etag, last_modified, updated_at, record_hash, record_json,
+                                      last_crawled_run, last_changed_run)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    brand = excluded.brand,
+                    etag = COALESCE(excluded.etag, products.etag),
+                    last_modified = COALESCE(excluded.last_modified, products.last_modified),
+                    updated_at = COALESCE(excluded.updated_at, products.updated_at),
+                    record_hash = excluded.record_hash,
+                    record_json = excluded.record_json,
+                    last_crawled_run = excluded.last_crawled_run,
+                    last_changed_run = excluded.last_changed_run
+            """, (url, record.get('Brand'), etag, last_modified, updated_at, new_hash,
+                  json.dumps(record, ensure_ascii=False), self.run_id, last_changed_run))
+            self._conn.commit()
+        return changed
+
+    # ==================== EXPORT ====================
+    def changed_records(self, run_id=None):
+        """Records whose content changed (or appeared) in the given run, default the current one"""
+        run_id = run_id if run_id is not None else self.run_id
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record_json FROM products WHERE last_changed_run = ? ORDER BY brand, url", (run_id,)
+            ).fetchall()
+        return [json.loads(row['record_json']) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -5,18 +5,47 @@ Fast, full-site crawling for all products; CSV output enabled
 
 # ==================== CRAWL SETTINGS ====================
 CRAWL_CONFIG = {
-    'page_load_delay': 0.5,      # Minimal wait for page loads (adjust if you get rate-limited)
-    'between_products_delay': 0.05,   # As fast as practical between products
-    'scroll_delay': 0.15,        # Minimal delay between scrolls
-    'scroll_iterations': 1,      # Only 1 scroll to speed up crawling
+    'page_load_delay': 0.5,      # Settle time after the page's title/price/fabric element appears
+    'requests_per_second': 2.0,  # Token-bucket rate per site (lowered by robots.txt Crawl-delay and slow responses)
+    'burst': 4,                  # Requests a site may get back-to-back before the rate applies
+    'circuit_cooldown': 5.0,     # Pause after a 429/503 (doubles on repeats; Retry-After wins if longer)
+    'respect_robots_txt': True,  # Fetch each site's robots.txt once per run and honour its Crawl-delay
+    'scroll_delay': 0.15,        # Poll interval while waiting for more products after a scroll
+    'scroll_iterations': 10,     # Max scrolls; stops early once the product count stops growing
+    'scroll_timeout': 2.0,       # Give up scrolling if no new products appear within this many seconds
+    'ready_timeout': 10,         # Max wait for a page's title/price/fabric element
+    'backoff_max_delay': 60,     # Cap on a circuit-breaker cooldown
+    'slow_response_threshold': 5.0,  # Responses slower than this (seconds) widen the domain's delay
+    'request_timeout': 15,       # Seconds before an HTTP request (connect or read) is abandoned
+    'page_load_timeout': 30,     # Seconds before Chrome gives up on a page load (a hung page no longer blocks a worker)
+    'retry_attempts': 3,         # Tries per product on network/timeout/blocked/5xx errors
+    'retry_base_delay': 1.0,     # First retry waits 0.5-1x this; each further retry doubles it (with jitter)
+    'retry_max_delay': 30.0,     # Cap on one retry wait
+    'dead_letter_queue': 'crawl_failures.jsonl',  # Products that failed every try (rerun: run_crawler.py --retry-failed)
+    'state_db': 'crawl_state.db',    # incremental=True: SQLite store of ETags, updated_at and record hashes
+    'checkpoint_dir': 'crawl_checkpoint',  # Frontier + record journal written as the crawl runs (for --resume)
     'max_products_per_category': None, # No product limit, crawl all!
+    'max_collection_pages': 50,  # Safety cap when following a rendered collection's ?page=N links
+    'use_sitemaps': True,        # Without products.json, discover products from sitemap.xml before rendering collections
     'headless': True,            # Headless browser for best performance
-    'window_size': '1920,1080',
+    'window_size': '1920,1080',      # Chrome window size for the Selenium fallback
+    'driver_max_pages': 200,     # Quit and replace a pooled Chrome after this many page loads (caps memory growth)
     'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'workers': 4,                # Product workers (and pooled WebDrivers) shared by all brands
+    'per_domain_concurrency': 2, # Max concurrent requests against one brand site
+    'async_max_in_flight': 200,  # engine="async": total requests in flight per brand crawl
+    'async_per_host': 16,        # engine="async": keep-alive connections per brand host
+    'parse_processes': 0,        # Parse product pages in this many worker processes (0: on the fetch threads)
+    'parse_queue_size': 64,      # Fetched pages allowed to wait for a parse worker before fetchers block
+    'parser': 'lxml',            # HTML parser: 'html.parser', 'lxml' or 'selectolax' (a brand config's 'parser' overrides)
+    'metrics_jsonl': None,       # e.g. 'crawl_metrics.jsonl': append a metrics snapshot per brand and at the end
+    'metrics_port': None,        # e.g. 9108: serve Prometheus metrics at http://127.0.0.1:9108/metrics
+    'base_url_overrides': {},    # e.g. {'kica': 'http://127.0.0.1:8800'}: crawl a local mock store instead (see mock_shopify.py)
 }
 
 # ==================== BRAND CONFIGURATIONS ====================
 KICA_CONFIG = {
+    'name': 'Kica Active',
     'base_url': 'https://kicaactive.com',
     'categories': [
         '/collections/all',
@@ -39,6 +68,7 @@ KICA_CONFIG = {
 }
 
 BLISSCLUB_CONFIG = {
+    'name': 'BlissClub',
     'base_url': 'https://blissclub.com',
     'categories': [
         '/collections/all',
@@ -60,6 +90,7 @@ BLISSCLUB_CONFIG = {
 }
 
 SILVERTRAQ_CONFIG = {
+    'name': 'SilverTraq',
     'base_url': 'https://www.silvertraq.com',
     'categories': [
         '/collections/all',
@@ -80,6 +111,7 @@ SILVERTRAQ_CONFIG = {
 }
 
 TERRACTIVE_CONFIG = {
+    'name': 'Terra-active',
     'base_url': 'https://terractive.in',
     'categories': [
         '/collections/all',
@@ -98,6 +130,17 @@ TERRACTIVE_CONFIG = {
     }
 }
 
+# Every brand the crawler knows about. Adding a Shopify brand is a config change:
+# give it a name, base_url, categories and product_selectors and register it here.
+# Optional 'fabric_extractor' names a plugin in brand_engine.FABRIC_EXTRACTORS
+# (defaults to the brand key, then to the generic keyword/percentage extractor).
+BRAND_CONFIGS = {
+    'kica': KICA_CONFIG,
+    'blissclub': BLISSCLUB_CONFIG,
+    'silvertraq': SILVERTRAQ_CONFIG,
+    'terractive': TERRACTIVE_CONFIG,
+}
+
 # ==================== EXPORT SETTINGS ====================
 EXPORT_CONFIG = {
     'csv_filename': 'activewear_output_download.csv',  # Clear filename for downloading
@@ -105,6 +148,9 @@ EXPORT_CONFIG = {
     'include_timestamp': True,
     'csv_encoding': 'utf-8',
     'json_indent': 2,
+    'flush_every': 50,           # Streaming outputs write and flush every N records
+    'rows': 'product',           # 'product': one row per product, variants summarized; 'variant': one row per variant
+    'snapshot_db': 'activewear_snapshots.db',  # Append-only history of every crawl (None: keep no history)
 }
 
 
@@ -127,4 +173,26 @@ OUTPUT_FIELDS = [
     'Description',
     'URL',
     'Crawled At',
+    'Categories',  # Every collection the product is listed in, e.g. "all | leggings"
+    'Fiber Composition',    # Parsed from Fabric Details, fibers normalized: "79% nylon | 21% elastane"
+    'Fibers',               # Every fiber named, with or without a percentage: "nylon | elastane"
+    'Proprietary Fabrics',  # Brand fabric names: "TraqTech", "TerraSoft", "LYCRA"
+    'Fabric Properties',    # "moisture-wicking | quick-dry | four-way stretch"
+    'Sizes',                # Variant summary: "XS | S | M | L | XL"
+    'Colours',              # "Black | Navy"
+    'Variant Count',
+    'In Stock Variants',
+]
+
+# With EXPORT_CONFIG['rows'] = 'variant' each row is one variant: the product fields above
+# (except the variant summary) followed by these
+VARIANT_OUTPUT_FIELDS = [
+    'Variant ID',
+    'SKU',
+    'Size',
+    'Colour',
+    'Variant Title',
+    'Variant Price',      # "Rs. 1,299"
+    'Compare At Price',   # Pre-sale price, or "N/A"
+    'Availability',       # "In stock" / "Sold out"
 ]
@@ -0,0 +1,154 @@
+"""
+Compiled Single-Pass Extractor for Activewear Crawler
+Pulls product name, price, description and fabric candidates out of a page in one document walk
+"""
+
+import re
+import soupsieve
+from bs4 import NavigableString, Tag
+from crawler_config import FABRIC_PATTERNS
+
+# FABRIC_PATTERNS, compiled once: [0] percentages ("79% Nylon"), [2] fabric properties ("quick-dry").
+# [1] (capitalised word lists) is too loose to use on whole pages.
+COMPILED_FABRIC_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in FABRIC_PATTERNS]
+PERCENT_PATTERN = COMPILED_FABRIC_PATTERNS[0]
+PROPERTY_PATTERN = COMPILED_FABRIC_PATTERNS[2]
+
+ACCORDION_CLASS_RE = re.compile(r'accordion|tab', re.IGNORECASE)
+
+# tag, tag.class, tag[attr="v"], tag[attr*="v" i] ... - everything the brand configs use
+SIMPLE_SELECTOR_RE = re.compile(
+    r'^(?P<tag>[a-zA-Z][\w-]*)?'
+    r'(?:\.(?P<cls>[\w-]+))?'
+    r'(?:\[(?P<attr>[\w-]+)(?P<op>[*^$]?=)"(?P<value>[^"]*)"(?P<icase>\s+i)?\])?$'
+)
+
+
+def compile_selector(selector):
+    """
+    Compile one simple CSS selector into (tag name or None, predicate)
+    Simple selectors become plain attribute checks; anything else falls back to soupsieve.
+    """
+    selector = selector.strip()
+    m = SIMPLE_SELECTOR_RE.match(selector)
+    if not m or not any(m.group('tag', 'cls', 'attr')):
+        return None, soupsieve.compile(selector).match
+
+    tag, cls, attr, op, value, icase = m.group('tag', 'cls', 'attr', 'op', 'value', 'icase')
+    if icase:
+        value = value.lower()
+
+    def matches(el):
+        if cls and cls not in (el.get('class') or ()):
+            return False
+        if attr:
+            actual = el.get(attr)
+            if actual is None:
+                return False
+            if isinstance(actual, list):
+                actual = " ".join(actual)
+            if icase:
+                actual = actual.lower()
+            if op == '=':
+                return actual == value
+            if op == '*=':
+                return value in actual
+            if op == '^=':
+                return actual.startswith(value)
+            return actual.endswith(value)
+        return True
+
+    return (tag.lower() if tag else None), matches
+
+
+def fabric_pattern_text(text):
+    """Fabric percentages and properties found by FABRIC_PATTERNS, joined like the page sections"""
+    if not text:
+        return "N/A"
+    found = PERCENT_PATTERN.findall(text) + PROPERTY_PATTERN.findall(text)
+    return " | ".join(dict.fromkeys(match.strip() for match in found)) or "N/A"
+
+
+class ExtractedPage:
+    """Everything one walk of a product page found"""
+
+    __slots__ = ('soup', 'elements', 'fabric_node', 'next_ul', 'next_div', 'accordions')
+
+    def __init__(self, soup):
+        self.soup = soup
+        self.elements = {}
+        self.fabric_node = None
+        self.next_ul = None
+        self.next_div = None
+        self.accordions = []
+
+    def get(self, field):
+        """The element matched for a field, or None"""
+        return self.elements.get(field)
+
+
+class CompiledExtractor:
+    """
+    Single-pass extractor for one brand's product_selectors
+
+    fields: {'product_name': 'h1.product-title, h1', ...} - comma-separated selectors are
+    ordered fallbacks; the earliest selector wins, then the first element in document order.
+    """
+
+    def __init__(self, fields, fabric_keywords):
+        self.fields = list(fields)
+        self.fabric_re = re.compile('|'.join(re.escape(k) for k in fabric_keywords), re.IGNORECASE)
+
+        by_tag = {}
+        any_tag = []
+        for field, selector in fields.items():
+            for priority, part in enumerate(p for p in selector.split(',') if p.strip()):
+                tag, predicate = compile_selector(part)
+                matcher = (field, priority, predicate)
+                if tag:
+                    by_tag.setdefault(tag, []).append(matcher)
+                else:
+                    any_tag.append(matcher)
+
+        self._any_tag = tuple(any_tag)
+        self._by_tag = {tag: tuple(matchers) + self._any_tag for tag, matchers in by_tag.items()}
+
+    def extract(self, soup):
+        """Walk the document once and collect every candidate"""
+        page = ExtractedPage(soup)
+        best = {}
+        by_tag = self._by_tag
+        any_tag = self._any_tag
+        fabric_re = self.fabric_re
+        n_fields = len(self.fields)
+
+        for node in soup.descendants:
+            if isinstance(node, Tag):
+                name = node.name
+                for field, priority, predicate in by_tag.get(name, any_tag):
+                    current = best.get(field)
+                    if (current is None or priority < current) and predicate(node):
+                        best[field] = priority
+                        page.elements[field] = node
+
+                if name == 'div':
+                    classes = node.get('class')
+                    if classes and ACCORDION_CLASS_RE.search(" ".join(classes)):
+                        page.accordions.append(node)
+
+                if page.fabric_node is not None:
+                    if name == 'ul' and page.next_ul is None:
+                        page.next_ul = node
+                    elif name == 'div' and page.next_div is None:
+                        page.next_div = node
+
+            # Plain text only - skips comments, <script> and <style> contents
+            elif page.fabric_node is None and type(node) is NavigableString and fabric_re.search(node):
+                page.fabric_node = node
+
+            if (page.next_ul is not None and len(best) == n_fields
+                    and not any(best.values())):
+                # Every field has its first-choice match and the fabric block is found
+                break
+
+        return page
@@ -0,0 +1,229 @@
+"""
+Fabric Analysis for Activewear Crawler
+Turns free-text "Fabric Details" into fiber percentages, normalized fibers, proprietary fabrics and properties
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+
+# ==================== VOCABULARY ====================
+# Canonical fiber -> names it is sold under. Spandex and LYCRA are the same fiber as elastane.
+FIBER_ALIASES = {
+    'elastane': ['elastane', 'elastan', 'spandex', 'lycra', 'creora', 'roica'],
+    'nylon': ['nylon', 'polyamide', 'supplex'],
+    'polyester': ['polyester', 'poly', 'coolmax', 'dri-fit'],
+    'cotton': ['cotton', 'supima', 'pima cotton'],
+    'viscose': ['viscose', 'rayon'],
+    'modal': ['modal', 'micromodal'],
+    'lyocell': ['lyocell', 'tencel'],
+    'bamboo': ['bamboo'],
+    'polypropylene': ['polypropylene'],
+    'acrylic': ['acrylic'],
+    'wool': ['wool', 'merino'],
+    'linen': ['linen'],
+    'silk': ['silk'],
+    'hemp': ['hemp'],
+}
+ALIAS_TO_FIBER = {alias: fiber for fiber, aliases in FIBER_ALIASES.items() for alias in aliases}
+
+# Brand fabric names -> how the brands write them
+PROPRIETARY_FABRICS = {
+    'terrasoft': 'TerraSoft',
+    'traqtech': 'TraqTech',
+    'lycra': 'LYCRA',
+    'supplex': 'Supplex',
+    'coolmax': 'Coolmax',
+    'tencel': 'Tencel',
+    'dri-fit': 'Dri-FIT',
+}
+
+# Property -> pattern (the phrasings seen across the four brands)
+FABRIC_PROPERTIES = {
+    'moisture-wicking': r'(?:moisture|sweat)[- ]?wicking|wicks? (?:away )?(?:sweat|moisture)',
+    'quick-dry': r'quick[- ]?dry(?:ing)?|fast[- ]?dry(?:ing)?',
+    'breathable': r'breathab(?:le|ility)',
+    'four-way stretch': r'(?:4|four)[- ]way[- ]stretch',
+    'stretchy': r'stretchy|high[- ]stretch',
+    'squat-proof': r'squat[- ]?proof',
+    'anti-odour': r'anti[- ]?odou?r|odou?r[- ](?:resistant|control)',
+    'anti-microbial': r'anti[- ]?(?:microbial|bacterial)',
+    'uv protection': r'\bupf\b|\buv[- ]?(?:protection|protective|resistant)',
+    'lightweight': r'light[- ]?weight',
+    'soft': r'\bsoft\b|buttery|brushed',
+    'sculpting': r'sculpt(?:ing|s)?|compression',
+    'recycled': r'recycled',
+    'organic': r'\borganic\b',
+    'non-see-through': r'non[- ]see[- ]through|opaque',
+}
+
+# Regex alternation of every fiber name, longest first
+FIBER_NAME_PATTERN = "|".join(re.escape(alias) for alias in sorted(ALIAS_TO_FIBER, key=len, reverse=True))
+_MODIFIERS = r'(?:(?:recycled|organic|combed|brushed|premium)\s+)*'
+
+# "79% Nylon", "79 % recycled polyester" - or the reverse, "Nylon 79%", "Nylon: 79%"
+FIBER_PERCENT_RE = re.compile(
+    rf'(?<![\d.])(?P<p1>\d{{1,3}}(?:\.\d+)?)\s*%\s*(?:of\s+)?{_MODIFIERS}(?P<f1>{FIBER_NAME_PATTERN})\b'
+    rf'|\b(?P<f2>{FIBER_NAME_PATTERN})\s*(?:[:\-–]\s*)?(?P<p2>\d{{1,3}}(?:\.\d+)?)\s*%'
+)
+FIBER_RE = re.compile(rf'\b(?:{FIBER_NAME_PATTERN})\b')
+PROPRIETARY_RE = re.compile(r'\b(' + "|".join(re.escape(name) for name in PROPRIETARY_FABRICS) + r')\b')
+PROPERTY_RES = [(name, re.compile(pattern)) for name, pattern in FABRIC_PROPERTIES.items()]
+TRADEMARK_RE = re.compile(r'[®™]')
+
+
+# ==================== ANALYSIS ====================
+class FabricAnalysis:
+    """
+    Structured view of one fabric text
+    Instances are cached and shared between products with the same text - treat them as read-only.
+    """
+
+    __slots__ = ('composition', 'fibers', 'proprietary', 'properties')
+
+    def __init__(self, composition, fibers, proprietary, properties):
+        self.composition = composition      # {"nylon": 79, "elastane": 21}, in the order written
+        self.fibers = fibers                # ("nylon", "elastane") - every fiber named, with or without a %
+        self.proprietary = proprietary      # ("TraqTech",)
+        self.properties = properties        # ("moisture-wicking", "quick-dry")
+
+    def composition_text(self):
+        """ "79% nylon | 21% elastane", or "N/A" """
+        return " | ".join(f"{percent:g}% {fiber}" for fiber, percent in self.composition.items()) or "N/A"
+
+    def to_fields(self):
+        """Flat record fields, " | "-joined like Categories"""
+        return {
+            "Fiber Composition": self.composition_text(),
+            "Fibers": " | ".join(self.fibers) or "N/A",
+            "Proprietary Fabrics": " | ".join(self.proprietary) or "N/A",
+            "Fabric Properties": " | ".join(self.properties) or "N/A",
+        }
+
+    def to_dict(self):
+        return {
+            'composition': dict(self.composition),
+            'fibers': list(self.fibers),
+            'proprietary': list(self.proprietary),
+            'properties': list(self.properties),
+        }
+
+
+def _percent(text):
+    value = float(text)
+    return int(value) if value == int(value) else value
+
+
+def parse_fabric(text):
+    """Analyze one fabric text (uncached - use analyze_fabric)"""
+    lowered = TRADEMARK_RE.sub('', text or "").lower()
+
+    composition = {}
+    for m in FIBER_PERCENT_RE.finditer(lowered):
+        alias, percent = (m.group('f1'), m.group('p1')) if m.group('f1') else (m.group('f2'), m.group('p2'))
+        percent = _percent(percent)
+        if 0 < percent <= 100:
+            composition.setdefault(ALIAS_TO_FIBER[alias], percent)
+        # The first full blend is the main fabric; what follows is a lining or trim
+        if sum(composition.values()) >= 100:
+            break
+
+    fibers = dict.fromkeys(composition)
+    fibers.update(dict.fromkeys(ALIAS_TO_FIBER[alias] for alias in FIBER_RE.findall(lowered)))
+
+    proprietary = dict.fromkeys(PROPRIETARY_FABRICS[name] for name in PROPRIETARY_RE.findall(lowered))
+    properties = tuple(name for name, pattern in PROPERTY_RES if pattern.search(lowered))
+
+    return FabricAnalysis(composition, tuple(fibers), tuple(proprietary), properties)
+
+
+EMPTY_ANALYSIS = FabricAnalysis({}, (), (), ())
+
+
+class FabricAnalyzer:
+    """
+    parse_fabric() behind an LRU cache keyed by a hash of the text
+    Products of one range share identical fabric blocks, so most lookups are hits. Thread-safe.
+    """
+
+    def __init__(self, max_entries=50000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def analyze(self, text):
+        if not text or text == "N/A":
+            return EMPTY_ANALYSIS
+        key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+        with self._lock:
+            analysis = self._cache.get(key)
+            if analysis is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return analysis
+
+        analysis = parse_fabric(text)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = analysis
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return analysis
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+# Shared by the crawler and the Parquet export
+DEFAULT_ANALYZER = FabricAnalyzer()
+
+
+def analyze_fabric(text):
+    """Cached analysis of a "Fabric Details" string"""
+    return DEFAULT_ANALYZER.analyze(text)
+
+
+# ==================== EXPORT POST-PROCESSING ====================
+def read_records(path):
+    """Records from a CSV, JSON array or JSON Lines export"""
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.endswith('.csv'):
+            return list(csv.DictReader(f))
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+def write_records(path, records):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if path.endswith('.csv'):
+            fieldnames = list(dict.fromkeys(name for record in records for name in record))
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(records)
+        elif path.endswith('.jsonl'):
+            f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+        else:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add fabric analysis columns to an existing export")
+    parser.add_argument('input', help="CSV, JSON or JSON Lines export")
+    parser.add_argument('-o', '--output', help="where to write (default: overwrite the input)")
+    args = parser.parse_args()
+
+    records = read_records(args.input)
+    for record in records:
+        record.update(analyze_fabric(record.get("Fabric Details")).to_fields())
+    write_records(args.output or args.input, records)
+    print(f"✓ Analyzed {len(records)} records -> {args.output or args.input} "
+          f"({DEFAULT_ANALYZER.hit_rate():.0%} cache hits)")
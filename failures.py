@@ -0,0 +1,216 @@
+"""
+Failure Handling for Activewear Crawler
+Classified errors, exponential-backoff retries with jitter and a re-runnable dead-letter queue of failed URLs
+"""
+
+import asyncio
+import json
+import os
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import requests
+
+# What went wrong, coarsely enough to decide whether trying again can help
+ERROR_KINDS = ('network', 'timeout', 'blocked', 'server', 'parse', 'other')
+RETRYABLE_KINDS = ('network', 'timeout', 'blocked', 'server')
+
+# Statuses a storefront answers when it is refusing us rather than failing
+BLOCKED_STATUSES = (403, 429, 503)
+
+
+class CrawlError(Exception):
+    """An error that already knows its kind (see ERROR_KINDS)"""
+
+    def __init__(self, message, kind='other'):
+        super().__init__(message)
+        self.kind = kind
+
+
+def classify_error(error):
+    """Kind of a fetch/render/extract exception: network, timeout, blocked, server, parse or other"""
+    if isinstance(error, CrawlError):
+        return error.kind
+
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is None:
+        # aiohttp.ClientResponseError carries the status itself
+        status = getattr(error, 'status', None)
+    if isinstance(status, int):
+        if status in BLOCKED_STATUSES:
+            return 'blocked'
+        if status >= 500:
+            return 'server'
+        return 'other'
+
+    if isinstance(error, (requests.Timeout, socket.timeout, asyncio.TimeoutError, TimeoutError)):
+        return 'timeout'
+    # Selenium and aiohttp are only classified by name, so this module needs neither installed
+    names = {cls.__name__ for cls in type(error).__mro__}
+    if 'TimeoutException' in names or 'ServerTimeoutError' in names:
+        return 'timeout'
+    if isinstance(error, (requests.ConnectionError, ConnectionError)) or names & {'ClientConnectionError',
+                                                                                   'ClientPayloadError',
+                                                                                   'WebDriverException'}:
+        return 'network'
+    if isinstance(error, (ValueError, KeyError, IndexError, AttributeError, TypeError)):
+        return 'parse'
+    return 'other'
+
+
+# ==================== RETRIES ====================
+class RetryPolicy:
+    """
+    Retries transient failures (RETRYABLE_KINDS) with exponential backoff and jitter
+
+    The n-th retry waits a random time between half and all of min(base_delay * 2**n, max_delay),
+    so workers that failed together don't all come back at once.
+    """
+
+    def __init__(self, max_attempts=3, base_delay=1.0, max_delay=30.0, sleep=time.sleep):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a policy from CRAWL_CONFIG"""
+        return cls(
+            max_attempts=config.get('retry_attempts', 3),
+            base_delay=config.get('retry_base_delay', 1.0),
+            max_delay=config.get('retry_max_delay', 30.0),
+        )
+
+    def delay(self, retry):
+        """Seconds to wait before retry number `retry` (0 for the first retry)"""
+        cap = min(self.base_delay * 2 ** retry, self.max_delay)
+        return cap / 2 + random.uniform(0, cap / 2)
+
+    def call(self, fn, *args, on_retry=None):
+        """
+        fn(*args), retried while it raises a retryable error; the last error is re-raised with
+        `.attempts` set. on_retry(attempt, kind, error, delay) runs before each wait.
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return fn(*args)
+            except Exception as e:
+                delay = self._give_up_or_delay(e, attempt, on_retry)
+                if delay is None:
+                    raise
+            self.sleep(delay)
+
+    async def acall(self, fn, *args, on_retry=None):
+        """Like call(), for a coroutine function, waiting with asyncio.sleep"""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return await fn(*args)
+            except Exception as e:
+                delay = self._give_up_or_delay(e, attempt, on_retry)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+
+    def _give_up_or_delay(self, error, attempt, on_retry):
+        error.attempts = attempt
+        kind = classify_error(error)
+        if kind not in RETRYABLE_KINDS or attempt >= self.max_attempts:
+            return None
+        delay = self.delay(attempt - 1)
+        if on_retry:
+            on_retry(attempt, kind, error, delay)
+        return delay
+
+
+# ==================== DEAD-LETTER QUEUE ====================
+class DeadLetterQueue:
+    """
+    URLs that still failed after every retry, one JSON object per line:
+      {"url", "type", "brand" (config key), "categories", "kind", "error", "attempts", "failed_at"}
+    type is "product", or "category" for a collection whose product listing could not be read.
+
+    take() hands the queue over for a retry pass: it is moved aside to <path>.retrying (so a pass that
+    dies part-way loses nothing) and URLs that fail again are appended to a fresh queue. finish_retry()
+    drops the moved-aside file once the pass is done.
+    """
+
+    def __init__(self, path="crawl_failures.jsonl"):
+        self.path = path
+        self.retrying_path = f"{path}.retrying"
+        self._lock = threading.Lock()
+
+    def add(self, url, brand, error, attempts=1, categories=(), entry_type='product'):
+        entry = {
+            "url": url,
+            "type": entry_type,
+            "brand": brand,
+            "categories": list(categories),
+            "kind": classify_error(error),
+            "error": str(error)[:500] or type(error).__name__,
+            "attempts": attempts,
+            "failed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+    def entries(self, path=None):
+        """The latest entry per URL, in the order they failed"""
+        path = path or self.path
+        latest = {}
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                latest.pop(entry['url'], None)
+                latest[entry['url']] = entry
+        return list(latest.values())
+
+    def take(self):
+        """Every queued URL, moving the queue aside so re-failures start a fresh one"""
+        with self._lock:
+            if os.path.exists(self.path):
+                if os.path.exists(self.retrying_path):
+                    # An earlier pass died part-way: its leftovers are retried too
+                    with open(self.retrying_path, 'a', encoding='utf-8') as out, \
+                            open(self.path, encoding='utf-8') as queued:
+                        out.write(queued.read())
+                    os.remove(self.path)
+                else:
+                    os.replace(self.path, self.retrying_path)
+        return self.entries(self.retrying_path)
+
+    def requeue(self, entry):
+        """Put an entry taken for a retry pass back unchanged (e.g. one for a brand the pass leaves out)"""
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def finish_retry(self):
+        with self._lock:
+            if os.path.exists(self.retrying_path):
+                os.remove(self.retrying_path)
+
+    def clear(self):
+        """Start an empty queue (a fresh crawl)"""
+        with self._lock:
+            for path in (self.path, self.retrying_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def summary(self):
+        """{kind: count} of the URLs currently queued"""
+        return Counter(entry['kind'] for entry in self.entries())
+
+    def __len__(self):
+        return len(self.entries())
@@ -0,0 +1,95 @@
+"""
+Fixture Corpus for Activewear Crawler
+Record fetched pages per brand into gzip-compressed JSON Lines and replay them offline
+"""
+
+import gzip
+import json
+import os
+import threading
+from urllib.parse import urlencode, urlparse
+
+# Page kinds, from the URL shape
+COLLECTION_HTML = 'collection_html'
+COLLECTION_JSON = 'collection_json'
+PRODUCT_HTML = 'product_html'
+PRODUCT_JSON = 'product_json'
+
+
+def classify_url(url):
+    """Which kind of page a URL is: collection/product, HTML/JSON"""
+    path = urlparse(url).path
+    if path.endswith('/products.json'):
+        return COLLECTION_JSON
+    if '/products/' in path:
+        return PRODUCT_JSON if path.endswith(('.json', '.js')) else PRODUCT_HTML
+    return COLLECTION_HTML
+
+
+def full_url(url, params=None):
+    """URL with its query parameters, as the corpus stores it"""
+    if not params:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+
+
+class FixtureRecorder:
+    """
+    Appends every fetched page to <directory>/<brand>.jsonl.gz
+    One JSON object per line: {"url", "kind", "status", "body"}. Pages from hosts that belong to no
+    brand go to _other.jsonl.gz. Safe to share between worker threads.
+    """
+
+    def __init__(self, directory, brand_hosts):
+        self.directory = directory
+        self.brand_hosts = dict(brand_hosts)
+        self.count = 0
+        self._files = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def record(self, url, status, body, params=None):
+        if body is None:
+            return
+        url = full_url(url, params)
+        if not isinstance(body, str):
+            body = json.dumps(body, ensure_ascii=False)
+        brand = self.brand_hosts.get(urlparse(url).netloc, '_other')
+        line = json.dumps({'url': url, 'kind': classify_url(url), 'status': status, 'body': body},
+                          ensure_ascii=False)
+
+        with self._lock:
+            f = self._files.get(brand)
+            if f is None:
+                # Appending adds a new gzip member; readers see one continuous file
+                f = self._files[brand] = gzip.open(os.path.join(self.directory, f"{brand}.jsonl.gz"), 'at',
+                                                   encoding='utf-8')
+            f.write(line + "\n")
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            for f in self._files.values():
+                f.close()
+            self._files.clear()
+        print(f"✓ Recorded {self.count} pages to {self.directory}")
+
+
+def iter_corpus(directory, brand):
+    """Replay one brand's recorded pages in the order they were fetched"""
+    path = os.path.join(directory, f"{brand}.jsonl.gz")
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Torn last line from an interrupted recording
+                continue
+
+
+def corpus_brands(directory):
+    """Brand keys with a recorded corpus in the directory"""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name[:-len('.jsonl.gz')] for name in os.listdir(directory)
+                  if name.endswith('.jsonl.gz') and not name.startswith('_'))
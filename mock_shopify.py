@@ -0,0 +1,433 @@
+"""
+Mock Shopify Stores for Activewear Crawler
+Local stand-ins for the brand sites (collections, products.json, sitemaps, product pages) with injectable latency, errors and 429s
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from crawler_config import BRAND_CONFIGS
+
+# Products per rendered collection page, and Shopify's cap on ?limit= for products.json
+HTML_PAGE_SIZE = 24
+JSON_PAGE_LIMIT = 250
+# Product URLs per sitemap_products_N.xml
+SITEMAP_PAGE_SIZE = 5000
+
+SIZES = ['XS', 'S', 'M', 'L', 'XL']
+COLOURS = ['Black', 'Navy', 'Sage', 'Plum']
+STYLES = ['Flow', 'Airlite', 'Cloudsoft', 'Power', 'Everyday', 'Studio', 'Trail', 'Sculpt']
+PRODUCT_TYPES = {
+    'sports-bras': 'Sports Bra', 'leggings': 'Legging', 'tops': 'Top', 'flare-pants': 'Flare Pant',
+    'shorts': 'Shorts', 'tracks': 'Track Pant', 'co-ord-sets': 'Co-ord Set', 'sports-tanks': 'Tank',
+    'undies': 'Brief', 'joggers': 'Jogger', 'jackets': 'Jacket', 'tees': 'Tee', 'bottoms': 'Pant',
+    'women': 'Crop Top', 'men': 'Training Tee', 'terrasoft': 'TerraSoft Tee',
+}
+
+# (heading, composition lines) in each brand's own wording, so its fabric_keywords match
+BRAND_FABRICS = {
+    'kica': ('Fabric', ['79% Nylon', '21% Lycra', 'Four-way stretch, squat proof']),
+    'blissclub': ('Fabric Details', ['76% Polyester', '24% Spandex', 'Moisture-wicking, quick-dry']),
+    'silvertraq': ('TraqTech Fabric', ['88% Polyester', '12% Elastane', 'Anti-odour, breathable']),
+    'terractive': ('TerraSoft Fabric', ['95% Organic Cotton', '5% Elastane', 'Soft, breathable']),
+}
+DEFAULT_FABRIC = ('Fabric', ['80% Nylon', '20% Spandex'])
+
+
+class MockStore:
+    """
+    A generated catalog for one brand config
+    Every product is in /collections/all plus one or two of the config's other collections; a share of
+    products leave the fabric out of their JSON body_html so the crawler's product-page fallback runs.
+    """
+
+    def __init__(self, key, config, products=200, fabric_in_json=0.8, seed=0):
+        self.key = key
+        self.name = config['name']
+        rng = random.Random(f"{seed}:{key}")
+
+        handles = [path.rstrip('/').split('/')[-1] for path in config['categories']]
+        groups = [h for h in handles if h != 'all'] or handles
+        self.collections = {handle: [] for handle in handles}
+        self.products = {}
+
+        updated = datetime(2026, 1, 1)
+        for i in range(products):
+            collection = groups[i % len(groups)]
+            kind = PRODUCT_TYPES.get(collection, collection.replace('-', ' ').title())
+            title = f"{STYLES[(i // len(groups)) % len(STYLES)]} {kind} {i + 1}"
+            handle = title.lower().replace(' ', '-')
+            product = self._product(i, title, handle, kind, rng.random() < fabric_in_json,
+                                    updated + timedelta(minutes=i))
+            self.products[handle] = product
+
+            member_of = {'all', collection}
+            if i % 3 == 0:
+                member_of.add(groups[(i * 7 + 1) % len(groups)])
+            for name in member_of:
+                if name in self.collections:
+                    self.collections[name].append(product)
+
+    def _product(self, i, title, handle, kind, fabric_in_json, updated):
+        heading, lines = BRAND_FABRICS.get(self.key, DEFAULT_FABRIC)
+        fabric_html = f"<h4>{heading}</h4><ul>{''.join(f'<li>{line}</li>' for line in lines)}</ul>"
+        description = f"<p>The {escape(title)} is built for training, studio sessions and everyday wear.</p>"
+        price = 999 + (i * 100) % 2000
+
+        return {
+            'id': 7000000000 + i,
+            'title': title,
+            'handle': handle,
+            'vendor': self.name,
+            'product_type': kind,
+            'body_html': description + (fabric_html if fabric_in_json else ""),
+            'fabric_html': fabric_html,
+            'created_at': updated.strftime("%Y-%m-%dT%H:%M:%S+05:30"),
+            'updated_at': updated.strftime("%Y-%m-%dT%H:%M:%S+05:30"),
+            'tags': [kind.lower(), self.key],
+            'variants': [
+                {
+                    'id': 40000000000 + i * 100 + n,
+                    'title': f"{size} / {colour}",
+                    'option1': size,
+                    'option2': colour,
+                    'sku': f"{self.key.upper()}-{i + 1:05d}-{size}-{colour[:3].upper()}",
+                    'price': f"{price}.00",
+                    'compare_at_price': f"{price + 500}.00" if i % 4 == 0 else None,
+                    'available': (i + n) % 7 != 0,
+                }
+                for n, (size, colour) in enumerate((s, c) for c in COLOURS[:2] for s in SIZES)
+            ],
+            'options': [{'name': 'Size', 'values': SIZES}, {'name': 'Colour', 'values': COLOURS[:2]}],
+        }
+
+    # ==================== ENDPOINTS ====================
+    def products_json(self, collection, page, limit):
+        products = self.collections.get(collection)
+        if products is None:
+            return None
+        limit = max(1, min(limit, JSON_PAGE_LIMIT))
+        start = (page - 1) * limit
+        return {'products': [self._public(p) for p in products[start:start + limit]]}
+
+    def product_json(self, handle):
+        product = self.products.get(handle)
+        return {'product': self._public(product)} if product else None
+
+    def product_js(self, handle):
+        """The .js shape: prices in paise and 'description' instead of body_html"""
+        product = self.products.get(handle)
+        if product is None:
+            return None
+        public = self._public(product)
+        public['description'] = public.pop('body_html')
+        public['variants'] = [
+            dict(v, price=_paise(v['price']), compare_at_price=_paise(v['compare_at_price'])) for v in public['variants']
+        ]
+        public['price'] = public['variants'][0]['price']
+        return public
+
+    def sitemap_index(self, base_url):
+        """sitemap.xml: an index of the product sitemaps (plus a pages sitemap the crawler should ignore)"""
+        pages = max(1, -(-len(self.products) // SITEMAP_PAGE_SIZE))
+        entries = [f"{base_url}/sitemap_products_{n}.xml?from=1&to={len(self.products)}" for n in range(1, pages + 1)]
+        entries.append(f"{base_url}/sitemap_pages_1.xml")
+        return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                + "".join(f"<sitemap><loc>{escape(loc)}</loc></sitemap>" for loc in entries)
+                + '</sitemapindex>')
+
+    def sitemap_products(self, base_url, n):
+        """sitemap_products_<n>.xml: product URLs with <lastmod> (updated_at) and an image entry, like Shopify's"""
+        products = list(self.products.values())[(n - 1) * SITEMAP_PAGE_SIZE:n * SITEMAP_PAGE_SIZE]
+        if n < 1 or not products:
+            return None
+        return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+                'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">'
+                + "".join(
+                    f"<url><loc>{base_url}/products/{p['handle']}</loc><lastmod>{p['updated_at']}</lastmod>"
+                    f"<changefreq>daily</changefreq><image:image><image:loc>{base_url}/cdn/{p['handle']}.jpg"
+                    f"</image:loc><image:title>{escape(p['title'])}</image:title></image:image></url>"
+                    for p in products)
+                + '</urlset>')
+
+    def _public(self, product):
+        return {k: v for k, v in product.items() if k != 'fabric_html'}
+
+    def collection_html(self, collection, page):
+        products = self.collections.get(collection)
+        if products is None:
+            return None
+        start = (page - 1) * HTML_PAGE_SIZE
+        cards = "".join(
+            f"<div class='grid__item'><a class='product-card' href='/collections/{collection}/products/"
+            f"{p['handle']}?variant={p['variants'][0]['id']}'><span>{escape(p['title'])}</span></a></div>"
+            for p in products[start:start + HTML_PAGE_SIZE]
+        )
+        pagination = ""
+        if start + HTML_PAGE_SIZE < len(products):
+            pagination = f"<nav class='pagination'><a href='/collections/{collection}?page={page + 1}'>Next</a></nav>"
+        return self._page(f"{collection} - {self.name}",
+                          f"<h1>{escape(collection.replace('-', ' ').title())}</h1>"
+                          f"<div class='collection'>{cards}</div>{pagination}")
+
+    def product_html(self, handle):
+        product = self.products.get(handle)
+        if product is None:
+            return None
+        price = int(float(product['variants'][0]['price']))
+        # The page always carries the fabric, even when the JSON body_html leaves it out
+        description = product['body_html'] if product['fabric_html'] in product['body_html'] \
+            else product['body_html'] + product['fabric_html']
+        # Themes embed the product (.js shape) for their variant pickers
+        product_json = json.dumps(self.product_js(handle)).replace('</', '<\\/')
+        return self._page(f"{product['title']} - {self.name}", (
+            f"<div class='product'><h1 class='product-title'>{escape(product['title'])}</h1>"
+            f"<div class='product__price'><span class='price'>Rs. {price:,}</span></div>"
+            f"<div class='product__description product-description rte'>{description}</div></div>"
+            f"<script type='application/json' data-product-json>{product_json}</script>"
+        ))
+
+    def _page(self, title, main):
+        return (f"<!doctype html><html><head><meta charset='utf-8'><title>{escape(title)}</title></head>"
+                f"<body><header><a href='/'>{escape(self.name)}</a></header><main>{main}</main></body></html>")
+
+
+class MockShopifyServer:
+    """
+    Serves one MockStore per brand config, each on its own port (so each is its own host to the pacer)
+
+    latency / jitter: seconds added to every response (uniform +-jitter)
+    error_rate: share of responses answered with a 500 or 503
+    throttle_every / throttle_burst: after every N requests to a store, answer the next M with 429
+    retry_after: Retry-After seconds sent with each 429
+    crawl_delay: Crawl-delay line in each store's robots.txt (None for no delay)
+    products_json: serve /collections/<c>/products.json (False: 404, like stores that lock it down)
+    sitemaps: serve sitemap.xml and sitemap_products_N.xml, announced in robots.txt
+
+    Usage:
+        with MockShopifyServer(products=2500, latency=0.05) as server:
+            crawler = ActivewearCrawler(base_urls=server.base_urls)
+    """
+
+    def __init__(self, brand_configs=None, products=200, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, throttle_every=0, throttle_burst=10, retry_after=1, crawl_delay=None,
+                 fabric_in_json=0.8, seed=0, products_json=True, sitemaps=True):
+        brand_configs = brand_configs or BRAND_CONFIGS
+        self.stores = {key: MockStore(key, config, products, fabric_in_json, seed)
+                       for key, config in brand_configs.items()}
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_every = throttle_every
+        self.throttle_burst = throttle_burst
+        self.retry_after = retry_after
+        self.crawl_delay = crawl_delay
+        self.products_json = products_json
+        self.sitemaps = sitemaps
+
+        self.base_urls = {}
+        self.status_counts = {key: Counter() for key in self.stores}
+        self._servers = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+    def start(self):
+        """Listen on consecutive ports from `port` (or any free ports when it is 0)"""
+        for i, (key, store) in enumerate(self.stores.items()):
+            server = _StoreServer((self.host, self.port + i if self.port else 0), self._handler(key, store))
+            threading.Thread(target=server.serve_forever, daemon=True, name=f"mock-{key}").start()
+            self._servers.append(server)
+            self.base_urls[key] = f"http://{self.host}:{server.server_address[1]}"
+        return self
+
+    def shutdown(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+    # ==================== FAULT INJECTION ====================
+    def _fault(self, key):
+        """Status to answer instead of the real response (429/500/503), or None; plus the latency to add"""
+        with self._lock:
+            counts = self.status_counts[key]
+            counts['requests'] += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            if self.throttle_every and (counts['requests'] - 1) % (self.throttle_every + self.throttle_burst) \
+                    >= self.throttle_every:
+                return 429, delay
+            if self.error_rate and self._rng.random() < self.error_rate:
+                return self._rng.choice((500, 503)), delay
+            return None, delay
+
+    def _count(self, key, status):
+        with self._lock:
+            self.status_counts[key][status] += 1
+
+    def stats(self):
+        """{brand key: {'requests': n, <status>: n, ...}}"""
+        with self._lock:
+            return {key: dict(counts) for key, counts in self.status_counts.items()}
+
+    def print_stats(self):
+        for key, counts in self.stats().items():
+            statuses = ", ".join(f"{status}: {n}" for status, n in sorted(counts.items(), key=str)
+                                 if status != 'requests')
+            print(f"• {self.stores[key].name} ({self.base_urls.get(key)}): {counts.get('requests', 0)} requests"
+                  f"{' - ' + statuses if statuses else ''}")
+
+    # ==================== REQUEST HANDLING ====================
+    def _route(self, key, store, path, query):
+        """(status, content type, body) for a path on one store"""
+        page = _int(query.get('page'), 1)
+        parts = [p for p in path.split('/') if p]
+        base_url = self.base_urls[key]
+
+        if path == '/robots.txt':
+            delay = f"Crawl-delay: {self.crawl_delay}\n" if self.crawl_delay else ""
+            sitemap = f"Sitemap: {base_url}/sitemap.xml\n" if self.sitemaps else ""
+            return 200, 'text/plain', f"User-agent: *\n{delay}Disallow: /cart\n{sitemap}"
+
+        if self.sitemaps and path == '/sitemap.xml':
+            return _xml(store.sitemap_index(base_url))
+        if self.sitemaps and path.startswith('/sitemap_products_') and path.endswith('.xml'):
+            return _xml(store.sitemap_products(base_url, _int(path[len('/sitemap_products_'):-len('.xml')], 0)))
+
+        # /products/<handle>[.json|.js], also under /collections/<c>/products/<handle>
+        if 'products' in parts and parts.index('products') + 1 < len(parts):
+            handle = parts[parts.index('products') + 1]
+            if handle.endswith('.json'):
+                return _json(store.product_json(handle[:-len('.json')]))
+            if handle.endswith('.js'):
+                return _json(store.product_js(handle[:-len('.js')]))
+            return _html(store.product_html(handle))
+
+        if len(parts) == 3 and parts[0] == 'collections' and parts[2] == 'products.json' and self.products_json:
+            return _json(store.products_json(parts[1], page, _int(query.get('limit'), 30)))
+        if len(parts) == 2 and parts[0] == 'collections':
+            return _html(store.collection_html(parts[1], page))
+        if not parts:
+            return _html(store._page(store.name, "".join(
+                f"<a href='/collections/{c}'>{c}</a>" for c in store.collections)))
+        return 404, 'text/plain', "Not Found"
+
+    def _handler(self, key, store):
+        mock = self
+
+        class StoreHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, like the real storefronts
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                fault, delay = mock._fault(key)
+                if delay:
+                    time.sleep(delay)
+
+                headers = {}
+                if fault == 429:
+                    status, content_type, body = 429, 'text/plain', "Too Many Requests"
+                    headers['Retry-After'] = str(mock.retry_after)
+                elif fault:
+                    status, content_type, body = fault, 'text/plain', "Service Unavailable"
+                else:
+                    status, content_type, body = mock._route(key, store, parsed.path,
+                                                             {k: v[0] for k, v in parse_qs(parsed.query).items()})
+
+                mock._count(key, status)
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', f"{content_type}; charset=utf-8")
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return StoreHandler
+
+
+class _StoreServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # hundreds of crawler connections arrive at once
+
+
+def _paise(price):
+    return int(round(float(price) * 100)) if price else None
+
+
+def _int(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _json(data):
+    if data is None:
+        return 404, 'application/json', '{"errors":"Not Found"}'
+    return 200, 'application/json', json.dumps(data)
+
+
+def _xml(xml):
+    if xml is None:
+        return 404, 'text/plain', "Not Found"
+    return 200, 'application/xml', xml
+
+
+def _html(html):
+    if html is None:
+        return 404, 'text/html', "<html><body><h1>404 Page Not Found</h1></body></html>"
+    return 200, 'text/html', html
+
+
+# ==================== MAIN EXECUTION ====================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve mock Shopify stores for the configured brands")
+    parser.add_argument('--products', type=int, default=200, help="products per brand (default: 200)")
+    parser.add_argument('--port', type=int, default=8800, help="first port; brands use consecutive ports")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="uniform +- seconds on the latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of responses that are 500/503")
+    parser.add_argument('--throttle-every', type=int, default=0, help="answer a burst of 429s after every N requests")
+    parser.add_argument('--throttle-burst', type=int, default=10, help="429s per burst (default: 10)")
+    parser.add_argument('--crawl-delay', type=float, default=None, help="robots.txt Crawl-delay")
+    parser.add_argument('--no-products-json', action='store_true', help="404 every products.json")
+    parser.add_argument('--no-sitemaps', action='store_true', help="serve no sitemap.xml")
+    args = parser.parse_args()
+
+    server = MockShopifyServer(products=args.products, port=args.port, latency=args.latency, jitter=args.jitter,
+                               error_rate=args.error_rate, throttle_every=args.throttle_every,
+                               throttle_burst=args.throttle_burst, crawl_delay=args.crawl_delay,
+                               products_json=not args.no_products_json, sitemaps=not args.no_sitemaps).start()
+    print("Mock stores:")
+    for key, url in server.base_urls.items():
+        print(f"  {key:<12}{url}")
+    print(f"\nPoint the crawler at them with ActivewearCrawler(base_urls={json.dumps(server.base_urls)})")
+    print("Ctrl-C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.print_stats()
+        server.shutdown()
@@ -0,0 +1,184 @@
+"""
+Pacing for Activewear Crawler
+Readiness-based waits, infinite-scroll detection and per-host rate limiting with circuit breakers
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+# Any of these means the product page has rendered enough to parse: title, price or fabric block
+PRODUCT_READY_SELECTOR = 'h1, span.price, span.money, [class*="fabric"], [class*="accordion"]'
+PRODUCT_LINK_SELECTOR = 'a[href*="/products/"]'
+
+
+# ==================== READINESS WAITS ====================
+def wait_for_ready(driver, selector, timeout):
+    """Wait until an element matching the CSS selector exists; False if it never shows up"""
+    try:
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+        return True
+    except TimeoutException:
+        return False
+
+
+def scroll_until_stable(driver, item_selector, max_scrolls, scroll_delay, timeout):
+    """
+    Scroll to the bottom until the number of matching items stops growing
+    Returns the final item count.
+    """
+    def count_items(d):
+        return len(d.find_elements(By.CSS_SELECTOR, item_selector))
+
+    count = count_items(driver)
+    for _ in range(max_scrolls):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=scroll_delay).until(lambda d: count_items(d) > count)
+        except TimeoutException:
+            break
+        count = count_items(driver)
+    return count
+
+
+# ==================== PER-HOST RATE LIMITING ====================
+class HostBucket:
+    """Token bucket and circuit-breaker state for one host"""
+
+    __slots__ = ('rate', 'max_rate', 'burst', 'tokens', 'updated', 'trips')
+
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.max_rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+        self.trips = 0
+
+
+class AdaptivePacer:
+    """
+    Per-host token bucket with robots.txt crawl-delay, circuit breaker and adaptive rate
+
+    Each host gets `rate` requests per second with bursts of up to `burst`; robots.txt Crawl-delay
+    lowers that ceiling. A 429/503 trips the host's circuit breaker: nothing is sent to it until
+    the cooldown (Retry-After, else `cooldown` doubling per consecutive trip) has passed, and its
+    rate is halved. Slow responses ease the rate down too; fast ones raise it back to the ceiling.
+
+    Every fetch path calls wait(url) (or sleeps for reserve(url) in asyncio) before a request
+    and record(url, status, elapsed) after it.
+    """
+
+    BACKOFF_STATUSES = (429, 503)
+
+    def __init__(self, rate=2.0, burst=4, max_delay=60.0, slow_threshold=5.0, cooldown=5.0,
+                 min_rate=0.05, robots=None, metrics=None):
+        self.rate = rate
+        self.burst = burst
+        self.max_delay = max_delay
+        self.slow_threshold = slow_threshold
+        self.cooldown = cooldown
+        self.min_rate = min_rate
+        self.robots = robots
+        self.metrics = metrics
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, robots=None, metrics=None):
+        """Build a pacer from CRAWL_CONFIG"""
+        return cls(
+            rate=config.get('requests_per_second', 2.0),
+            burst=config.get('burst', 4),
+            max_delay=config.get('backoff_max_delay', 60.0),
+            slow_threshold=config.get('slow_response_threshold', 5.0),
+            cooldown=config.get('circuit_cooldown', 5.0),
+            robots=robots,
+            metrics=metrics,
+        )
+
+    def _bucket(self, url):
+        """The host's bucket, created on first use with robots.txt's crawl-delay applied"""
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+        if bucket is not None:
+            return bucket
+
+        # robots.txt is fetched outside the lock so one slow host never stalls the others
+        crawl_delay = self.robots.crawl_delay(url) if self.robots else None
+        rate, burst = self.rate, self.burst
+        if crawl_delay:
+            rate, burst = min(rate, 1.0 / crawl_delay), 1
+        with self._lock:
+            return self._buckets.setdefault(host, HostBucket(rate, burst, time.monotonic()))
+
+    def warm(self, url):
+        """Set up the host's bucket now (fetching robots.txt), e.g. before an event loop that must not block on it"""
+        self._bucket(url)
+
+    def reserve(self, url):
+        """Take the host's next request slot; returns how many seconds to wait before sending"""
+        bucket = self._bucket(url)
+        with self._lock:
+            now = time.monotonic()
+            if now > bucket.updated:
+                bucket.tokens = min(bucket.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+                bucket.updated = now
+
+            # Tokens may go negative: each reservation queues behind the ones before it
+            bucket.tokens -= 1
+            wait = max(bucket.updated - now, 0.0) + max(-bucket.tokens, 0.0) / bucket.rate
+
+        if self.metrics:
+            self.metrics.observe('throttle', wait)
+        return wait
+
+    def delay_for(self, url):
+        """Seconds until the host's next free slot, without taking it"""
+        bucket = self._bucket(url)
+        with self._lock:
+            now = time.monotonic()
+            tokens = min(bucket.burst, bucket.tokens + max(now - bucket.updated, 0.0) * bucket.rate)
+            return max(bucket.updated - now, 0.0) + max(1 - tokens, 0.0) / bucket.rate
+
+    def wait(self, url):
+        """Block until the host's rate limit and any circuit-breaker cooldown allow a request"""
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self, url, status, elapsed, retry_after=None):
+        """Adapt the host's rate to a response's status code and latency"""
+        bucket = self._bucket(url)
+        with self._lock:
+            now = time.monotonic()
+
+            if status in self.BACKOFF_STATUSES:
+                # Circuit breaker: pause the host, then restart at half the rate
+                cooldown = min(max(self.cooldown * 2 ** bucket.trips, retry_after or 0), self.max_delay)
+                bucket.trips += 1
+                bucket.rate = max(bucket.rate / 2, self.min_rate)
+                bucket.tokens = min(bucket.tokens, 0.0)
+                bucket.updated = max(bucket.updated, now + cooldown)
+            elif elapsed > self.slow_threshold:
+                bucket.rate = max(bucket.rate / 1.5, self.min_rate)
+            else:
+                bucket.trips = 0
+                bucket.rate = min(bucket.rate * 1.1, bucket.max_rate)
+
+    def should_retry(self, status):
+        """True for responses that mean "slow down and try again" rather than failure"""
+        return status in self.BACKOFF_STATUSES
+
+
+def parse_retry_after(value):
+    """Retry-After header in seconds (HTTP-date values are ignored)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
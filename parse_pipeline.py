@@ -0,0 +1,100 @@
+"""
+Parse Pipeline for Activewear Crawler
+Extraction in worker processes, decoupled from the fetch threads by a bounded queue
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from brand_engine import BrandEngine
+
+# ==================== WORKER PROCESS ====================
+_ENGINES = {}
+
+
+def _init_worker(brand_configs, parser):
+    """Compile every brand's selectors once per worker process"""
+    for key, config in brand_configs.items():
+        _ENGINES[key] = BrandEngine(key, config, parser=parser)
+
+
+def _extract(key, url, html):
+    """Parse and extract one product page; returns (record, parse seconds, extract seconds)"""
+    engine = _ENGINES[key]
+    start = time.perf_counter()
+    html = html.decode('utf-8')
+    doc = engine.parse(html)
+    parsed = time.perf_counter()
+    record = engine.parse_product(doc, url, html)
+    return record, parsed - start, time.perf_counter() - parsed
+
+
+# ==================== PIPELINE ====================
+class ParsePipeline:
+    """
+    fetch threads -> bounded queue -> process pool (parse + extract) -> one export thread
+
+      submit(key, url, html, on_record)  - hand over a fetched page; blocks while `queue_size` pages are
+                                           already waiting to be parsed or exported (backpressure)
+      drain()                            - wait until every submitted page has been exported
+      close()                            - drain, then stop the export thread and the worker processes
+
+    on_record(record) runs on the export thread, in submission order, so sinks see one writer.
+    Workers are spawned, not forked: fabric extractor plugins must be registered in an importable module.
+    """
+
+    def __init__(self, brand_configs, processes=None, queue_size=64, parser='lxml', metrics=None):
+        self.processes = processes or multiprocessing.cpu_count()
+        self.metrics = metrics
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(brand_configs, parser),
+        )
+        # Taken before a page goes to the pool, given back once it is exported: at most queue_size in flight
+        self._slots = threading.Semaphore(queue_size)
+        self._pending = queue.Queue()
+        self._exporter = threading.Thread(target=self._export_loop, daemon=True, name="parse-export")
+        self._exporter.start()
+
+    def submit(self, key, url, html, on_record, on_error=None):
+        if isinstance(html, str):
+            html = html.encode('utf-8')
+        self._slots.acquire()
+        future = self._pool.submit(_extract, key, url, html)
+        self._pending.put((future, url, on_record, on_error))
+
+    def _export_loop(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                self._pending.task_done()
+                return
+            future, url, on_record, on_error = item
+            try:
+                record, parse_seconds, extract_seconds = future.result()
+                if self.metrics:
+                    self.metrics.observe('parse', parse_seconds)
+                    self.metrics.observe('extract', extract_seconds)
+                on_record(record)
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+                else:
+                    print(f"✗ Error extracting {url}: {str(e)}")
+            finally:
+                self._slots.release()
+                self._pending.task_done()
+
+    def drain(self):
+        self._pending.join()
+
+    def close(self):
+        if self._exporter.is_alive():
+            self._pending.put(None)
+            self._exporter.join()
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,188 @@
+"""
+HTML Parser Backends for Activewear Crawler
+html.parser, lxml and selectolax behind one interface, so brand selectors run unchanged on any of them
+"""
+
+import re
+import soupsieve
+from bs4 import BeautifulSoup
+from extractor import CompiledExtractor, ExtractedPage
+
+# Text inside these elements is never page copy
+NON_TEXT_TAGS = {'script', 'style', 'template', 'noscript'}
+
+
+# ==================== BEAUTIFULSOUP BACKENDS ====================
+class SoupBackend:
+    """BeautifulSoup tree built by html.parser (pure Python) or lxml (C)"""
+
+    def __init__(self, name, features):
+        self.name = name
+        self.features = features
+        self._selectors = {}
+
+    def parse(self, html):
+        return BeautifulSoup(html, self.features)
+
+    def select(self, doc, selector):
+        """All elements matching a CSS selector, in document order"""
+        compiled = self._selectors.get(selector)
+        if compiled is None:
+            compiled = self._selectors[selector] = soupsieve.compile(selector)
+        return compiled.select(doc)
+
+    def extractor(self, fields, fabric_keywords):
+        return CompiledExtractor(fields, fabric_keywords)
+
+
+# ==================== SELECTOLAX BACKEND ====================
+class LexborText(str):
+    """A selectolax text node as a string that knows its parent (like bs4's NavigableString)"""
+
+    parent = None
+
+
+class LexborElement:
+    """
+    Wraps a selectolax node with the small part of the bs4 Tag API that the brand engine
+    and fabric plugins use: name, text, get(), get_text(), find_all(), find_next_sibling(), parent
+    """
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def name(self):
+        return self.node.tag
+
+    @property
+    def text(self):
+        return self.node.text(deep=True)
+
+    @property
+    def parent(self):
+        parent = self.node.parent
+        return LexborElement(parent) if parent is not None else None
+
+    def get(self, attr, default=None):
+        value = self.node.attributes.get(attr)
+        if value is None:
+            return default
+        return value.split() if attr == 'class' else value
+
+    def get_text(self, separator="", strip=False):
+        return self.node.text(deep=True, separator=separator, strip=strip)
+
+    def find_all(self, name):
+        return [LexborElement(node) for node in self.node.css(name)]
+
+    def find_next_sibling(self):
+        node = self.node.next
+        while node is not None and not node.is_element_node:
+            node = node.next
+        return LexborElement(node) if node is not None else None
+
+    def select_one(self, selector):
+        node = self.node.css_first(selector)
+        return LexborElement(node) if node is not None else None
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        return isinstance(other, LexborElement) and self.node == other.node
+
+    def __hash__(self):
+        return hash(self.node.mem_id)
+
+    def __repr__(self):
+        return f"<LexborElement {self.node.tag}>"
+
+
+class SelectolaxExtractor:
+    """
+    Same results as extractor.CompiledExtractor, on a selectolax (lexbor) tree
+    Field selectors run as native CSS queries; the fabric heading is found in one text walk.
+    """
+
+    def __init__(self, fields, fabric_keywords):
+        self.fields = {
+            field: [part.strip() for part in selector.split(',') if part.strip()]
+            for field, selector in fields.items()
+        }
+        self.fabric_re = re.compile('|'.join(re.escape(k) for k in fabric_keywords), re.IGNORECASE)
+
+    def extract(self, doc):
+        page = ExtractedPage(doc)
+
+        for field, selectors in self.fields.items():
+            # Earliest selector wins, then the first element in document order
+            for selector in selectors:
+                node = doc.css_first(selector)
+                if node is not None:
+                    page.elements[field] = LexborElement(node)
+                    break
+
+        page.accordions = [
+            LexborElement(node)
+            for node in doc.css('div[class*="accordion" i], div[class*="tab" i]')
+        ]
+
+        fabric_re = self.fabric_re
+        for node in doc.root.traverse(include_text=True):
+            if page.fabric_node is None:
+                if node.is_text_node:
+                    text = node.text_content
+                    if text and fabric_re.search(text) and node.parent.tag not in NON_TEXT_TAGS:
+                        page.fabric_node = LexborText(text)
+                        page.fabric_node.parent = LexborElement(node.parent)
+            elif node.is_element_node:
+                if node.tag == 'ul':
+                    page.next_ul = LexborElement(node)
+                    break
+                if node.tag == 'div' and page.next_div is None:
+                    page.next_div = LexborElement(node)
+
+        return page
+
+
+class SelectolaxBackend:
+    """selectolax's lexbor parser - a C HTML5 parser with native CSS selectors"""
+
+    name = 'selectolax'
+
+    def __init__(self):
+        # Imported lazily so selectolax stays an optional dependency
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser_class = LexborHTMLParser
+
+    def parse(self, html):
+        return self._parser_class(html)
+
+    def select(self, doc, selector):
+        return [LexborElement(node) for node in doc.css(selector)]
+
+    def extractor(self, fields, fabric_keywords):
+        return SelectolaxExtractor(fields, fabric_keywords)
+
+
+# ==================== REGISTRY ====================
+PARSER_BACKENDS = {
+    'html.parser': lambda: SoupBackend('html.parser', 'html.parser'),
+    'lxml': lambda: SoupBackend('lxml', 'lxml'),
+    'selectolax': SelectolaxBackend,
+}
+
+_backends = {}
+
+
+def get_parser(name):
+    """The shared backend instance for a parser name ('html.parser', 'lxml' or 'selectolax')"""
+    backend = _backends.get(name)
+    if backend is None:
+        if name not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend: {name} (use {', '.join(PARSER_BACKENDS)})")
+        backend = _backends[name] = PARSER_BACKENDS[name]()
+    return backend
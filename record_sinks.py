@@ -0,0 +1,184 @@
+"""
+Streaming Record Sinks for Activewear Crawler
+Write records to CSV / JSON / JSON Lines (optionally gzip-compressed) as they are extracted
+"""
+
+import csv
+import gzip
+import json
+import threading
+from crawler_config import OUTPUT_FIELDS, VARIANT_OUTPUT_FIELDS
+from variants import export_rows, summarize
+
+
+def export_fields(rows='product'):
+    """CSV columns of export_rows(): OUTPUT_FIELDS, or per variant the product fields then VARIANT_OUTPUT_FIELDS"""
+    if rows == 'variant':
+        summary = summarize(())
+        return [field for field in OUTPUT_FIELDS if field not in summary] + VARIANT_OUTPUT_FIELDS
+    return list(OUTPUT_FIELDS)
+
+
+def open_output(path):
+    """Open a text file for writing; paths ending in .gz are gzip-compressed"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+class RecordSink:
+    """
+    Base class for streaming writers
+    Records are buffered and written every `batch_size` records, then flushed to disk
+    so other processes can tail the file while the crawl is still running.
+    """
+
+    def __init__(self, path, batch_size=50):
+        self.path = path
+        self.batch_size = batch_size
+        self.count = 0
+        self._buffer = []
+        self._file = open_output(path)
+
+    def write(self, record):
+        self._buffer.append(record)
+        self.count += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self.write_batch(self._buffer)
+            self._buffer = []
+        self._file.flush()
+
+    def write_batch(self, records):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class CsvSink(RecordSink):
+    """
+    CSV with the given columns, else the header taken from the first record (like export_to_csv)
+    With fieldnames an export that gets no records is still a header-only CSV, not an empty file.
+    """
+
+    def __init__(self, path, batch_size=50, fieldnames=None):
+        super().__init__(path, batch_size)
+        self.fieldnames = fieldnames
+        self._writer = None
+
+    def write_batch(self, records):
+        if self._writer is None:
+            self._start(self.fieldnames or list(records[0].keys()))
+        self._writer.writerows(records)
+
+    def _start(self, fieldnames):
+        self.fieldnames = fieldnames
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction='ignore')
+        self._writer.writeheader()
+
+    def close(self):
+        self.flush()
+        if self._writer is None and self.fieldnames:
+            self._start(self.fieldnames)
+        self._file.close()
+
+
+class JsonLinesSink(RecordSink):
+    """One JSON object per line"""
+
+    def write_batch(self, records):
+        self._file.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+
+
+class JsonArraySink(RecordSink):
+    """A JSON array written element by element - same layout as export_to_json, without holding the list"""
+
+    def __init__(self, path, batch_size=50, indent=2):
+        super().__init__(path, batch_size)
+        self.indent = indent
+        self._file.write("[")
+        self._first = True
+
+    def write_batch(self, records):
+        pad = " " * self.indent
+        for record in records:
+            body = json.dumps(record, indent=self.indent, ensure_ascii=False).replace("\n", "\n" + pad)
+            self._file.write(("\n" if self._first else ",\n") + pad + body)
+            self._first = False
+
+    def close(self):
+        self.flush()
+        self._file.write("]\n" if self._first else "\n]\n")
+        self._file.close()
+
+
+# Output extension -> sink class; ".gz" may be appended to any of them
+SINK_TYPES = {
+    '.csv': CsvSink,
+    '.json': JsonArraySink,
+    '.jsonl': JsonLinesSink,
+}
+
+
+def open_sink(path, batch_size=50, fieldnames=None):
+    """
+    Pick the sink for a path by extension, e.g. products.csv, products.jsonl.gz, snapshots.parquet
+    fieldnames: CSV columns (default: the first record's keys)
+    """
+    if path.rstrip('/').endswith('.parquet'):
+        # Imported lazily so pyarrow stays an optional dependency
+        from columnar_export import ParquetSink
+        return ParquetSink(path.rstrip('/'))
+
+    name = path[:-3] if path.endswith('.gz') else path
+    for extension, sink_class in SINK_TYPES.items():
+        if name.endswith(extension):
+            if sink_class is CsvSink:
+                return CsvSink(path, batch_size=batch_size, fieldnames=fieldnames)
+            return sink_class(path, batch_size=batch_size)
+    raise ValueError(f"Unsupported output format: {path} (use {', '.join(SINK_TYPES)} with optional .gz, or .parquet)")
+
+
+class SinkPipeline:
+    """
+    Fan each record out to several sinks at once; safe to call from crawler worker threads
+    rows: 'product' writes one row per product with its variants summarized, 'variant' one row per variant.
+    Sinks with nested=True (Parquet) always get the whole record, variants included.
+    """
+
+    def __init__(self, sinks, rows='product'):
+        self.sinks = list(sinks)
+        self.rows = rows
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_paths(cls, paths, batch_size=50, rows='product'):
+        fieldnames = export_fields(rows)
+        return cls((open_sink(path, batch_size=batch_size, fieldnames=fieldnames) for path in paths), rows=rows)
+
+    def write(self, record):
+        flat = export_rows(record, self.rows)
+        with self._lock:
+            for sink in self.sinks:
+                if getattr(sink, 'nested', False):
+                    sink.write(record)
+                    continue
+                for row in flat:
+                    sink.write(row)
+
+    def flush(self):
+        with self._lock:
+            for sink in self.sinks:
+                sink.flush()
+
+    def close(self):
+        with self._lock:
+            for sink in self.sinks:
+                sink.close()
+                unit = "products" if self.rows == 'product' or getattr(sink, 'nested', False) else "variant rows"
+                print(f"✓ Exported {sink.count} {unit} to {sink.path}")
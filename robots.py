@@ -0,0 +1,113 @@
+"""
+robots.txt Cache for Activewear Crawler
+Fetches and parses each host's robots.txt once per run and exposes its crawl-delay
+"""
+
+import threading
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+import requests
+
+
+class RobotRules(RobotFileParser):
+    """RobotFileParser that keeps fractional Crawl-delay values too (the stdlib drops anything but whole seconds)"""
+
+    delays = {}
+
+    def parse(self, lines):
+        lines = list(lines)
+        super().parse(lines)
+        self.delays = crawl_delays(lines)
+
+    def crawl_delay(self, useragent):
+        delay = super().crawl_delay(useragent)
+        if delay is not None:
+            return delay
+        agent = useragent.split('/')[0].lower()
+        for name, seconds in self.delays.items():
+            if name != '*' and name in agent:
+                return seconds
+        return self.delays.get('*')
+
+
+def crawl_delays(lines):
+    """{user-agent: Crawl-delay seconds} for every group in a robots.txt"""
+    delays = {}
+    agents, in_rules = [], False
+    for line in lines:
+        field, _, value = line.split('#', 1)[0].partition(':')
+        field, value = field.strip().lower(), value.strip()
+        if field == 'user-agent':
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+        elif field:
+            in_rules = True
+            if field == 'crawl-delay':
+                try:
+                    seconds = float(value)
+                except ValueError:
+                    continue
+                for agent in agents:
+                    delays.setdefault(agent, seconds)
+    return delays
+
+
+class RobotsCache:
+    """
+    robots.txt rules per host, fetched on first use and kept for the rest of the run
+    A missing or unreachable robots.txt means no restrictions.
+    """
+
+    def __init__(self, user_agent, timeout=10):
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self._rules = {}
+        self._host_locks = {}
+        self._lock = threading.Lock()
+
+    def rules(self, url):
+        """The parsed robots.txt for a URL's host (fetched at most once)"""
+        parsed = urlparse(url)
+        host = f"{parsed.scheme}://{parsed.netloc}"
+
+        with self._lock:
+            if host in self._rules:
+                return self._rules[host]
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+
+        # One fetch per host even when many workers hit it at once
+        with host_lock:
+            with self._lock:
+                if host in self._rules:
+                    return self._rules[host]
+            rules = self._fetch(host)
+            with self._lock:
+                self._rules[host] = rules
+            return rules
+
+    def _fetch(self, host):
+        rules = RobotRules(f"{host}/robots.txt")
+        try:
+            response = requests.get(rules.url, headers={'User-Agent': self.user_agent}, timeout=self.timeout)
+        except requests.RequestException:
+            response = None
+
+        if response is not None and response.status_code == 200:
+            rules.parse(response.text.splitlines())
+        else:
+            rules.parse([])
+        # RobotFileParser answers nothing until it has been marked as read
+        rules.modified()
+        return rules
+
+    def crawl_delay(self, url):
+        """Seconds robots.txt asks between requests to the URL's host (Crawl-delay or Request-rate), or None"""
+        rules = self.rules(url)
+        delay = rules.crawl_delay(self.user_agent)
+        if delay is not None:
+            return float(delay)
+        rate = rules.request_rate(self.user_agent)
+        if rate and rate.requests:
+            return rate.seconds / rate.requests
+        return None
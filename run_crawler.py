@@ -1,22 +1,198 @@
 #!/usr/bin/env python3
 """
-Quick Start Script for Activewear Crawler
-Run this file directly in VS Code to start crawling
+Command-Line Runner for Activewear Crawler
+Unattended crawls (cron, containers) with brand/category selection and tuning flags; --interactive for the menu
+
+Examples:
+    python run_crawler.py                                   # full crawl, all brands
+    python run_crawler.py --brands kica blissclub --categories leggings sports-bras
+    python run_crawler.py --engine async --workers 16 --rate 5 -o products.csv.gz products.jsonl
+    python run_crawler.py --incremental --config nightly.json
+    python run_crawler.py --resume                          # continue an interrupted crawl
+    python run_crawler.py --retry-failed                    # recrawl only the products that failed
 """
 
-from activewear_crawler import ActivewearCrawler
+import argparse
+import json
 import sys
 
-def main():
-    print("""
+from crawler_config import BRAND_CONFIGS, CRAWL_CONFIG, EXPORT_CONFIG
+from url_frontier import collection_name
+
+BANNER = """
     ╔══════════════════════════════════════════════════════════════╗
     ║        ACTIVEWEAR CRAWLER - FABRIC DETAILS EXTRACTOR         ║
     ║                                                              ║
     ║  Crawls: Kica, BlissClub, SilverTraq, Terra-active          ║
     ║  Focus: FABRIC DETAILS + Product Information                ║
     ╚══════════════════════════════════════════════════════════════╝
-    """)
+"""
+
+
+# ==================== ARGUMENTS ====================
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Crawl activewear brands for product and fabric details",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument('--config', metavar='FILE',
+                        help="JSON file overriding CRAWL_CONFIG (and EXPORT_CONFIG under an \"EXPORT_CONFIG\" key); "
+                             "flags below win over it")
+    parser.add_argument('-i', '--interactive', action='store_true', help="pick brands from the menu")
+
+    selection = parser.add_argument_group("selection")
+    selection.add_argument('--brands', nargs='+', choices=list(BRAND_CONFIGS), metavar='BRAND',
+                           help=f"brand keys to crawl ({', '.join(BRAND_CONFIGS)}; default all)")
+    selection.add_argument('--categories', nargs='+', metavar='HANDLE',
+                           help="only these configured collections, e.g. leggings sports-bras (default all)")
+    selection.add_argument('--max-per-category', type=int, help="cap on products discovered per category")
+
+    engine = parser.add_argument_group("engine")
+    engine.add_argument('--engine', choices=['http', 'async', 'browser'], default='http',
+                        help="http: JSON endpoints, Chrome only for missing fields; async: same over asyncio; "
+                             "browser: render every page")
+    engine.add_argument('--no-browser-fallback', action='store_true',
+                        help="never open Chrome (or parse product HTML) for fields the JSON lacks")
+    engine.add_argument('--browser-profile', choices=['light', 'full'], default='light')
+    engine.add_argument('--show-browser', action='store_true', help="run Chrome with a window")
+
+    tuning = parser.add_argument_group("concurrency and rate limits")
+    tuning.add_argument('--workers', type=int, help="product workers / pooled browsers (CRAWL_CONFIG['workers'])")
+    tuning.add_argument('--per-domain', type=int,
+                        help="max concurrent requests per brand site, async engine included "
+                             "(default CRAWL_CONFIG['per_domain_concurrency'], async: CRAWL_CONFIG['async_per_host'])")
+    tuning.add_argument('--rate', type=float, help="requests per second per site (CRAWL_CONFIG['requests_per_second'])")
+    tuning.add_argument('--burst', type=int, help="requests a site may get back-to-back")
+    tuning.add_argument('--cooldown', type=float, help="seconds to pause a site after a 429/503")
+    tuning.add_argument('--page-load-delay', type=float, help="settle time after a rendered page is ready")
+    tuning.add_argument('--ignore-robots', action='store_true', help="don't fetch robots.txt or honour Crawl-delay")
+    tuning.add_argument('--parse-processes', type=int, help="parse product pages in this many worker processes")
+
+    outputs = parser.add_argument_group("outputs")
+    outputs.add_argument('-o', '--output', nargs='+', metavar='PATH',
+                         help="stream records to these files; format from the extension "
+                              "(.csv, .json, .jsonl, .parquet, optionally .gz) (default: activewear_products.csv/.json)")
+    outputs.add_argument('--rows', choices=['product', 'variant'], help="one row per product or per variant")
+    outputs.add_argument('--parquet', metavar='DIR', help="also write a Parquet dataset partitioned by brand and date")
+    outputs.add_argument('--changes', metavar='PATH', default="activewear_changes.csv",
+                         help="incremental mode: where the new/changed products go")
+    outputs.add_argument('--diff', metavar='PATH', default="activewear_diff.csv",
+                         help="report of what changed since the previous crawl")
+    outputs.add_argument('--snapshot-db', metavar='PATH', help="crawl history database (EXPORT_CONFIG['snapshot_db'])")
+    outputs.add_argument('--no-snapshots', action='store_true', help="keep no crawl history")
+
+    runs = parser.add_argument_group("resume and incremental runs")
+    runs.add_argument('--resume', action='store_true', help="continue an interrupted crawl from its checkpoint")
+    runs.add_argument('--checkpoint-dir', metavar='DIR', help="where the frontier and record journal are kept")
+    runs.add_argument('--incremental', action='store_true', help="skip products unchanged since the last run")
+    runs.add_argument('--state-db', metavar='PATH', help="incremental state database (CRAWL_CONFIG['state_db'])")
+    runs.add_argument('--retry-failed', action='store_true',
+                      help="only recrawl the dead-letter queue (CRAWL_CONFIG['dead_letter_queue']) from earlier runs, "
+                           "for --brands if given; "
+                           "records go to -o (default: activewear_retried.csv/.json)")
+    runs.add_argument('--retries', type=int, help="tries per product on transient errors (CRAWL_CONFIG['retry_attempts'])")
+    runs.add_argument('--timeout', type=float, help="HTTP request timeout in seconds (CRAWL_CONFIG['request_timeout'])")
+
+    diagnostics = parser.add_argument_group("diagnostics")
+    diagnostics.add_argument('--profile', metavar='PATH', nargs='?', const="crawl_profile.prof",
+                             help="cProfile every product crawl and save the stats here")
+    diagnostics.add_argument('--metrics-jsonl', metavar='PATH', help="append metrics snapshots here")
+    diagnostics.add_argument('--metrics-port', type=int, help="serve Prometheus metrics on this port")
+    diagnostics.add_argument('--record-to', metavar='DIR', help="save every fetched page into a fixture corpus")
+    diagnostics.add_argument('--base-url', action='append', default=[], metavar='BRAND=URL',
+                             help="crawl another host for a brand, e.g. a local mock store (repeatable)")
+    return parser
+
+
+def load_config(path):
+    """
+    Apply a JSON config file to CRAWL_CONFIG / EXPORT_CONFIG
+    Top-level keys are CRAWL_CONFIG keys; "CRAWL_CONFIG" and "EXPORT_CONFIG" objects update those dicts.
+    """
+    with open(path, encoding='utf-8') as f:
+        overrides = json.load(f)
+    if not isinstance(overrides, dict):
+        raise ValueError(f"{path}: expected a JSON object")
+
+    export_overrides = overrides.pop('EXPORT_CONFIG', {})
+    crawl_overrides = dict(overrides.pop('CRAWL_CONFIG', {}), **overrides)
+    for name, config, updates in (('CRAWL_CONFIG', CRAWL_CONFIG, crawl_overrides),
+                                  ('EXPORT_CONFIG', EXPORT_CONFIG, export_overrides)):
+        unknown = sorted(set(updates) - set(config))
+        if unknown:
+            print(f"• {path}: unknown {name} keys {', '.join(unknown)} (added anyway)")
+        config.update(updates)
+
+
+def apply_args(args):
+    """Flags that tune CRAWL_CONFIG values the crawler reads when it starts"""
+    settings = {
+        'requests_per_second': args.rate,
+        'burst': args.burst,
+        'circuit_cooldown': args.cooldown,
+        'page_load_delay': args.page_load_delay,
+        'retry_attempts': args.retries,
+        'request_timeout': args.timeout,
+    }
+    CRAWL_CONFIG.update({key: value for key, value in settings.items() if value is not None})
+    if args.ignore_robots:
+        CRAWL_CONFIG['respect_robots_txt'] = False
+    if args.show_browser:
+        CRAWL_CONFIG['headless'] = False
 
+
+def parse_base_urls(values):
+    base_urls = {}
+    for value in values:
+        key, _, url = value.partition('=')
+        if key not in BRAND_CONFIGS or not url:
+            raise ValueError(f"--base-url expects BRAND=URL with one of {', '.join(BRAND_CONFIGS)}, got {value!r}")
+        base_urls[key] = url.rstrip('/')
+    return base_urls
+
+
+def check_categories(categories, brands):
+    """Warn about requested collections no selected brand is configured with"""
+    configured = {collection_name(path) for key in brands for path in BRAND_CONFIGS[key]['categories']}
+    unknown = [category for category in categories if collection_name(category) not in configured]
+    if unknown:
+        print(f"• Not configured for the selected brands, skipped: {', '.join(unknown)}")
+
+
+def create_crawler(args, base_urls=None):
+    from activewear_crawler import ActivewearCrawler
+
+    return ActivewearCrawler(
+        headless=CRAWL_CONFIG.get('headless', True),
+        engine=args.engine,
+        browser_fallback=not args.no_browser_fallback,
+        workers=args.workers,
+        per_domain_limit=args.per_domain,
+        incremental=args.incremental,
+        state_path=args.state_db,
+        # A retry pass adds to the interrupted crawl's checkpoint instead of discarding it
+        resume=args.resume or args.retry_failed,
+        checkpoint_dir=args.checkpoint_dir,
+        outputs=args.output,
+        # Records stream to the outputs; only the --parquet export needs them held in memory as well
+        keep_results=bool(args.parquet),
+        max_per_category=args.max_per_category,
+        browser_profile=args.browser_profile,
+        metrics_path=args.metrics_jsonl,
+        metrics_port=args.metrics_port,
+        profile=args.profile,
+        record_to=args.record_to,
+        base_urls=base_urls,
+        parse_processes=args.parse_processes,
+        rows=args.rows,
+        snapshot_db=False if args.no_snapshots else args.snapshot_db,
+        categories=args.categories,
+    )
+
+
+# ==================== INTERACTIVE MENU ====================
+def choose_brands():
+    """The original menu; returns (brand keys, output file prefix) or None to exit"""
     print("\nSelect crawl mode:")
     print("1. Full Crawl (All brands, all categories) - RECOMMENDED")
     print("2. Kica Active only")
@@ -26,97 +202,100 @@ def main():
     print("6. Custom selection")
     print("0. Exit")
 
+    choice = input("\nEnter your choice (0-6): ").strip()
+    singles = {"2": 'kica', "3": 'blissclub', "4": 'silvertraq', "5": 'terractive'}
+
+    if choice == "0":
+        return None
+    if choice == "1":
+        return list(BRAND_CONFIGS), None
+    if choice in singles:
+        return [singles[choice]], singles[choice]
+    if choice == "6":
+        print("\n📋 Custom Selection:")
+        brands = [key for key, config in BRAND_CONFIGS.items()
+                  if input(f"Crawl {config['name']}? (y/n): ").lower() == 'y']
+        if not brands:
+            print("\n⚠️  No brands selected!")
+            return None
+        return brands, "custom"
+
+    print("\n⚠️  Invalid choice!")
+    return None
+
+
+# ==================== MAIN EXECUTION ====================
+def main(argv=None):
+    """Run a crawl from command-line arguments; returns the process exit code"""
+    args = build_parser().parse_args(argv)
+    print(BANNER)
+
     try:
-        choice = input("\nEnter your choice (0-6): ").strip()
+        if args.config:
+            load_config(args.config)
+        apply_args(args)
+        base_urls = parse_base_urls(args.base_url)
+    except (OSError, ValueError) as e:
+        print(f"❌ {str(e)}")
+        return 2
 
-        if choice == "0":
+    brands = args.brands or list(BRAND_CONFIGS)
+    if args.retry_failed and not args.output:
+        args.output = ["activewear_retried.csv", "activewear_retried.json"]
+    if args.interactive:
+        selection = choose_brands()
+        if selection is None:
             print("\nExiting...")
-            sys.exit(0)
+            return 0
+        brands, prefix = selection
+        if prefix and not args.output:
+            args.output = [f"{prefix}_products.csv", f"{prefix}_products.json"]
+    if args.categories:
+        check_categories(args.categories, brands)
 
-        # Initialize crawler
+    crawler = None
+    try:
         print("\nInitializing crawler...")
-        crawler = ActivewearCrawler(headless=True)
-
-        if choice == "1":
-            print("\n🚀 Starting FULL CRAWL...")
-            crawler.run_full_crawl()
-
-        elif choice == "2":
-            print("\n🚀 Crawling Kica Active...")
-            crawler.crawl_kica()
-            crawler.export_to_csv("kica_products.csv")
-            crawler.export_to_json("kica_products.json")
-
-        elif choice == "3":
-            print("\n🚀 Crawling BlissClub...")
-            crawler.crawl_blissclub()
-            crawler.export_to_csv("blissclub_products.csv")
-            crawler.export_to_json("blissclub_products.json")
-
-        elif choice == "4":
-            print("\n🚀 Crawling SilverTraq...")
-            crawler.crawl_silvertraq()
-            crawler.export_to_csv("silvertraq_products.csv")
-            crawler.export_to_json("silvertraq_products.json")
-
-        elif choice == "5":
-            print("\n🚀 Crawling Terra-active...")
-            crawler.crawl_terractive()
-            crawler.export_to_csv("terractive_products.csv")
-            crawler.export_to_json("terractive_products.json")
-
-        elif choice == "6":
-            print("\n📋 Custom Selection:")
-            brands = []
-
-            if input("Crawl Kica? (y/n): ").lower() == 'y':
-                brands.append('kica')
-            if input("Crawl BlissClub? (y/n): ").lower() == 'y':
-                brands.append('blissclub')
-            if input("Crawl SilverTraq? (y/n): ").lower() == 'y':
-                brands.append('silvertraq')
-            if input("Crawl Terra-active? (y/n): ").lower() == 'y':
-                brands.append('terractive')
-
-            if not brands:
-                print("\n⚠️  No brands selected!")
-                return
-
-            print(f"\n🚀 Starting crawl for: {', '.join(brands)}")
-
-            for brand in brands:
-                if brand == 'kica':
-                    crawler.crawl_kica()
-                elif brand == 'blissclub':
-                    crawler.crawl_blissclub()
-                elif brand == 'silvertraq':
-                    crawler.crawl_silvertraq()
-                elif brand == 'terractive':
-                    crawler.crawl_terractive()
-
-            crawler.export_to_csv("custom_products.csv")
-            crawler.export_to_json("custom_products.json")
+        crawler = create_crawler(args, base_urls)
 
+        if args.retry_failed:
+            print("\n🚀 Retrying failed products...")
+            crawler.retry_failed(brands=args.brands)
         else:
-            print("\n⚠️  Invalid choice!")
-            return
+            print(f"\n🚀 Crawling {', '.join(BRAND_CONFIGS[key]['name'] for key in brands)}...")
+            crawler.run_full_crawl(brands=brands, changes_file=args.changes, diff_file=args.diff)
+        if args.parquet:
+            crawler.export_to_parquet(args.parquet)
+
+        if crawler.failed_brands:
+            print("\n" + "="*60)
+            print(f"❌ No products discovered for {', '.join(crawler.brands[key].name for key in crawler.failed_brands)}")
+            print("="*60)
+            return 1
 
         print("\n" + "="*60)
         print("✅ CRAWL COMPLETED SUCCESSFULLY!")
-        print(f"📊 Total products extracted: {len(crawler.results)}")
+        print(f"📊 Total products extracted: {crawler.results.total}")
         print("📁 Check your output files for results")
         print("="*60)
+        return 0
 
     except KeyboardInterrupt:
         print("\n\n⚠️  Crawl interrupted by user")
-        sys.exit(1)
+        print("💾 Progress is checkpointed - run again with --resume to continue")
+        return 130
     except Exception as e:
         print(f"\n\n❌ Error occurred: {str(e)}")
         print("\nPlease check:")
-        print("- Chrome and ChromeDriver are installed")
+        print("- Chrome and ChromeDriver are installed (engine=browser, or the fallback)")
         print("- Internet connection is stable")
         print("- Required packages are installed (see README)")
-        sys.exit(1)
+        print("\n💾 Progress is checkpointed - run again with --resume to continue")
+        return 1
+    finally:
+        if crawler:
+            crawler.close()
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
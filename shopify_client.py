@@ -0,0 +1,198 @@
+"""
+Shopify JSON Client for Activewear Crawler
+Reads products straight from the storefront JSON endpoints - no browser needed
+"""
+
+import re
+import time
+import requests
+from bs4 import BeautifulSoup
+from datetime import datetime
+from urllib.parse import urlparse
+from fabric_analysis import FIBER_NAME_PATTERN
+from pacing import parse_retry_after
+from variants import format_amount, parse_amount, variants_from_product
+
+FABRIC_PERCENT_RE = re.compile(rf'(\d+%.*?(?:{FIBER_NAME_PATTERN}).*?)(?:\.|\n|$)', re.IGNORECASE)
+
+
+class ShopifyClient:
+    """
+    Thin wrapper over the public Shopify storefront endpoints:
+      /products/<handle>.json, /products/<handle>.js
+      /collections/<handle>/products.json?page=N
+    """
+
+    def __init__(self, user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36", timeout=15,
+                 pacer=None, max_backoff_retries=3, metrics=None, recorder=None):
+        """
+        Create a keep-alive HTTP session shared by every request
+        pacer: optional AdaptivePacer; requests are then rate limited per host and 429/503s retried after its cooldown
+        metrics: optional CrawlMetrics recording every response's latency and status
+        recorder: optional fixture_corpus.FixtureRecorder saving every 200 response body
+        """
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Accept': 'application/json',
+        })
+        self.timeout = timeout
+        self.pacer = pacer
+        self.max_backoff_retries = max_backoff_retries
+        self.metrics = metrics
+        self.recorder = recorder
+
+    def get(self, url, params=None, headers=None, stream=False):
+        """
+        GET through the pacer, backing off and retrying while the site throttles us
+        stream: leave the body unread (response.raw) for incremental parsing; it is then not recorded
+        """
+        for attempt in range(self.max_backoff_retries + 1):
+            if self.pacer:
+                self.pacer.wait(url)
+
+            start = time.monotonic()
+            response = self.session.get(url, params=params, headers=headers, timeout=self.timeout, stream=stream)
+            if self.metrics:
+                self.metrics.record_fetch(url, response.status_code, time.monotonic() - start)
+
+            if not self.pacer:
+                break
+            self.pacer.record(url, response.status_code, time.monotonic() - start,
+                              parse_retry_after(response.headers.get('Retry-After')))
+            if not self.pacer.should_retry(response.status_code):
+                break
+            response.close()
+
+        if self.recorder and response.status_code == 200 and not stream:
+            self.recorder.record(url, response.status_code, response.text, params=params)
+        return response
+
+    def get_json(self, url, params=None):
+        """GET a JSON document, returning None for 404s and non-JSON responses"""
+        response = self.get(url, params=params)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    def get_product(self, product_url):
+        """Fetch a single product from /products/<handle>.json, falling back to .js"""
+        _, product, _, _ = self.fetch_product(product_url)
+        return product
+
+    def fetch_product(self, product_url, headers=None):
+        """
+        Fetch a product, optionally as a conditional GET (If-None-Match / If-Modified-Since headers)
+        Returns (status, product, etag, last_modified); status 304 means unchanged since last crawl.
+        """
+        base = product_url.split('?')[0].rstrip('/')
+
+        response = self.get(f"{base}.json", headers=headers)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code == 304:
+            return 304, None, etag, last_modified
+        if response.status_code == 200:
+            try:
+                data = response.json()
+            except ValueError:
+                data = None
+            if data and 'product' in data:
+                return 200, data['product'], etag, last_modified
+
+        data = self.get_json(f"{base}.js")
+        if data and 'title' in data:
+            return 200, data, None, None
+
+        return response.status_code, None, None, None
+
+    def get_collection_page(self, collection_url, page=1, limit=250):
+        """Fetch one page of /collections/<handle>/products.json"""
+        base = collection_url.split('?')[0].rstrip('/')
+        data = self.get_json(f"{base}/products.json", params={'page': page, 'limit': limit})
+        return data.get('products', []) if data else []
+
+    def iter_collection_products(self, collection_url, limit=250):
+        """Yield every product in a collection, following ?page=N until exhausted"""
+        page = 1
+        while True:
+            products = self.get_collection_page(collection_url, page=page, limit=limit)
+            if not products:
+                break
+            for product in products:
+                yield product
+            if len(products) < limit:
+                break
+            page += 1
+
+
+# ==================== RECORD CONVERSION ====================
+def product_url_for(base_url, product):
+    """Build the canonical product page URL from a Shopify product handle"""
+    return f"{base_url.rstrip('/')}/products/{product['handle']}"
+
+
+def base_url_of(url):
+    """Return scheme://host for any URL on a brand site"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def format_price(product):
+    """
+    Format the first variant price like the storefront does ("Rs. 1,299")
+    .json endpoints give rupee strings ("1299.00"), .js endpoints give paise integers (129900)
+    """
+    variants = product.get('variants') or []
+    if variants and variants[0].get('price') not in (None, ''):
+        raw = variants[0]['price']
+    else:
+        raw = product.get('price')
+    return format_amount(parse_amount(raw))
+
+
+def extract_fabric_from_soup(soup, fabric_keywords):
+    """Find fabric details in a parsed description using the same strategies as the page crawlers"""
+    keywords = [k.lower() for k in fabric_keywords]
+
+    # Method 1: Heading containing a fabric keyword, followed by a list or block
+    fabric_section = soup.find(string=lambda x: x and any(k in x.lower() for k in keywords))
+    if fabric_section:
+        parent = fabric_section.find_parent()
+        if parent:
+            details = parent.find_next('ul') or parent.find_next('div')
+            if details:
+                return details.get_text(separator=" | ", strip=True)
+            # Heading and details share one element, e.g. "<p>Fabric: 79% Nylon...</p>"
+            text = parent.get_text(separator=" ", strip=True)
+            if len(text) > len(fabric_section.strip()):
+                return text
+
+    # Method 2: Fabric percentages anywhere in the text
+    fabric_match = FABRIC_PERCENT_RE.search(soup.get_text())
+    if fabric_match:
+        return fabric_match.group(1).strip()
+
+    return "N/A"
+
+
+def product_to_record(brand, product, url, fabric_keywords):
+    """Convert Shopify product JSON into the crawler's record dict"""
+    body_html = product.get('body_html') or product.get('description') or ""
+    soup = BeautifulSoup(body_html, 'html.parser')
+    description_text = soup.get_text(strip=True) or "N/A"
+
+    return {
+        "Brand": brand,
+        "Product Name": (product.get('title') or "N/A").strip(),
+        "Price": format_price(product),
+        "Fabric Details": extract_fabric_from_soup(soup, fabric_keywords) if body_html else "N/A",
+        "Description": description_text[:200],
+        "URL": url,
+        "Crawled At": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "Variants": variants_from_product(product),
+    }
@@ -0,0 +1,153 @@
+"""
+Sitemap Discovery for Activewear Crawler
+Every product URL and its <lastmod> from a store's sitemap.xml, stream-parsed so memory stays flat at any catalog size
+"""
+
+import gzip
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+import requests
+
+from url_frontier import canonical_product_url
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+# Shopify's sitemap.xml is an index of sitemap_products_1.xml, sitemap_collections_1.xml, sitemap_pages_1.xml, ...
+PRODUCT_SITEMAP_MARKER = 'sitemap_products'
+
+XML_HEADERS = {'Accept': 'application/xml,text/xml;q=0.9,*/*;q=0.8'}
+
+
+def _tag(element):
+    """Local name of a sitemap element; None for other namespaces (e.g. <image:loc>)"""
+    tag = element.tag
+    if tag.startswith('{'):
+        namespace, _, tag = tag[1:].partition('}')
+        if namespace != SITEMAP_NS:
+            return None
+    return tag
+
+
+def iter_entries(source):
+    """
+    Stream (kind, loc, lastmod) out of one sitemap file object, kind being "url" or "sitemap" (an index entry)
+    Each entry is dropped from the tree as soon as it is read, so a 50,000-URL sitemap never sits in memory.
+    """
+    root = None
+    loc = lastmod = None
+    for event, element in ET.iterparse(source, events=('start', 'end')):
+        if root is None:
+            root = element
+            continue
+        if event != 'end':
+            continue
+
+        tag = _tag(element)
+        if tag == 'loc':
+            loc = (element.text or '').strip() or None
+        elif tag == 'lastmod':
+            lastmod = (element.text or '').strip() or None
+        elif tag in ('url', 'sitemap'):
+            if loc:
+                yield tag, loc, lastmod
+            loc = lastmod = None
+            root.clear()
+
+
+def parse_lastmod(value):
+    """<lastmod> / Shopify updated_at -> aware datetime (UTC if no offset given), None if unparseable"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class SitemapReader:
+    """
+    Product URLs and <lastmod>s from a store's sitemaps
+
+      product_urls(base_url)  - {canonical product url: lastmod}, or None when no sitemap lists a product
+
+    Sitemaps are taken from robots.txt "Sitemap:" lines, else /sitemap.xml. Index entries are followed
+    to the product sitemaps only; .xml.gz sitemaps are decompressed on the fly.
+    """
+
+    def __init__(self, client, robots=None, max_depth=2, retry=None):
+        """
+        client: ShopifyClient (paced, with metrics) used for every fetch
+        robots: optional RobotsCache, to find the sitemaps a store announces
+        retry: optional failures.RetryPolicy for sitemaps answering 5xx/429 or timing out
+        """
+        self.client = client
+        self.robots = robots
+        self.retry = retry
+        self.max_depth = max_depth
+
+    def sitemap_urls(self, base_url):
+        base_url = base_url.rstrip('/')
+        announced = self.robots.rules(base_url).site_maps() if self.robots else None
+        return announced or [f"{base_url}/sitemap.xml"]
+
+    def product_urls(self, base_url, limit=None):
+        """Every product in the store's sitemaps as {canonical url: lastmod}, up to limit; None if it lists none"""
+        products = {}
+        for sitemap_url in self.sitemap_urls(base_url):
+            response = self._open(sitemap_url)
+            if response is None:
+                continue
+            for loc, lastmod in self._iter_urls(response, sitemap_url, depth=0):
+                if '/products/' not in loc:
+                    continue
+                # Keyed on the crawled base URL, like products.json discovery (sitemaps may name another host)
+                products[canonical_product_url(urlsplit(loc).path, base_url)] = lastmod
+                if limit and len(products) >= limit:
+                    return products
+        return products or None
+
+    def _open(self, sitemap_url):
+        """The streamed response for a sitemap, or None if it is missing"""
+        try:
+            response = self.retry.call(self._fetch, sitemap_url) if self.retry else self._fetch(sitemap_url)
+        except requests.RequestException as e:
+            print(f"✗ Error fetching sitemap {sitemap_url}: {str(e)}")
+            return None
+        if response.status_code != 200:
+            response.close()
+            return None
+        return response
+
+    def _fetch(self, sitemap_url):
+        """Streamed response, raising on server errors and throttling so they can be retried"""
+        response = self.client.get(sitemap_url, headers=XML_HEADERS, stream=True)
+        if response.status_code >= 500 or response.status_code == 429:
+            response.close()
+            response.raise_for_status()
+        return response
+
+    def _iter_urls(self, response, sitemap_url, depth):
+        """(loc, lastmod) for every <url> reachable from one sitemap, following index entries"""
+        children = []
+        with response:
+            response.raw.decode_content = True
+            source = response.raw
+            if sitemap_url.split('?')[0].endswith('.gz'):
+                source = gzip.GzipFile(fileobj=response.raw)
+            try:
+                for kind, loc, lastmod in iter_entries(source):
+                    if kind == 'url':
+                        yield loc, lastmod
+                    elif depth < self.max_depth and PRODUCT_SITEMAP_MARKER in loc:
+                        children.append(loc)
+            except (ET.ParseError, OSError) as e:
+                print(f"✗ Error parsing sitemap {sitemap_url}: {str(e)}")
+
+        # Product sitemaps are read once the index is closed: one connection at a time
+        for child in children:
+            child_response = self._open(child)
+            if child_response is not None:
+                yield from self._iter_urls(child_response, child, depth + 1)
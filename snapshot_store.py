@@ -0,0 +1,389 @@
+"""
+Snapshot Store for Activewear Crawler
+Append-only history of every crawl in SQLite - price and stock changes by brand, category and date, and diffs between crawls
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from crawl_state import record_hash
+from record_sinks import open_sink
+from variants import as_variants
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Fields tracked in the changes table as they move between crawls
+CHANGE_FIELDS = ('new', 'price', 'stock')
+
+# Columns of a diff report
+DIFF_FIELDS = ["Change", "Brand", "Product Name", "URL", "Old", "New"]
+
+PRICE_RE = re.compile(r'\d[\d,]*(?:\.\d+)?')
+
+
+def parse_price(text):
+    """Storefront price text to a number: "Rs. 1,299" -> 1299.0, "N/A" -> None"""
+    match = PRICE_RE.search(text or "")
+    return float(match.group().replace(',', '')) if match else None
+
+
+def in_stock_count(record):
+    """In-stock variants of a record, None if it has no variant data"""
+    variants = as_variants(record.get("Variants"))
+    if not variants:
+        return None
+    return sum(1 for v in variants if v.available)
+
+
+class SnapshotStore:
+    """
+    Every product of every crawl, keyed by brand + product URL + crawl time
+
+      crawls     - one row per crawl (start/finish time)
+      snapshots  - one row per product per crawl: price, in-stock variants and a hash of the full record
+      records    - each distinct record content once (unchanged products share it across crawls)
+      categories - which collections each product was listed in
+      changes    - price/stock moves and first appearances, written as snapshots are added
+
+    Rows are only added while a crawl runs (a product saved twice in one crawl keeps its last record), and a
+    finished crawl is left alone unless it is resumed, so any two crawls can be compared later.
+    """
+
+    def __init__(self, path="activewear_snapshots.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS crawls (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at TEXT NOT NULL,
+                finished_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS records (
+                hash TEXT PRIMARY KEY,
+                record_json TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS snapshots (
+                crawl_id INTEGER NOT NULL,
+                brand TEXT NOT NULL COLLATE NOCASE,
+                url TEXT NOT NULL,
+                crawled_at TEXT NOT NULL,
+                product_name TEXT,
+                price REAL,
+                in_stock INTEGER,
+                record_hash TEXT NOT NULL,
+                PRIMARY KEY (crawl_id, url)
+            );
+            CREATE INDEX IF NOT EXISTS idx_snapshots_url ON snapshots (url, crawl_id);
+            CREATE INDEX IF NOT EXISTS idx_snapshots_brand ON snapshots (brand, crawled_at);
+            CREATE TABLE IF NOT EXISTS categories (
+                brand TEXT NOT NULL COLLATE NOCASE,
+                category TEXT NOT NULL COLLATE NOCASE,
+                url TEXT NOT NULL,
+                PRIMARY KEY (brand, category, url)
+            );
+            CREATE TABLE IF NOT EXISTS changes (
+                crawl_id INTEGER NOT NULL,
+                crawled_at TEXT NOT NULL,
+                brand TEXT NOT NULL COLLATE NOCASE,
+                url TEXT NOT NULL,
+                product_name TEXT,
+                field TEXT NOT NULL,
+                old_value,
+                new_value
+            );
+            CREATE INDEX IF NOT EXISTS idx_changes_brand ON changes (brand, field, crawled_at);
+            CREATE INDEX IF NOT EXISTS idx_changes_time ON changes (crawled_at);
+        """)
+        self._conn.commit()
+        self.crawl_id = None
+
+    # ==================== CRAWLS ====================
+    def start_crawl(self):
+        """Open a new crawl; snapshots added from now on belong to it"""
+        with self._lock:
+            cursor = self._conn.execute("INSERT INTO crawls (started_at) VALUES (?)",
+                                        (datetime.now().strftime(TIMESTAMP_FORMAT),))
+            self._conn.commit()
+            self.crawl_id = cursor.lastrowid
+        return self.crawl_id
+
+    def finish_crawl(self):
+        if self.crawl_id is None:
+            return
+        with self._lock:
+            self._conn.execute("UPDATE crawls SET finished_at = ? WHERE id = ?",
+                               (datetime.now().strftime(TIMESTAMP_FORMAT), self.crawl_id))
+            self._conn.commit()
+
+    def resume_latest(self):
+        """
+        Add further snapshots to the latest crawl that has any, instead of a new one (a resumed or retry pass)
+        The crawl counts as unfinished again until finish_crawl(); with no earlier crawl a new one is started.
+        """
+        with self._lock:
+            latest = self._conn.execute("SELECT MAX(crawl_id) FROM snapshots").fetchone()[0]
+            if latest is not None:
+                if self.crawl_id is not None and self.crawl_id != latest:
+                    # The crawl opened for this run is dropped while nothing has been added to it
+                    self._conn.execute("DELETE FROM crawls WHERE id = ? AND NOT EXISTS "
+                                       "(SELECT 1 FROM snapshots WHERE crawl_id = ?)", (self.crawl_id, self.crawl_id))
+                self._conn.execute("UPDATE crawls SET finished_at = NULL WHERE id = ?", (latest,))
+                self._conn.commit()
+                self.crawl_id = latest
+        if self.crawl_id is None:
+            self.start_crawl()
+        return self.crawl_id
+
+    def crawls(self):
+        """Every crawl with its product count, oldest first"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT c.id, c.started_at, c.finished_at, COUNT(s.url) AS products
+                FROM crawls c LEFT JOIN snapshots s ON s.crawl_id = c.id
+                GROUP BY c.id ORDER BY c.id
+            """).fetchall()
+        return [dict(row) for row in rows]
+
+    def latest_crawl(self, before=None):
+        """
+        Id of the latest finished crawl with snapshots (before crawl `before`, if given), or None
+        Crawls that never finished (killed part-way) hold only part of the catalog and are passed over.
+        """
+        sql = ("SELECT MAX(c.id) FROM crawls c WHERE c.finished_at IS NOT NULL "
+               "AND EXISTS (SELECT 1 FROM snapshots s WHERE s.crawl_id = c.id)")
+        params = ()
+        if before is not None:
+            sql += " AND c.id < ?"
+            params = (before,)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    # ==================== SNAPSHOTS ====================
+    def add(self, record):
+        """Append a record to the current crawl, logging its price/stock changes since its last snapshot"""
+        record_json = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._add(record, record_json, record.get("Crawled At") or datetime.now().strftime(TIMESTAMP_FORMAT))
+            self._conn.commit()
+
+    def carry(self, url):
+        """Repeat a product's last snapshot in the current crawl (skipped as unchanged); False if it has none"""
+        now = datetime.now().strftime(TIMESTAMP_FORMAT)
+        with self._lock:
+            cursor = self._conn.execute("""
+                INSERT OR IGNORE INTO snapshots (crawl_id, brand, url, crawled_at, product_name, price, in_stock,
+                                                 record_hash)
+                SELECT ?, brand, url, ?, product_name, price, in_stock, record_hash
+                FROM snapshots WHERE url = ? AND crawl_id < ? ORDER BY crawl_id DESC LIMIT 1
+            """, (self.crawl_id, now, url, self.crawl_id))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def _add(self, record, record_json, crawled_at):
+        url, brand, name = record['URL'], record.get('Brand') or "N/A", record.get('Product Name')
+        content_hash = record_hash(record)
+        price, in_stock = parse_price(record.get('Price')), in_stock_count(record)
+
+        previous = self._conn.execute(
+            "SELECT price, in_stock FROM snapshots WHERE url = ? AND crawl_id < ? ORDER BY crawl_id DESC LIMIT 1",
+            (url, self.crawl_id),
+        ).fetchone()
+        changes = []
+        if previous is None:
+            changes.append(('new', None, price))
+        else:
+            if previous['price'] != price:
+                changes.append(('price', previous['price'], price))
+            if previous['in_stock'] != in_stock:
+                changes.append(('stock', previous['in_stock'], in_stock))
+
+        self._conn.execute("INSERT OR IGNORE INTO records (hash, record_json) VALUES (?, ?)", (content_hash, record_json))
+        self._conn.execute("""
+            INSERT OR REPLACE INTO snapshots (crawl_id, brand, url, crawled_at, product_name, price, in_stock,
+                                              record_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (self.crawl_id, brand, url, crawled_at, name, price, in_stock, content_hash))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO categories (brand, category, url) VALUES (?, ?, ?)",
+            [(brand, category.strip(), url) for category in (record.get('Categories') or "").split('|')
+             if category.strip() and category.strip() != "N/A"],
+        )
+        self._conn.executemany(
+            "INSERT INTO changes (crawl_id, crawled_at, brand, url, product_name, field, old_value, new_value) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(self.crawl_id, crawled_at, brand, url, name, field, old, new) for field, old, new in changes],
+        )
+
+    def records(self, crawl_id):
+        """Full records of one crawl, each with the time it was crawled"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT s.crawled_at, r.record_json FROM snapshots s JOIN records r ON r.hash = s.record_hash
+                WHERE s.crawl_id = ? ORDER BY s.brand, s.url
+            """, (crawl_id,)).fetchall()
+        records = []
+        for row in rows:
+            record = json.loads(row['record_json'])
+            record["Crawled At"] = row['crawled_at']
+            records.append(record)
+        return records
+
+    def history(self, url):
+        """Every snapshot of one product, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT crawl_id, crawled_at, price, in_stock, record_hash FROM snapshots WHERE url = ? ORDER BY crawl_id",
+                (url,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    # ==================== QUERIES ====================
+    def changes(self, field=None, brand=None, category=None, days=None, since=None):
+        """
+        Logged changes, newest first, e.g. changes('price', brand='BlissClub', category='leggings', days=7)
+        field: 'price', 'stock' or 'new' (default all); since: "YYYY-MM-DD[ HH:MM:SS]", or days back from now
+        """
+        if days is not None:
+            since = (datetime.now() - timedelta(days=days)).strftime(TIMESTAMP_FORMAT)
+
+        sql = "SELECT c.* FROM changes c"
+        where, params = [], []
+        if category:
+            sql += " JOIN categories k ON k.brand = c.brand AND k.url = c.url AND k.category = ?"
+            params.append(category)
+        if brand:
+            where.append("c.brand = ?")
+            params.append(brand)
+        if field:
+            where.append("c.field = ?")
+            params.append(field)
+        if since:
+            where.append("c.crawled_at >= ?")
+            params.append(since)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY c.crawled_at DESC, c.brand, c.url"
+
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    def diff(self, old_crawl, new_crawl):
+        """
+        Report rows for what changed between two crawls: added, removed, price, stock and content changes
+        Products are only reported removed for brands the new crawl covered.
+        """
+        with self._lock:
+            changed = self._conn.execute("""
+                SELECT n.brand, n.product_name, n.url, o.price AS old_price, n.price AS new_price,
+                       o.in_stock AS old_stock, n.in_stock AS new_stock, o.record_hash != n.record_hash AS content
+                FROM snapshots n JOIN snapshots o ON o.crawl_id = ? AND o.url = n.url
+                WHERE n.crawl_id = ? AND (o.record_hash != n.record_hash OR o.price IS NOT n.price
+                                          OR o.in_stock IS NOT n.in_stock)
+            """, (old_crawl, new_crawl)).fetchall()
+            added = self._conn.execute("""
+                SELECT n.brand, n.product_name, n.url, n.price, n.in_stock FROM snapshots n
+                WHERE n.crawl_id = ? AND NOT EXISTS (SELECT 1 FROM snapshots o WHERE o.crawl_id = ? AND o.url = n.url)
+            """, (new_crawl, old_crawl)).fetchall()
+            removed = self._conn.execute("""
+                SELECT o.brand, o.product_name, o.url, o.price, o.in_stock FROM snapshots o
+                WHERE o.crawl_id = ? AND NOT EXISTS (SELECT 1 FROM snapshots n WHERE n.crawl_id = ? AND n.url = o.url)
+                  AND o.brand IN (SELECT DISTINCT brand FROM snapshots WHERE crawl_id = ?)
+            """, (old_crawl, new_crawl, new_crawl)).fetchall()
+
+        def row(change, r, old, new):
+            return {"Change": change, "Brand": r['brand'], "Product Name": r['product_name'] or "N/A",
+                    "URL": r['url'], "Old": "N/A" if old is None else old, "New": "N/A" if new is None else new}
+
+        rows = [row('added', r, None, r['price']) for r in added]
+        rows += [row('removed', r, r['price'], None) for r in removed]
+        for r in changed:
+            if r['old_price'] != r['new_price']:
+                rows.append(row('price', r, r['old_price'], r['new_price']))
+            if r['old_stock'] != r['new_stock']:
+                rows.append(row('stock', r, r['old_stock'], r['new_stock']))
+            if r['content'] and r['old_price'] == r['new_price'] and r['old_stock'] == r['new_stock']:
+                rows.append(row('content', r, None, None))
+        rows.sort(key=lambda r: (r["Brand"], r["Change"], r["Product Name"]))
+        return rows
+
+    def write_diff(self, old_crawl, new_crawl, filename="activewear_diff.csv"):
+        """Write diff() to a .csv/.json/.jsonl report; returns the rows"""
+        rows = self.diff(old_crawl, new_crawl)
+        sink = open_sink(filename, fieldnames=DIFF_FIELDS)
+        for r in rows:
+            sink.write(r)
+        sink.close()
+        return rows
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def print_diff_summary(rows):
+    counts = {}
+    for r in rows:
+        counts[r["Change"]] = counts.get(r["Change"], 0) + 1
+    summary = ", ".join(f"{n} {change}" for change, n in sorted(counts.items()))
+    print(f"• Changes: {summary or 'none'}")
+
+
+# ==================== MAIN EXECUTION ====================
+if __name__ == "__main__":
+    from crawler_config import EXPORT_CONFIG
+
+    parser = argparse.ArgumentParser(description="Query the crawl history in the snapshot store")
+    parser.add_argument('--db', default=EXPORT_CONFIG.get('snapshot_db') or "activewear_snapshots.db")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('crawls', help="list every crawl")
+
+    changes_parser = commands.add_parser('changes', help="price/stock changes, e.g. --brand BlissClub --category leggings")
+    changes_parser.add_argument('--field', choices=CHANGE_FIELDS)
+    changes_parser.add_argument('--brand')
+    changes_parser.add_argument('--category')
+    changes_parser.add_argument('--days', type=float, default=7, help="how far back (default: 7)")
+
+    diff_parser = commands.add_parser('diff', help="report what changed between two crawls")
+    diff_parser.add_argument('crawls', type=int, nargs='*', help="OLD NEW crawl ids (default: the last two)")
+    diff_parser.add_argument('-o', '--output', default="activewear_diff.csv", help=".csv, .json or .jsonl")
+
+    history_parser = commands.add_parser('history', help="every snapshot of one product")
+    history_parser.add_argument('url')
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.db)
+    if args.command == 'crawls':
+        for crawl in store.crawls():
+            print(f"{crawl['id']:>5}  {crawl['started_at']}  -  {crawl['finished_at'] or 'unfinished':<19}  "
+                  f"{crawl['products']} products")
+
+    elif args.command == 'changes':
+        for change in store.changes(args.field, args.brand, args.category, days=args.days):
+            print(f"{change['crawled_at']}  {change['brand']:<12} {change['field']:<6} "
+                  f"{change['old_value']!s:>8} -> {change['new_value']!s:<8} {change['product_name']}")
+
+    elif args.command == 'diff':
+        if len(args.crawls) >= 2:
+            old, new = args.crawls[:2]
+        else:
+            new = args.crawls[0] if args.crawls else store.latest_crawl()
+            old = store.latest_crawl(before=new) if new else None
+        if old is None or new is None:
+            print("✗ Need two crawls to compare")
+        else:
+            rows = store.write_diff(old, new, args.output)
+            print(f"✓ Crawl {old} -> {new}: {len(rows)} changes written to {args.output}")
+            print_diff_summary(rows)
+
+    elif args.command == 'history':
+        for snapshot in store.history(args.url):
+            print(f"{snapshot['crawled_at']}  crawl {snapshot['crawl_id']:<5} price {snapshot['price']!s:<8} "
+                  f"in stock {snapshot['in_stock']}")
+    store.close()
@@ -0,0 +1,87 @@
+"""
+Shared Fixtures for the Activewear Crawler Tests
+Every crawl runs against local mock_shopify stores in a temporary working directory
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from activewear_crawler import ActivewearCrawler  # noqa: E402
+from crawler_config import CRAWL_CONFIG, EXPORT_CONFIG  # noqa: E402
+from mock_shopify import MockShopifyServer  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Checkpoints, state, snapshots, dead-letter queue and outputs all land in a fresh directory"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def fast_config():
+    """
+    Pacing and retry waits short enough for a local mock store
+    Both config dicts are restored afterwards (run_crawler and --config write into them).
+    """
+    saved = dict(CRAWL_CONFIG), dict(EXPORT_CONFIG)
+    CRAWL_CONFIG.update({'requests_per_second': 500, 'burst': 100, 'circuit_cooldown': 0.05,
+                         'retry_base_delay': 0.01, 'retry_max_delay': 0.05, 'page_load_delay': 0,
+                         'workers': 4, 'base_url_overrides': {}})
+    yield
+    for config, values in zip((CRAWL_CONFIG, EXPORT_CONFIG), saved):
+        config.clear()
+        config.update(values)
+
+
+@pytest.fixture
+def store():
+    """Mock stores for every brand, 20 products each"""
+    with MockShopifyServer(products=20) as server:
+        yield server
+
+
+@pytest.fixture
+def make_crawler(store):
+    """ActivewearCrawler against the mock stores, JSON only (no Chrome), closed after the test"""
+    crawlers = []
+
+    def make(**kwargs):
+        kwargs.setdefault('engine', 'http')
+        kwargs.setdefault('browser_fallback', False)
+        kwargs.setdefault('base_urls', store.base_urls)
+        crawler = ActivewearCrawler(**kwargs)
+        crawlers.append(crawler)
+        return crawler
+
+    yield make
+    for crawler in crawlers:
+        crawler.close()
+
+
+@pytest.fixture
+def interrupted_crawl(make_crawler):
+    """Crawl a brand but stop after `saved` products, leaving things as a killed process would (nothing finished)"""
+    def crawl(key='kica', saved=10):
+        crawler = make_crawler()
+        attempt = crawler.attempt
+        reached = []
+
+        def first_products(brand, url, fn, *args):
+            reached.append(url)
+            if len(reached) <= saved:
+                attempt(brand, url, fn, *args)
+        crawler.attempt = first_products
+        crawler.crawl_brand(key)
+
+        crawler.scheduler.shutdown()
+        crawler.checkpoint.close()
+        if crawler.snapshots:
+            crawler.snapshots.close()
+        crawler.snapshots = crawler.state = crawler.metrics_path = None
+        return crawler
+    return crawl
@@ -0,0 +1,84 @@
+"""Async engine: discovery via products.json or the sitemap, brands that discover nothing, per-host limits"""
+
+import asyncio
+
+import pytest
+
+import activewear_crawler
+import run_crawler
+from crawler_config import CRAWL_CONFIG
+from mock_shopify import MockShopifyServer
+from robots import RobotsCache
+
+
+@pytest.fixture
+def store():
+    """Stores that lock down products.json, like the ones the sitemap fallback is for"""
+    with MockShopifyServer(products=20, products_json=False) as server:
+        yield server
+
+
+def crawled(crawler, key):
+    return crawler.metrics.counts(crawler.brands[key].name).get('crawled', 0)
+
+
+def test_async_falls_back_to_the_sitemap(make_crawler):
+    crawler = make_crawler(engine='async')
+    crawler.crawl_brand('kica')
+
+    assert crawled(crawler, 'kica') == 20
+    assert crawler.failed_brands == []
+    assert {r['Categories'] for r in crawler.results} == {'all'}
+
+
+def test_async_products_json_still_preferred(make_crawler):
+    with MockShopifyServer(products=20) as server:
+        crawler = make_crawler(engine='async', base_urls=server.base_urls)
+        crawler.crawl_brand('kica')
+
+    assert crawled(crawler, 'kica') == 20
+    # Listed under their collections, not the sitemap's catch-all
+    assert all(r['Categories'].startswith('all | ') for r in crawler.results)
+
+
+@pytest.mark.parametrize('engine', ['http', 'async'])
+def test_brand_without_products_fails_the_run(engine, capsys):
+    with MockShopifyServer(products=20, products_json=False, sitemaps=False) as server:
+        code = run_crawler.main(['--brands', 'kica', '--engine', engine, '--no-browser-fallback', '--no-snapshots',
+                                 '--base-url', f"kica={server.base_urls['kica']}"])
+    assert code == 1
+    assert "No products discovered for Kica Active" in capsys.readouterr().out
+
+
+def test_robots_txt_is_not_fetched_inside_the_event_loop(make_crawler, monkeypatch):
+    fetch = RobotsCache._fetch
+    in_loop = []
+
+    def watched(cache, host):
+        try:
+            asyncio.get_running_loop()
+            in_loop.append(host)
+        except RuntimeError:
+            pass
+        return fetch(cache, host)
+    monkeypatch.setattr(RobotsCache, '_fetch', watched)
+
+    crawler = make_crawler(engine='async')
+    crawler.crawl_brand('kica')
+    assert crawled(crawler, 'kica') == 20
+    assert in_loop == []
+
+
+@pytest.mark.parametrize('per_domain, per_host', [(3, 3), (None, 16)])
+def test_async_connections_per_host(make_crawler, monkeypatch, per_domain, per_host):
+    limits = []
+    init = activewear_crawler.AsyncFetcher.__init__
+
+    def recording_init(fetcher, **kwargs):
+        limits.append(kwargs['per_host_limit'])
+        init(fetcher, **kwargs)
+    monkeypatch.setattr(activewear_crawler.AsyncFetcher, '__init__', recording_init)
+    monkeypatch.setitem(CRAWL_CONFIG, 'async_per_host', 16)
+
+    make_crawler(engine='async', per_domain_limit=per_domain).crawl_brand('kica')
+    assert limits == [per_host]
@@ -0,0 +1,68 @@
+"""Brand engine: config-driven product extraction, collection links and fabric plugins"""
+
+import os
+
+import pytest
+import requests
+
+from brand_engine import FABRIC_EXTRACTORS, BrandEngine, register_fabric_extractor
+from crawler_config import BRAND_CONFIGS
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+
+EXPECTED = {
+    'blissclub': ("BlissClub Flow Legging", "Shell: 79% Nylon, 21% Spandex | Quick-dry"),
+    'kica': ("Kica Active Flow Legging", "79% Nylon | 21% Spandex | Moisture-wicking"),
+    'silvertraq': ("SilverTraq Flow Legging", "TraqTech 88% Polyester 12% Elastane | Breathable"),
+    'terractive': ("Terra-active Flow Legging", "95% Cotton, 5% Lycra | Stretchy"),
+}
+
+
+def fixture_html(key):
+    with open(os.path.join(FIXTURES, f"{key}_product.html"), encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('key', sorted(EXPECTED))
+def test_parse_product_fixture(key):
+    engine = BrandEngine(key, BRAND_CONFIGS[key])
+    url = f"{engine.base_url}/products/flow-legging"
+    record = engine.parse_product(engine.parse(fixture_html(key)), url)
+
+    assert (record["Product Name"], record["Fabric Details"]) == EXPECTED[key]
+    assert (record["Brand"], record["Price"], record["URL"]) == (BRAND_CONFIGS[key]['name'], "Rs. 1,299", url)
+    assert record["Description"] != "N/A"
+
+
+def test_collection_links_and_page_variants(store):
+    base_url = store.base_urls['kica']
+    engine = BrandEngine('kica', dict(BRAND_CONFIGS['kica'], base_url=base_url))
+
+    html = requests.get(f"{base_url}/collections/all").text
+    links = engine.product_links(engine.parse(html))
+    handles = list(store.stores['kica'].products)
+    # Canonical /products/<handle> URLs, without the collection prefix and ?variant= the cards link to
+    assert links and links == [f"{base_url}/products/{h}" for h in handles[:len(links)]]
+
+    html = requests.get(links[0]).text
+    record = engine.parse_product(engine.parse(html), links[0], html)
+    product = store.stores['kica'].products[handles[0]]
+    assert record["Product Name"] == product['title']
+    assert [v.sku for v in record["Variants"]] == [v['sku'] for v in product['variants']]
+
+
+def test_fabric_extractor_plugin(monkeypatch):
+    monkeypatch.setattr('brand_engine.FABRIC_EXTRACTORS', dict(FABRIC_EXTRACTORS))
+
+    @register_fabric_extractor('fixed')
+    def extract_fixed(page, brand):
+        return f"{brand.name}: {page.get('product_name').text}"
+
+    engine = BrandEngine('kica', dict(BRAND_CONFIGS['kica'], fabric_extractor='fixed'))
+    record = engine.parse_product(engine.parse(fixture_html('kica')), "u")
+    assert record["Fabric Details"] == "Kica Active: Kica Active Flow Legging"
+
+
+def test_unknown_parser():
+    with pytest.raises(ValueError, match="Unknown parser backend"):
+        BrandEngine('kica', BRAND_CONFIGS['kica'], parser='regex')
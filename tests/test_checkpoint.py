@@ -0,0 +1,86 @@
+"""Checkpoint and resume: record journal, done flags and replay into the outputs"""
+
+import csv
+import sqlite3
+
+import pytest
+
+from checkpoint import CrawlCheckpoint
+from snapshot_store import SnapshotStore
+
+
+def test_journal_survives_a_torn_line(workdir):
+    checkpoint = CrawlCheckpoint("ckpt")
+    checkpoint.journal({"URL": "/products/a"})
+    checkpoint.close()
+    with open(workdir / "ckpt" / "records.jsonl", 'a', encoding='utf-8') as f:
+        f.write('{"URL": "/products/b", "Pri')
+
+    resumed = CrawlCheckpoint("ckpt", resume=True)
+    resumed.journal({"URL": "/products/c"})
+    assert [r["URL"] for r in resumed.completed_records()] == ["/products/a", "/products/c"]
+    assert resumed.is_done("/products/a") and not resumed.is_done("/products/b")
+    resumed.close()
+
+    assert not CrawlCheckpoint("ckpt").is_done("/products/a")
+
+
+def test_fresh_checkpoint_leaves_other_files_alone(workdir):
+    (workdir / "notes.txt").write_text("keep me")
+    (workdir / "out").mkdir()
+    checkpoint = CrawlCheckpoint(".")
+    checkpoint.journal({"URL": "/products/a"})
+    checkpoint.close()
+
+    fresh = CrawlCheckpoint(".")
+    assert not fresh.is_done("/products/a")
+    assert list(fresh.completed_records()) == []
+    fresh.close()
+    assert (workdir / "notes.txt").read_text() == "keep me"
+    assert (workdir / "out").is_dir()
+
+
+def test_done_flags_follow_the_frontier(workdir):
+    checkpoint = CrawlCheckpoint("ckpt")
+    checkpoint.add_frontier("Kica Active", "/collections/leggings", ["/products/a", "/products/b"])
+    checkpoint.journal({"URL": "/products/a"})
+    assert not checkpoint.is_category_done("/collections/leggings")
+    checkpoint.mark_done("/products/b")
+    assert checkpoint.is_category_done("/collections/leggings")
+    assert checkpoint.discovered_links("/collections/leggings") == ["/products/a", "/products/b"]
+    checkpoint.close()
+
+
+def test_resume_streams_the_journal_once(make_crawler, interrupted_crawl, monkeypatch):
+    interrupted_crawl('kica', saved=10)
+
+    reads = []
+    completed_records = CrawlCheckpoint.completed_records
+
+    def counted(checkpoint):
+        reads.append(1)
+        return completed_records(checkpoint)
+    monkeypatch.setattr(CrawlCheckpoint, 'completed_records', counted)
+
+    resumed = make_crawler(resume=True, keep_results=False)
+    resumed.open_outputs(['products.csv'])
+    resumed.run_full_crawl(brands=['kica'])
+
+    # Once for the checkpoint's done-set, once to replay into the results and outputs together
+    assert len(reads) == 2
+    assert resumed.results.total == 20 and len(resumed.results) == 0
+    assert resumed.metrics.counts('Kica Active')['crawled'] == 10
+    with open('products.csv', encoding='utf-8', newline='') as f:
+        urls = [row['URL'] for row in csv.DictReader(f)]
+    assert len(urls) == len(set(urls)) == 20
+
+
+def test_close_releases_every_store(make_crawler):
+    crawler = make_crawler(incremental=True)
+    crawler.run_full_crawl(brands=['kica'])
+
+    for conn in (crawler.checkpoint._conn, crawler.state._conn, crawler.snapshots._conn):
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    assert crawler.checkpoint._journal.closed
+    assert all(c['finished_at'] for c in SnapshotStore("activewear_snapshots.db").crawls())
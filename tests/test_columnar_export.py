@@ -0,0 +1,72 @@
+"""Columnar export: typed Parquet datasets partitioned by brand and crawl date"""
+
+import pytest
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+from columnar_export import ParquetSink, parse_price, records_to_table, write_parquet_dataset  # noqa: E402
+from variants import Variant  # noqa: E402
+
+
+def record(brand="Kica Active", url="https://kicaactive.com/products/flow", crawled_at="2026-01-02 10:00:00"):
+    return {"Brand": brand, "Product Name": "Flow Legging", "Price": "Rs. 1,299", "URL": url,
+            "Fabric Details": "79% Nylon | 21% Spandex", "Description": "N/A", "Categories": "all | leggings",
+            "Crawled At": crawled_at,
+            "Variants": (Variant(1, "FL-S", "S / Black", "S", "Black", 1299.0, None, True),)}
+
+
+@pytest.mark.parametrize('text, parsed', [
+    ("Rs. 1,299.50", (1299.5, 'INR')),
+    ("₹999", (999.0, 'INR')),
+    ("$25", (25.0, 'USD')),
+    ("N/A", (None, None)),
+    ("Sold out", (None, None)),
+])
+def test_parse_price(text, parsed):
+    assert parse_price(text) == parsed
+
+
+def test_records_to_table():
+    row = records_to_table([record(), {"URL": "https://x.com/products/bare", "Crawled At": "N/A"}]).to_pylist()
+
+    assert row[0]['price'] == 1299.0
+    assert row[0]['fabric_composition'] == [('nylon', 79.0), ('elastane', 21.0)]
+    assert row[0]['categories'] == ['all', 'leggings']
+    assert row[0]['variants'][0]['sku'] == "FL-S"
+    assert row[0]['crawl_date'] == "2026-01-02"
+    assert (row[1]['price'], row[1]['variants'], row[1]['crawl_date']) == (None, [], "unknown")
+
+
+def test_dataset_is_partitioned(workdir):
+    records = [record(), record(url="https://kicaactive.com/products/b", crawled_at="2026-01-03 09:00:00"),
+               record(brand="BlissClub", url="https://blissclub.com/products/flow")]
+    assert write_parquet_dataset(records, str(workdir / "dataset")) == 3
+    assert write_parquet_dataset([], str(workdir / "empty")) == 0
+
+    assert len(list((workdir / "dataset").rglob("*.parquet"))) == 3
+    table = pq.read_table(workdir / "dataset")
+    rows = sorted((r['brand'], r['crawl_date'], r['url']) for r in table.to_pylist())
+    assert rows == [("BlissClub", "2026-01-02", "https://blissclub.com/products/flow"),
+                    ("Kica Active", "2026-01-02", "https://kicaactive.com/products/flow"),
+                    ("Kica Active", "2026-01-03", "https://kicaactive.com/products/b")]
+
+
+def test_sink_writes_in_batches(workdir):
+    sink = ParquetSink(str(workdir / "dataset"), batch_size=2)
+    for n in range(5):
+        sink.write(record(url=f"https://kicaactive.com/products/{n}"))
+    sink.close()
+
+    assert sink.count == 5
+    assert len(list((workdir / "dataset").rglob("*.parquet"))) == 3
+    assert pq.read_table(workdir / "dataset").num_rows == 5
+
+
+def test_crawl_exports_parquet(make_crawler, workdir):
+    crawler = make_crawler()
+    crawler.crawl_brand('kica')
+    crawler.export_to_parquet(str(workdir / "products"))
+
+    table = pq.read_table(workdir / "products")
+    assert table.num_rows == 20
+    assert set(table.column('brand').to_pylist()) == {"Kica Active"}
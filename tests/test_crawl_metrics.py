@@ -0,0 +1,75 @@
+"""Crawl metrics: stage histograms, per-brand counters and the JSON lines / Prometheus exports"""
+
+import json
+
+import requests
+
+from crawl_metrics import LATENCY_BUCKETS, CrawlMetrics, Histogram
+
+
+def test_histogram():
+    histogram = Histogram()
+    for seconds in (0.002, 0.004, 0.02, 0.3, 60):
+        histogram.observe(seconds)
+
+    assert histogram.count == 5
+    assert histogram.counts[LATENCY_BUCKETS.index(0.005)] == 2
+    assert histogram.counts[-1] == 1
+    assert histogram.quantile(0.5) == 0.025
+    assert histogram.quantile(1.0) == 60
+    assert Histogram().quantile(0.5) == 0.0
+
+
+def test_fetches_are_counted_per_brand():
+    metrics = CrawlMetrics({'kicaactive.com': "Kica Active"})
+    metrics.record_fetch("https://kicaactive.com/products/a.json", 200, 0.01)
+    metrics.record_fetch("https://kicaactive.com/products/b.json", 503, 0.01)
+    metrics.record_fetch("https://cdn.example.com/x.js", None, 0.01)
+    with metrics.stage('parse'):
+        pass
+
+    assert metrics.counts("Kica Active") == {'pages': 2, 'errors': 1}
+    assert metrics.counts("cdn.example.com") == {'pages': 1, 'errors': 1}
+    stages = metrics.snapshot()['stages']
+    assert (stages['fetch']['count'], stages['parse']['count']) == (3, 1)
+    assert 'render' not in stages
+
+
+def test_prometheus_text():
+    metrics = CrawlMetrics()
+    metrics.observe('fetch', 0.02)
+    metrics.observe('fetch', 0.2)
+    metrics.inc('Terra "active"', 'crawled', 3)
+    text = metrics.prometheus_text()
+
+    assert 'crawler_stage_seconds_bucket{stage="fetch",le="0.025"} 1' in text
+    assert 'crawler_stage_seconds_bucket{stage="fetch",le="+Inf"} 2' in text
+    assert 'crawler_stage_seconds_count{stage="fetch"} 2' in text
+    assert 'crawler_events_total{brand="Terra \\"active\\"",event="crawled"} 3' in text
+
+
+def test_serve_prometheus():
+    metrics = CrawlMetrics()
+    metrics.inc("Kica Active", 'crawled')
+    server = metrics.serve_prometheus(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        response = requests.get(f"{url}/metrics")
+        assert response.status_code == 200
+        assert 'crawler_events_total{brand="Kica Active",event="crawled"} 1' in response.text
+        assert requests.get(f"{url}/other").status_code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_crawl_writes_a_snapshot_per_brand(make_crawler, workdir):
+    crawler = make_crawler(metrics_path=str(workdir / "metrics.jsonl"))
+    crawler.crawl_brand('kica')
+    crawler.crawl_brand('blissclub')
+
+    snapshots = [json.loads(line) for line in (workdir / "metrics.jsonl").read_text().splitlines()]
+    assert len(snapshots) == 2
+    counters = snapshots[-1]['counters']
+    assert counters["Kica Active"]['crawled'] == counters["BlissClub"]['crawled'] == 20
+    assert snapshots[-1]['stages']['fetch']['count'] > 0
@@ -0,0 +1,156 @@
+"""Crawl scheduler: result store, driver pool reuse and per-domain concurrency"""
+
+import signal
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from crawl_scheduler import CrawlScheduler, DriverPool, ResultStore
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_result_store():
+    kept, counted = ResultStore(), ResultStore(keep=False)
+    for store in (kept, counted):
+        store.append({'URL': 'a'})
+        store.extend(iter([{'URL': 'b'}, {'URL': 'c'}]))
+
+    assert [r['URL'] for r in kept] == ['a', 'b', 'c']
+    assert kept[1] == {'URL': 'b'}
+    assert (counted.total, len(counted), bool(counted)) == (3, 0, False)
+    kept.clear()
+    assert (kept.total, kept.snapshot()) == (0, [])
+
+
+def test_driver_pool_reuses_and_recycles():
+    created = []
+
+    def factory():
+        created.append(FakeDriver())
+        return created[-1]
+
+    pool = DriverPool(factory, size=2, max_pages=2)
+    for _ in range(3):
+        with pool.driver() as driver:
+            pool.count_page(driver)
+
+    # Reused once, quit after its second page, then replaced
+    assert len(created) == 2
+    assert created[0].quit_called and not created[1].quit_called
+
+    with pytest.raises(RuntimeError):
+        with pool.driver() as driver:
+            raise RuntimeError("wedged")
+    assert driver is created[1] and driver.quit_called
+
+    with pool.driver():
+        pass
+    pool.close()
+    assert all(d.quit_called for d in created)
+
+
+def test_map_urls_caps_each_domain():
+    scheduler = CrawlScheduler(workers=6, per_domain_limit=2)
+    running, peak = {}, {}
+    lock = threading.Lock()
+
+    def visit(url):
+        host = url.split('/')[2]
+        with lock:
+            running[host] = running.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), running[host])
+        time.sleep(0.02)
+        with lock:
+            running[host] -= 1
+        if url.endswith('/bad'):
+            raise ValueError(url)
+        return url
+
+    urls = [f"https://{host}/products/{n}" for host in ('a.com', 'b.com') for n in range(6)] + ["https://a.com/bad"]
+    try:
+        results = scheduler.map_urls(visit, urls)
+    finally:
+        scheduler.shutdown()
+
+    assert results == urls[:-1] + [None]
+    assert peak == {'a.com': 2, 'b.com': 2}
+
+
+def test_run_parallel_runs_every_job():
+    scheduler = CrawlScheduler()
+    done = []
+    barrier = threading.Barrier(3, timeout=5)
+
+    def job(n):
+        # Only passes if all three run at once
+        barrier.wait()
+        done.append(n)
+
+    scheduler.run_parallel([lambda n=n: job(n) for n in range(3)] + [lambda: 1 / 0])
+    assert sorted(done) == [0, 1, 2]
+
+
+def test_busy_hosts_do_not_hold_workers():
+    scheduler = CrawlScheduler(workers=8, per_domain_limit=2)
+    urls = [f"https://{host}.com/products/{n}" for host in 'abcd' for n in range(10)]
+
+    start = time.monotonic()
+    try:
+        scheduler.map_urls(lambda url: time.sleep(0.05), urls)
+    finally:
+        scheduler.shutdown()
+
+    # 4 hosts x 2 slots keep all 8 workers busy: 5 rounds of 50 ms, not one host at a time
+    assert time.monotonic() - start < 0.6
+
+
+def test_cancel_drops_queued_work():
+    scheduler = CrawlScheduler(workers=2, per_domain_limit=1)
+    started, release = [], threading.Event()
+
+    def visit(url):
+        started.append(url)
+        release.wait(5)
+
+    urls = [f"https://a.com/products/{n}" for n in range(20)]
+    crawl = threading.Thread(target=lambda: pytest.raises(CancelledError, scheduler.map_urls, visit, urls))
+    crawl.start()
+    while not started:
+        time.sleep(0.01)
+    scheduler.cancel()
+    release.set()
+    crawl.join(5)
+
+    assert not crawl.is_alive()
+    assert started == urls[:1]
+    with pytest.raises(CancelledError):
+        scheduler.map_urls(visit, urls)
+    assert started == urls[:1]
+
+
+def test_run_parallel_stops_on_ctrl_c():
+    scheduler = CrawlScheduler()
+    release = threading.Event()
+
+    def ctrl_c():
+        time.sleep(0.1)
+        signal.pthread_kill(threading.main_thread().ident, signal.SIGINT)
+
+    start = time.monotonic()
+    with pytest.raises(KeyboardInterrupt):
+        scheduler.run_parallel([lambda: release.wait(5), ctrl_c])
+    release.set()
+
+    # Raised while the other brand was still running, and nothing new starts afterwards
+    assert time.monotonic() - start < 2
+    assert scheduler.cancelled
+    assert scheduler.submit(print, "https://a.com/", "https://a.com/").cancelled()
@@ -0,0 +1,83 @@
+"""Category discovery: products.json paging, the per-category cap and discovered vs crawled counts"""
+
+import pytest
+import requests
+
+from crawl_scheduler import DriverPool
+from crawler_config import BRAND_CONFIGS
+from failures import CrawlError
+from mock_shopify import JSON_PAGE_LIMIT, MockShopifyServer
+
+
+@pytest.fixture
+def store():
+    """One brand with more products than a single products.json page holds"""
+    with MockShopifyServer({'kica': BRAND_CONFIGS['kica']}, products=300) as server:
+        yield server
+
+
+class PageDriver:
+    """Stands in for Chrome: 'renders' a page by fetching its HTML"""
+
+    def get(self, url):
+        self.page_source = requests.get(url).text
+
+    def quit(self):
+        pass
+
+
+def collection(store, handle='all'):
+    return f"{store.base_urls['kica']}/collections/{handle}"
+
+
+def handles(urls):
+    return [url.rsplit('/', 1)[-1] for url in urls]
+
+
+def test_products_json_is_read_past_one_page(make_crawler, store):
+    crawler = make_crawler()
+    found = crawler.discover_category(crawler.brands['kica'], collection(store))
+
+    assert len(store.stores['kica'].products) > JSON_PAGE_LIMIT
+    assert handles(found) == list(store.stores['kica'].products)
+
+
+def test_discovery_stops_at_max_per_category(make_crawler, store):
+    crawler = make_crawler(max_per_category=7)
+    found = crawler.discover_category(crawler.brands['kica'], collection(store))
+    assert handles(found) == list(store.stores['kica'].products)[:7]
+
+
+@pytest.mark.parametrize('cap, pages', [(None, 14), (30, 2)])
+def test_rendered_discovery_follows_pages_up_to_the_cap(make_crawler, store, monkeypatch, cap, pages):
+    crawler = make_crawler(max_per_category=cap)
+    crawler.drivers = DriverPool(PageDriver, size=1)
+    loaded = []
+
+    def load_page(driver, url, ready_selector):
+        loaded.append(url)
+        driver.get(url)
+    monkeypatch.setattr(crawler, 'load_page', load_page)
+    monkeypatch.setattr(crawler, 'scroll_to_end', lambda driver: None)
+
+    links = crawler.render_category(crawler.brands['kica'], collection(store))
+    assert handles(links) == list(store.stores['kica'].products)[:cap]
+    # 24 products per rendered page; the uncapped crawl stops at the first page with nothing new
+    assert len(loaded) == pages
+
+
+def test_counts_compare_discovered_and_crawled(make_crawler, store, monkeypatch, capsys):
+    crawler = make_crawler()
+    json_record = crawler.json_record
+    broken = list(store.stores['kica'].products)[:2]
+
+    def flaky(brand, product, url):
+        if product['handle'] in broken:
+            raise CrawlError("no price", 'other')
+        return json_record(brand, product, url)
+    monkeypatch.setattr(crawler, 'json_record', flaky)
+    crawler.crawl_brand('kica')
+
+    counts = crawler.metrics.counts("Kica Active")
+    assert (counts['discovered'], counts['crawled'], counts['failed']) == (300, 298, 2)
+    assert "✓ Kica Active: 300 products discovered, 298 crawled, 2 failed (2 other)" in capsys.readouterr().out
@@ -0,0 +1,62 @@
+"""Fabric analysis: fiber percentages, aliases, proprietary fabrics, properties and the cache"""
+
+import pytest
+
+from fabric_analysis import FabricAnalyzer, analyze_fabric, parse_fabric, read_records, write_records
+
+
+@pytest.mark.parametrize('text, composition', [
+    ("79% Nylon, 21% Spandex", {'nylon': 79, 'elastane': 21}),
+    ("Nylon 75% / LYCRA® 25%", {'nylon': 75, 'elastane': 25}),
+    ("Polyester: 88.5%, Elastane - 11.5%", {'polyester': 88.5, 'elastane': 11.5}),
+    ("92% recycled polyester 8% elastane", {'polyester': 92, 'elastane': 8}),
+    # The first full blend is the fabric; the lining after it is not added on
+    ("Shell: 80% Polyamide 20% Elastane. Lining: 100% Cotton", {'nylon': 80, 'elastane': 20}),
+    ("Buttery soft fabric", {}),
+])
+def test_composition(text, composition):
+    assert parse_fabric(text).composition == composition
+
+
+def test_fibers_proprietary_and_properties():
+    analysis = parse_fabric("TraqTech™ fabric with Tencel. Moisture-wicking, 4-way stretch and squat proof, UPF 50+")
+    assert analysis.fibers == ('lyocell',)
+    assert analysis.proprietary == ('TraqTech', 'Tencel')
+    assert analysis.properties == ('moisture-wicking', 'four-way stretch', 'squat-proof', 'uv protection')
+
+
+def test_to_fields():
+    fields = parse_fabric("79% Nylon 21% Spandex, quick dry").to_fields()
+    assert fields == {"Fiber Composition": "79% nylon | 21% elastane", "Fibers": "nylon | elastane",
+                      "Proprietary Fabrics": "N/A", "Fabric Properties": "quick-dry"}
+    assert analyze_fabric("N/A").to_fields()["Fiber Composition"] == "N/A"
+
+
+def test_analyzer_caches_by_text():
+    analyzer = FabricAnalyzer(max_entries=2)
+    first = analyzer.analyze("79% Nylon 21% Spandex")
+    assert analyzer.analyze("79% Nylon 21% Spandex") is first
+    analyzer.analyze("100% Cotton")
+    analyzer.analyze("100% Polyester")
+    # Least recently used entry evicted
+    assert analyzer.analyze("79% Nylon 21% Spandex") is not first
+    assert (analyzer.hits, analyzer.misses) == (1, 4)
+    assert analyzer.hit_rate() == 0.2
+
+
+@pytest.mark.parametrize('name', ['records.csv', 'records.json', 'records.jsonl'])
+def test_read_write_records(workdir, name):
+    records = [{"Product Name": "Flow Legging", "Fabric Details": "79% Nylon 21% Spandex"}]
+    path = str(workdir / name)
+    write_records(path, records)
+    assert read_records(path) == records
+
+
+def test_crawled_records_are_analyzed(make_crawler):
+    crawler = make_crawler()
+    crawler.crawl_brand('kica')
+
+    records = crawler.results.snapshot()
+    assert any(r["Fiber Composition"] != "N/A" for r in records)
+    for record in records:
+        assert record["Fiber Composition"] == analyze_fabric(record["Fabric Details"]).composition_text()
@@ -0,0 +1,144 @@
+"""Error classification, retries with backoff and the dead-letter queue"""
+
+import asyncio
+import csv
+import os
+
+import pytest
+import requests
+
+import run_crawler
+from async_fetcher import AsyncFetcher
+from failures import CrawlError, DeadLetterQueue, RetryPolicy, classify_error
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+def http_error(status):
+    return requests.HTTPError(response=Response(status))
+
+
+@pytest.mark.parametrize('error, kind', [
+    (http_error(429), 'blocked'),
+    (http_error(503), 'blocked'),
+    (http_error(500), 'server'),
+    (http_error(404), 'other'),
+    (requests.ConnectTimeout(), 'timeout'),
+    (asyncio.TimeoutError(), 'timeout'),
+    (requests.ConnectionError(), 'network'),
+    (KeyError('price'), 'parse'),
+    (CrawlError("gone", 'other'), 'other'),
+])
+def test_classify_error(error, kind):
+    assert classify_error(error) == kind
+
+
+def test_retry_policy_retries_transient_errors_only():
+    waits = []
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=30.0, sleep=waits.append)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise requests.ConnectionError("reset")
+        return "ok"
+    assert policy.call(flaky) == "ok"
+    assert len(waits) == 2 and 0.5 <= waits[0] <= 1.0 and 1.0 <= waits[1] <= 2.0
+
+    def broken():
+        raise ValueError("bad JSON")
+    with pytest.raises(ValueError) as raised:
+        policy.call(broken)
+    assert raised.value.attempts == 1 and len(waits) == 2
+
+
+def test_retry_policy_gives_up_after_max_attempts():
+    policy = RetryPolicy(max_attempts=2, base_delay=0.0, sleep=lambda delay: None)
+
+    async def down():
+        raise requests.ConnectionError("refused")
+    with pytest.raises(requests.ConnectionError) as raised:
+        asyncio.run(policy.acall(down))
+    assert raised.value.attempts == 2
+
+
+def test_dead_letter_queue_keeps_the_latest_entry_per_url():
+    queue = DeadLetterQueue("failures.jsonl")
+    queue.add("/products/a", "kica", http_error(500))
+    queue.add("/products/a", "kica", requests.ConnectionError("reset"), attempts=3)
+    queue.add("/collections/tops", "kica", http_error(503), entry_type='category')
+
+    entries = queue.entries()
+    assert [(e['url'], e['kind'], e['type']) for e in entries] == [
+        ("/products/a", 'network', 'product'), ("/collections/tops", 'blocked', 'category')]
+    assert queue.summary() == {'network': 1, 'blocked': 1}
+
+
+def test_async_collection_failure_is_dead_lettered_and_retried(make_crawler, monkeypatch):
+    get_collection_products = AsyncFetcher.get_collection_products
+
+    async def leggings_down(fetcher, url, **kwargs):
+        if url.endswith('/leggings'):
+            raise requests.ConnectionError("reset")
+        return await get_collection_products(fetcher, url, **kwargs)
+    monkeypatch.setattr(AsyncFetcher, 'get_collection_products', leggings_down)
+
+    crawler = make_crawler(engine='async')
+    crawler.crawl_brand('kica')
+    [entry] = crawler.failures.entries()
+    assert entry['type'] == 'category' and entry['kind'] == 'network' and entry['url'].endswith('/leggings')
+    assert crawler.metrics.counts('Kica Active')['failed_categories'] == 1
+    crawler.close()
+
+    monkeypatch.setattr(AsyncFetcher, 'get_collection_products', get_collection_products)
+    retry = make_crawler(engine='async')
+    retry.retry_failed()
+    assert len(retry.failures) == 0
+    assert retry.results and all('leggings' in r['Categories'] for r in retry.results)
+
+
+def test_retry_pass_keeps_other_brands_queued(make_crawler, store):
+    kica, bliss = store.base_urls['kica'], store.base_urls['blissclub']
+    kica_product = f"{kica}/products/{next(iter(store.stores['kica'].products))}"
+    bliss_product = f"{bliss}/products/{next(iter(store.stores['blissclub'].products))}"
+    queue = DeadLetterQueue("crawl_failures.jsonl")
+    queue.add(kica_product, 'kica', http_error(500))
+    queue.add(bliss_product, 'blissclub', http_error(503))
+    queue.add(f"{bliss}/products/gone", 'retired-brand', http_error(500))
+
+    crawler = make_crawler()
+    assert crawler.retry_failed(brands=['kica']) == 1
+
+    assert [r['URL'] for r in crawler.results] == [kica_product]
+    assert sorted(e['brand'] for e in queue.entries()) == ['blissclub', 'retired-brand']
+    assert not os.path.exists(queue.retrying_path)
+
+
+def test_retry_pass_keeps_the_interrupted_checkpoint(interrupted_crawl, make_crawler, store):
+    interrupted_crawl('kica', saved=10)
+    failed = f"{store.base_urls['kica']}/products/{list(store.stores['kica'].products)[-1]}"
+    DeadLetterQueue("crawl_failures.jsonl").add(failed, 'kica', http_error(503))
+
+    assert run_crawler.main(['--retry-failed', '--brands', 'kica', '--engine', 'http', '--no-browser-fallback',
+                             '--no-snapshots', '--base-url', f"kica={store.base_urls['kica']}"]) == 0
+    # Only the retried product, not the journal of the interrupted crawl
+    with open("activewear_retried.csv", encoding='utf-8') as f:
+        assert [row['URL'] for row in csv.DictReader(f)] == [failed]
+
+    resumed = make_crawler(resume=True)
+    resumed.crawl_brand('kica')
+    assert len(resumed.results) == 20
+    assert resumed.metrics.counts("Kica Active").get('crawled') == 9
+
+
+def test_missing_product_without_browser_is_dead_lettered(make_crawler, store, monkeypatch):
+    crawler = make_crawler()
+    monkeypatch.setattr(crawler, 'render_product', lambda driver, url: pytest.fail("opened Chrome"))
+    crawler.crawl_product(crawler.brands['kica'], None, f"{store.base_urls['kica']}/products/gone")
+
+    [entry] = crawler.failures.entries()
+    assert (entry['kind'], entry['error']) == ('other', f"Product not found: {store.base_urls['kica']}/products/gone")
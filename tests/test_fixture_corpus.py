@@ -0,0 +1,79 @@
+"""Fixture corpus: recording fetched pages and replaying them offline"""
+
+import gzip
+import importlib.util
+import os
+
+import pytest
+
+from brand_engine import BrandEngine
+from crawler_config import BRAND_CONFIGS
+from fixture_corpus import (COLLECTION_HTML, COLLECTION_JSON, PRODUCT_HTML, PRODUCT_JSON, FixtureRecorder,
+                            classify_url, corpus_brands, full_url, iter_corpus)
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks')
+
+
+@pytest.fixture(scope='module')
+def bench_corpus():
+    spec = importlib.util.spec_from_file_location('bench_corpus', os.path.join(BENCHMARKS, 'bench_corpus.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize('url, kind', [
+    ("https://x.com/collections/leggings", COLLECTION_HTML),
+    ("https://x.com/collections/leggings/products.json?page=2", COLLECTION_JSON),
+    ("https://x.com/products/flow", PRODUCT_HTML),
+    ("https://x.com/products/flow.json", PRODUCT_JSON),
+    ("https://x.com/products/flow.js", PRODUCT_JSON),
+])
+def test_classify_url(url, kind):
+    assert classify_url(url) == kind
+
+
+def test_full_url():
+    assert full_url("https://x.com/c/products.json", {'page': 2}) == "https://x.com/c/products.json?page=2"
+    assert full_url("https://x.com/c?sort=new", {'page': 2}) == "https://x.com/c?sort=new&page=2"
+
+
+def test_record_and_replay(workdir):
+    recorder = FixtureRecorder(str(workdir / "corpus"), {'x.com': 'kica'})
+    recorder.record("https://x.com/collections/all/products.json", 200, {'products': []}, params={'page': 1})
+    recorder.record("https://x.com/products/flow", 200, "<html></html>")
+    recorder.record("https://elsewhere.com/robots.txt", 200, "User-agent: *")
+    recorder.record("https://x.com/products/gone", 404, None)
+    recorder.close()
+
+    # A torn line from an interrupted recording is skipped
+    with gzip.open(workdir / "corpus" / "kica.jsonl.gz", 'at', encoding='utf-8') as f:
+        f.write('{"url": "https://x.com/products/torn", "ki')
+
+    pages = list(iter_corpus(str(workdir / "corpus"), 'kica'))
+    assert [(p['kind'], p['url']) for p in pages] == [
+        (COLLECTION_JSON, "https://x.com/collections/all/products.json?page=1"),
+        (PRODUCT_HTML, "https://x.com/products/flow"),
+    ]
+    assert pages[0]['body'] == '{"products": []}'
+    assert recorder.count == 3
+    assert corpus_brands(str(workdir / "corpus")) == ['kica']
+
+
+def test_recorded_crawl_replays_offline(make_crawler, workdir, bench_corpus):
+    crawler = make_crawler(record_to=str(workdir / "corpus"))
+    crawler.crawl_brand('kica')
+    crawler.close()
+
+    pages = list(iter_corpus(str(workdir / "corpus"), 'kica'))
+    # Discovery read every product from the collections' products.json
+    assert {page['kind'] for page in pages} == {COLLECTION_JSON}
+    totals = bench_corpus.replay_brand(BrandEngine('kica', BRAND_CONFIGS['kica']), pages)
+    assert totals['products'] == len(crawler.results) == 20
+
+
+@pytest.mark.parametrize('key', corpus_brands(os.path.join(BENCHMARKS, 'corpus')))
+def test_shipped_corpus_replays(key, bench_corpus):
+    pages = iter_corpus(os.path.join(BENCHMARKS, 'corpus'), key)
+    totals = bench_corpus.replay_brand(BrandEngine(key, BRAND_CONFIGS[key]), pages)
+    assert (totals['products'], totals['records'], totals['fabric_found']) == (48, 24, 20)
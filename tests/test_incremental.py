@@ -0,0 +1,63 @@
+"""Incremental recrawls: record hashes, unchanged detection and the change export"""
+
+from crawl_state import record_hash
+
+
+def incremental_run(make_crawler):
+    crawler = make_crawler(incremental=True, outputs=['products.csv'])
+    crawler.run_full_crawl(brands=['kica'], changes_file='changes.csv')
+    return crawler
+
+
+def rows(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read().splitlines()[1:]
+
+
+def test_record_hash_ignores_crawl_time():
+    record = {"URL": "/products/a", "Price": "Rs. 999", "Crawled At": "2026-01-01 00:00:00"}
+    assert record_hash(record) == record_hash(dict(record, **{"Crawled At": "2026-02-01 00:00:00"}))
+    assert record_hash(record) != record_hash(dict(record, Price="Rs. 899"))
+
+
+def test_unchanged_products_are_skipped(make_crawler):
+    first = incremental_run(make_crawler)
+    assert first.metrics.counts('Kica Active')['crawled'] == 20
+    assert len(rows('changes.csv')) == 20
+
+    second = incremental_run(make_crawler)
+    counts = second.metrics.counts('Kica Active')
+    assert counts['unchanged'] == 20 and 'crawled' not in counts
+
+
+def test_changes_file_is_rewritten_when_nothing_changed(make_crawler):
+    incremental_run(make_crawler)
+    incremental_run(make_crawler)
+    incremental_run(make_crawler)
+    assert rows('changes.csv') == []
+
+
+def test_changed_product_is_exported(make_crawler, store):
+    incremental_run(make_crawler)
+    product = next(iter(store.stores['kica'].products.values()))
+    product['updated_at'] = "2026-06-01T00:00:00+05:30"
+    for variant in product['variants']:
+        variant['price'] = "1.00"
+
+    incremental_run(make_crawler)
+    changed = rows('changes.csv')
+    assert len(changed) == 1 and product['handle'] in changed[0]
+
+
+def test_unchanged_run_still_exports_every_product(make_crawler, store):
+    first = incremental_run(make_crawler)
+    exported = sorted(rows('products.csv'))
+    assert len(exported) == 20
+
+    second = incremental_run(make_crawler)
+    assert second.metrics.counts('Kica Active')['unchanged'] == 20
+    # Stored records stand in for the unchanged products: same rows, same typed variants
+    assert sorted(rows('products.csv')) == exported
+    variants = {r['URL']: r['Variants'] for r in first.results}
+    assert {r['URL']: r['Variants'] for r in second.results} == variants
+    assert rows('changes.csv') == []
@@ -0,0 +1,87 @@
+"""Per-host pacing: token bucket, circuit breaker, adaptive rate and robots.txt crawl-delay"""
+
+import pytest
+
+from mock_shopify import MockShopifyServer
+from pacing import AdaptivePacer, parse_retry_after
+from robots import RobotRules, RobotsCache
+
+URL = "https://kicaactive.com/products/flow"
+
+
+def test_burst_then_rate():
+    pacer = AdaptivePacer(rate=10, burst=3)
+    waits = [pacer.reserve(URL) for _ in range(5)]
+
+    assert waits[:3] == [0, 0, 0]
+    # Each request past the burst queues 1/rate behind the one before
+    assert waits[3] == pytest.approx(0.1, abs=0.01)
+    assert waits[4] == pytest.approx(0.2, abs=0.01)
+    assert pacer.delay_for(URL) == pytest.approx(0.3, abs=0.01)
+
+
+def test_hosts_are_paced_separately():
+    pacer = AdaptivePacer(rate=10, burst=1)
+    pacer.reserve(URL)
+    assert pacer.reserve("https://blissclub.com/products/flow") == 0
+    assert pacer.reserve(URL) > 0
+
+
+def test_circuit_breaker():
+    pacer = AdaptivePacer(rate=8, burst=4, cooldown=1.0, max_delay=3.0)
+    pacer.record(URL, 429, 0.1, retry_after=2)
+    assert pacer.delay_for(URL) == pytest.approx(2 + 1 / 4, abs=0.05)
+    assert pacer._bucket(URL).rate == 4
+
+    # Consecutive trips double the cooldown, up to max_delay
+    pacer.record(URL, 503, 0.1)
+    pacer.record(URL, 503, 0.1)
+    assert pacer.delay_for(URL) <= 3 + 1 / 1 + 0.05
+    assert pacer.should_retry(503) and not pacer.should_retry(500)
+
+
+def test_rate_adapts_to_latency():
+    pacer = AdaptivePacer(rate=8, slow_threshold=1.0)
+    pacer.record(URL, 200, 2.0)
+    assert pacer._bucket(URL).rate == pytest.approx(8 / 1.5)
+    for _ in range(10):
+        pacer.record(URL, 200, 0.1)
+    # Fast responses bring it back, never above the ceiling
+    assert pacer._bucket(URL).rate == 8
+
+
+def test_robots_crawl_delay_caps_the_rate():
+    with MockShopifyServer(products=1, crawl_delay=0.5) as server:
+        robots = RobotsCache("test-agent")
+        pacer = AdaptivePacer(rate=10, burst=5, robots=robots)
+        url = f"{server.base_urls['kica']}/products/x"
+        waits = [pacer.reserve(url) for _ in range(2)]
+        requests = server.stats()['kica']['requests']
+
+    assert waits == [0, pytest.approx(0.5, abs=0.01)]
+    assert robots.crawl_delay(url) == 0.5
+    assert requests == 1
+
+
+def test_missing_robots_txt_sets_no_delay():
+    robots = RobotsCache("test-agent", timeout=1)
+    # Nothing listens on port 9 of localhost
+    assert robots.crawl_delay("http://127.0.0.1:9/products/x") is None
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2026 07:28:00 GMT") is None
+    assert parse_retry_after(None) is None
+
+
+def test_crawl_delay_groups():
+    rules = RobotRules("https://x.com/robots.txt")
+    rules.parse(["User-agent: slowbot", "User-agent: other", "Crawl-delay: 2.5", "",
+                 "User-agent: *", "Crawl-delay: 0.25  # be gentle", "Disallow: /cart"])
+    rules.modified()
+
+    assert rules.crawl_delay("SlowBot/1.0") == 2.5
+    assert rules.crawl_delay("other") == 2.5
+    assert rules.crawl_delay("Mozilla/5.0") == 0.25
+    assert not rules.can_fetch("Mozilla/5.0", "https://x.com/cart")
@@ -0,0 +1,50 @@
+"""Parse pipeline: extraction in worker processes, in submission order, same records as inline parsing"""
+
+import os
+
+import pytest
+
+from crawler_config import BRAND_CONFIGS
+from mock_shopify import MockShopifyServer
+from parse_pipeline import ParsePipeline
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+COMPARED_FIELDS = ["Product Name", "Price", "Fabric Details", "Description", "Categories", "Variants"]
+
+
+def test_records_come_back_in_submission_order():
+    pipeline = ParsePipeline(BRAND_CONFIGS, processes=1, queue_size=2)
+    records, errors = [], []
+    try:
+        for key in sorted(BRAND_CONFIGS):
+            with open(os.path.join(FIXTURES, f"{key}_product.html"), encoding='utf-8') as f:
+                html = f.read()
+            pipeline.submit(key, f"/products/{key}", html, records.append)
+        pipeline.submit('unknown', "/products/x", "<html></html>", records.append, on_error=errors.append)
+        pipeline.drain()
+    finally:
+        pipeline.close()
+
+    assert [r['URL'] for r in records] == [f"/products/{key}" for key in sorted(BRAND_CONFIGS)]
+    assert all(r['Fabric Details'] != "N/A" for r in records)
+    assert [type(e) for e in errors] == [KeyError]
+
+
+@pytest.fixture
+def store():
+    """No fabric in the JSON, so every product's page is fetched and parsed"""
+    with MockShopifyServer(products=20, fabric_in_json=0) as server:
+        yield server
+
+
+def test_parse_workers_match_inline_parsing(make_crawler):
+    def crawl(processes):
+        crawler = make_crawler(engine='async', browser_fallback=True, parse_processes=processes,
+                               checkpoint_dir=f"checkpoint_{processes}", snapshot_db=False)
+        crawler.crawl_brand('kica')
+        return {r['URL']: {field: r[field] for field in COMPARED_FIELDS} for r in crawler.results}
+
+    inline, workers = crawl(0), crawl(1)
+    assert len(workers) == 20
+    assert workers == inline
+    assert all(r['Fabric Details'] != "N/A" for r in workers.values())
@@ -0,0 +1,64 @@
+"""Parser backends: every backend extracts the same records as html.parser"""
+
+import os
+
+import pytest
+import requests
+
+from brand_engine import BrandEngine
+from crawler_config import BRAND_CONFIGS
+from parsers import PARSER_BACKENDS, get_parser
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+COMPARED_FIELDS = ["Product Name", "Price", "Fabric Details", "Description", "Variants"]
+
+# "Fabric" inside a script, inline with the percentages and again in an accordion panel
+EDGE_CASES = """<html><body><h1 class="product-title">Edge Tank</h1><span class="price">Rs. 899</span>
+<script>var label = "Fabric";</script>
+<div class="product-description"><p>Fabric: 88% Polyester, 12% Elastane.</p></div>
+<div class="accordion"><div class="accordion__item">Fabric care: machine wash cold</div></div>
+</body></html>"""
+
+
+def engine(key, parser, **overrides):
+    if parser == 'selectolax':
+        pytest.importorskip('selectolax')
+    return BrandEngine(key, dict(BRAND_CONFIGS[key], **overrides), parser=parser)
+
+
+def extract(engine, html):
+    record = engine.parse_product(engine.parse(html), "u", html)
+    return {field: record[field] for field in COMPARED_FIELDS}
+
+
+@pytest.mark.parametrize('parser', [name for name in PARSER_BACKENDS if name != 'html.parser'])
+@pytest.mark.parametrize('key', sorted(BRAND_CONFIGS))
+def test_backends_agree_on_fixtures(key, parser):
+    with open(os.path.join(FIXTURES, f"{key}_product.html"), encoding='utf-8') as f:
+        html = f.read()
+    assert extract(engine(key, parser), html) == extract(engine(key, 'html.parser'), html)
+
+
+@pytest.mark.parametrize('parser', [name for name in PARSER_BACKENDS if name != 'html.parser'])
+@pytest.mark.parametrize('key', ['blissclub', 'kica'])
+def test_backends_agree_on_edge_cases(key, parser):
+    assert extract(engine(key, parser), EDGE_CASES) == extract(engine(key, 'html.parser'), EDGE_CASES)
+
+
+@pytest.mark.parametrize('parser', list(PARSER_BACKENDS))
+def test_backends_on_mock_pages(store, parser):
+    base_url = store.base_urls['terractive']
+    brand = engine('terractive', parser, base_url=base_url)
+    reference = engine('terractive', 'html.parser', base_url=base_url)
+
+    html = requests.get(f"{base_url}/collections/all").text
+    links = brand.product_links(brand.parse(html))
+    assert links == reference.product_links(reference.parse(html))
+
+    html = requests.get(links[-1]).text
+    assert extract(brand, html) == extract(reference, html)
+    assert extract(brand, html)["Fabric Details"] != "N/A"
+
+
+def test_backends_are_shared():
+    assert get_parser('lxml') is get_parser('lxml')
@@ -0,0 +1,53 @@
+"""Streaming sinks: CSV headers, JSON arrays, gzip and product/variant rows"""
+
+import csv
+import gzip
+import json
+
+from crawler_config import OUTPUT_FIELDS
+from record_sinks import SinkPipeline, export_fields
+from variants import Variant
+
+RECORD = {
+    "Brand": "Kica Active", "Product Name": "Flow Legging", "Price": "Rs. 1,299", "Fabric Details": "79% Nylon",
+    "Description": "N/A", "URL": "https://kica.example/products/flow-legging", "Crawled At": "2026-01-01 00:00:00",
+    "Variants": (Variant(1, "K-1-S", "S / Black", "S", "Black", 1299.0, None, True),
+                 Variant(2, "K-1-M", "M / Black", "M", "Black", 1299.0, None, False)),
+}
+
+
+def read_csv(path, opener=open):
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        return list(csv.reader(f))
+
+
+def test_empty_export_is_header_only():
+    SinkPipeline.from_paths(['products.csv', 'products.json', 'products.jsonl']).close()
+
+    assert read_csv('products.csv') == [OUTPUT_FIELDS]
+    with open('products.json', encoding='utf-8') as f:
+        assert json.load(f) == []
+    with open('products.jsonl', encoding='utf-8') as f:
+        assert f.read() == ""
+
+
+def test_variant_rows_with_header(workdir):
+    sinks = SinkPipeline.from_paths(['variants.csv.gz'], rows='variant')
+    sinks.write(RECORD)
+    sinks.close()
+
+    header, *rows = read_csv('variants.csv.gz', gzip.open)
+    assert header == export_fields('variant')
+    assert 'Sizes' not in header and header[-1] == 'Availability'
+    assert [row[header.index('SKU')] for row in rows] == ["K-1-S", "K-1-M"]
+    assert [row[header.index('Availability')] for row in rows] == ["In stock", "Sold out"]
+
+
+def test_product_row_summarizes_variants():
+    sinks = SinkPipeline.from_paths(['products.csv'])
+    sinks.write(RECORD)
+    sinks.close()
+
+    header, row = read_csv('products.csv')
+    product = dict(zip(header, row))
+    assert product['Sizes'] == "S | M" and product['In Stock Variants'] == "1"
@@ -0,0 +1,49 @@
+"""Command-line runner: config overrides, exit codes and a single close()"""
+
+import json
+
+import pytest
+
+import run_crawler
+from crawler_config import CRAWL_CONFIG
+
+
+def cli(store, *args):
+    return run_crawler.main(['--brands', 'kica', '--engine', 'http', '--no-browser-fallback',
+                             '--base-url', f"kica={store.base_urls['kica']}", *args])
+
+
+def test_crawl_exits_zero(store):
+    assert cli(store, '-o', 'products.csv') == 0
+    with open('products.csv', encoding='utf-8') as f:
+        assert len(f.read().splitlines()) == 21
+
+
+def test_close_runs_once(store):
+    assert cli(store, '--metrics-jsonl', 'metrics.jsonl') == 0
+    with open('metrics.jsonl', encoding='utf-8') as f:
+        snapshots = [json.loads(line) for line in f]
+    # One snapshot after the brand, one at close() - not a second from main()'s own close()
+    assert len(snapshots) == 2
+
+
+def test_config_file_overrides(store, workdir):
+    (workdir / 'nightly.json').write_text(json.dumps({'max_products_per_category': 5}))
+    assert cli(store, '--config', 'nightly.json') == 0
+    assert CRAWL_CONFIG['max_products_per_category'] == 5
+
+
+def test_bad_config_exits_two(store, workdir):
+    (workdir / 'broken.json').write_text("{not json")
+    assert cli(store, '--config', 'broken.json') == 2
+
+
+def test_records_are_held_only_for_parquet(store, workdir):
+    for args, keep in ((['-o', 'products.csv'], False), (['--parquet', 'dataset'], True)):
+        crawler = run_crawler.create_crawler(run_crawler.build_parser().parse_args(args), store.base_urls)
+        crawler.close()
+        assert crawler.results.keep is keep
+
+    pytest.importorskip('pyarrow')
+    assert cli(store, '--parquet', 'dataset') == 0
+    assert len(list((workdir / 'dataset').rglob('*.parquet'))) == 1
@@ -0,0 +1,71 @@
+"""Shopify JSON client: product endpoints, collection paging and record conversion"""
+
+from bs4 import BeautifulSoup
+
+from mock_shopify import MockShopifyServer
+from pacing import AdaptivePacer
+from shopify_client import ShopifyClient, extract_fabric_from_soup, format_price, product_to_record
+
+FABRIC_KEYWORDS = ["fabric", "material", "composition"]
+
+
+def product_url(store, key='kica'):
+    handle = next(iter(store.stores[key].products))
+    return f"{store.base_urls[key]}/products/{handle}", store.stores[key].products[handle]
+
+
+def test_fetch_product_json(store):
+    url, product = product_url(store)
+    status, fetched, _, _ = ShopifyClient().fetch_product(url + "?variant=1")
+
+    assert status == 200
+    assert (fetched['id'], fetched['title']) == (product['id'], product['title'])
+
+
+def test_fetch_missing_product(store):
+    status, fetched, _, _ = ShopifyClient().fetch_product(f"{store.base_urls['kica']}/products/not-a-product")
+    assert (status, fetched) == (404, None)
+
+
+def test_collection_pages_are_followed(store):
+    collection = f"{store.base_urls['kica']}/collections/all"
+    products = list(ShopifyClient().iter_collection_products(collection, limit=7))
+    assert [p['handle'] for p in products] == list(store.stores['kica'].products)
+
+
+def test_throttled_requests_are_retried():
+    with MockShopifyServer(products=5, throttle_every=2, throttle_burst=1, retry_after=0) as server:
+        client = ShopifyClient(pacer=AdaptivePacer(rate=500, burst=100, cooldown=0.01))
+        url, product = product_url(server)
+        products = [client.get_product(url) for _ in range(3)]
+        stats = server.stats()['kica']
+
+    assert [p['id'] for p in products] == [product['id']] * 3
+    assert stats[429] >= 1
+
+
+def test_product_to_record():
+    product = {
+        'title': " Flow Legging ",
+        'body_html': "<p>Made for yoga.</p><h4>Fabric</h4><ul><li>79% Nylon</li><li>21% Spandex</li></ul>",
+        'variants': [{'id': 1, 'title': 'S', 'option1': 'S', 'price': "1299.00"}],
+        'options': [{'name': 'Size'}],
+    }
+    record = product_to_record("Kica Active", product, "https://kicaactive.com/products/flow", FABRIC_KEYWORDS)
+
+    assert record["Product Name"] == "Flow Legging"
+    assert record["Price"] == "Rs. 1,299"
+    assert record["Fabric Details"] == "79% Nylon | 21% Spandex"
+    assert record["Description"].startswith("Made for yoga.")
+    assert [v.size for v in record["Variants"]] == ["S"]
+
+
+def test_record_without_description():
+    record = product_to_record("Kica Active", {'title': "Gift Card"}, "https://kicaactive.com/products/gift", FABRIC_KEYWORDS)
+    assert (record["Price"], record["Fabric Details"], record["Description"]) == ("N/A", "N/A", "N/A")
+
+
+def test_fabric_in_running_text_and_js_prices():
+    soup = BeautifulSoup("<p>Soft and stretchy. 75% polyester 25% elastane.</p>", 'html.parser')
+    assert extract_fabric_from_soup(soup, ["fabric"]) == "75% polyester 25% elastane"
+    assert format_price({'variants': [{'price': 129900}]}) == "Rs. 1,299"
@@ -0,0 +1,87 @@
+"""Sitemap discovery: streamed parsing, index entries, .xml.gz and <lastmod>"""
+
+import gzip
+import io
+from datetime import datetime, timezone
+
+import requests
+
+from robots import RobotsCache
+from shopify_client import ShopifyClient
+from sitemap import SitemapReader, iter_entries, parse_lastmod
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+  <url><loc>https://x.com/products/a</loc><lastmod>2026-01-02T10:00:00+05:30</lastmod>
+    <image:image><image:loc>https://cdn.x.com/a.jpg</image:loc></image:image></url>
+  <url><loc> https://x.com/products/b </loc></url>
+  <url><lastmod>2026-01-03</lastmod></url>
+</urlset>"""
+
+INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://x.com/sitemap_products_1.xml.gz</loc></sitemap>
+  <sitemap><loc>https://x.com/sitemap_pages_1.xml</loc></sitemap>
+</sitemapindex>"""
+
+
+class FakeClient:
+    """Serves sitemap bodies from a dict, like ShopifyClient.get(stream=True)"""
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.fetched = []
+
+    def get(self, url, **kwargs):
+        self.fetched.append(url)
+        response = requests.Response()
+        response.url = url
+        response.status_code = 200 if url in self.bodies else 404
+        response.raw = io.BytesIO(self.bodies.get(url, b""))
+        return response
+
+
+def test_iter_entries_skips_image_locs_and_entries_without_loc():
+    entries = list(iter_entries(io.BytesIO(URLSET)))
+    assert entries == [("url", "https://x.com/products/a", "2026-01-02T10:00:00+05:30"),
+                       ("url", "https://x.com/products/b", None)]
+
+
+def test_iter_entries_reads_index_entries():
+    kinds = [(kind, loc) for kind, loc, _ in iter_entries(io.BytesIO(INDEX))]
+    assert kinds == [("sitemap", "https://x.com/sitemap_products_1.xml.gz"),
+                     ("sitemap", "https://x.com/sitemap_pages_1.xml")]
+
+
+def test_parse_lastmod():
+    assert parse_lastmod("2026-01-02T10:00:00Z") == datetime(2026, 1, 2, 10, tzinfo=timezone.utc)
+    assert parse_lastmod("2026-01-02").tzinfo == timezone.utc
+    assert parse_lastmod("2026-01-02T10:00:00+05:30").utcoffset().total_seconds() == 5.5 * 3600
+    assert parse_lastmod("yesterday") is None
+    assert parse_lastmod(None) is None
+
+
+def test_reader_follows_product_sitemaps_and_gunzips():
+    client = FakeClient({"https://x.com/sitemap.xml": INDEX,
+                         "https://x.com/sitemap_products_1.xml.gz": gzip.compress(URLSET)})
+    products = SitemapReader(client).product_urls("https://x.com/")
+
+    assert products == {"https://x.com/products/a": "2026-01-02T10:00:00+05:30", "https://x.com/products/b": None}
+    # Only product sitemaps are followed from the index
+    assert "https://x.com/sitemap_pages_1.xml" not in client.fetched
+
+
+def test_reader_without_sitemap():
+    assert SitemapReader(FakeClient({})).product_urls("https://x.com") is None
+
+
+def test_reader_against_mock_store(store):
+    base_url = store.base_urls['kica']
+    client = ShopifyClient()
+    reader = SitemapReader(client, robots=RobotsCache(client.session.headers['User-Agent']))
+
+    products = reader.product_urls(base_url)
+    catalog = store.stores['kica'].products
+    assert set(products) == {f"{base_url}/products/{handle}" for handle in catalog}
+    assert all(products[f"{base_url}/products/{h}"] == p['updated_at'] for h, p in catalog.items())
+    assert len(reader.product_urls(base_url, limit=5)) == 5
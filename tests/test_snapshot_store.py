@@ -0,0 +1,89 @@
+"""Crawl history: snapshots, change log and crawl-to-crawl diffs"""
+
+import pytest
+
+from snapshot_store import SnapshotStore, parse_price
+
+
+def record(url, price="Rs. 1,299", name="Flow Legging"):
+    return {"Brand": "Kica Active", "Product Name": name, "URL": url, "Price": price,
+            "Categories": "leggings", "Crawled At": "2026-01-01 00:00:00"}
+
+
+@pytest.fixture
+def snapshots(workdir):
+    store = SnapshotStore(str(workdir / "snapshots.db"))
+    yield store
+    store.close()
+
+
+def crawl(store, *records):
+    crawl_id = store.start_crawl()
+    for r in records:
+        store.add(r)
+    store.finish_crawl()
+    return crawl_id
+
+
+def test_parse_price():
+    assert parse_price("Rs. 1,299") == 1299.0
+    assert parse_price("₹999.50") == 999.5
+    assert parse_price("N/A") is None
+
+
+def test_diff_reports_added_removed_and_price(snapshots):
+    first = crawl(snapshots, record("/products/a"), record("/products/b"))
+    second = crawl(snapshots, record("/products/a", price="Rs. 999"), record("/products/c"))
+
+    changes = {(row["Change"], row["URL"]) for row in snapshots.diff(first, second)}
+    assert changes == {("price", "/products/a"), ("removed", "/products/b"), ("added", "/products/c")}
+    assert [c['field'] for c in snapshots.changes(field='price', category='leggings')] == ['price']
+
+
+def test_latest_crawl_skips_unfinished(snapshots):
+    finished = crawl(snapshots, record("/products/a"))
+    snapshots.start_crawl()
+    snapshots.add(record("/products/a"))
+
+    assert snapshots.latest_crawl() == finished
+    assert snapshots.latest_crawl(before=snapshots.crawl_id) == finished
+
+
+def test_resume_latest_reopens_the_interrupted_crawl(snapshots):
+    crawl(snapshots, record("/products/a"))
+    interrupted = snapshots.start_crawl()
+    snapshots.add(record("/products/a"))
+
+    resumed = SnapshotStore(snapshots.path)
+    assert resumed.resume_latest() == interrupted
+    resumed.add(record("/products/b"))
+    resumed.finish_crawl()
+    resumed.close()
+
+    assert [c['products'] for c in snapshots.crawls()] == [1, 2]
+
+
+def test_resumed_crawl_is_diffed_as_one(make_crawler, interrupted_crawl):
+    make_crawler().run_full_crawl(brands=['kica'])
+    interrupted_crawl('kica', saved=10)
+
+    resumed = make_crawler(resume=True)
+    resumed.run_full_crawl(brands=['kica'])
+
+    crawls = SnapshotStore("activewear_snapshots.db").crawls()
+    assert [c['products'] for c in crawls] == [20, 20]
+    assert all(c['finished_at'] for c in crawls)
+    with open("activewear_diff.csv", encoding='utf-8') as f:
+        assert len(f.read().splitlines()) <= 1
+
+
+def test_fresh_crawl_after_a_killed_one_diffs_against_the_last_finished(make_crawler):
+    make_crawler().run_full_crawl(brands=['kica'])
+    killed = make_crawler()
+    killed.snapshots.add(record(f"{killed.brands['kica'].base_url}/products/flow-legging-2"))
+    killed.snapshots = None
+
+    crawler = make_crawler()
+    crawler.run_full_crawl(brands=['kica'])
+    with open("activewear_diff.csv", encoding='utf-8') as f:
+        assert len(f.read().splitlines()) <= 1
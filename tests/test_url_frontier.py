@@ -0,0 +1,45 @@
+"""URL frontier: canonical product URLs and one crawl per product across collections"""
+
+import pytest
+
+from url_frontier import UrlFrontier, canonical_product_url, collection_name
+
+
+@pytest.mark.parametrize('url', [
+    "https://kicaactive.com/products/flow",
+    "https://KicaActive.com/products/flow/",
+    "https://kicaactive.com/products/flow?variant=123#reviews",
+    "https://kicaactive.com/collections/leggings/products/flow",
+    "//kicaactive.com/collections/all/products/flow?ref=grid",
+    "/collections/leggings/products/flow",
+])
+def test_canonical_product_url(url):
+    assert canonical_product_url(url, "https://kicaactive.com/") == "https://kicaactive.com/products/flow"
+
+
+def test_collection_name():
+    assert collection_name("https://kicaactive.com/collections/sports-bras/") == "sports-bras"
+    assert collection_name("https://kicaactive.com/sitemap_products_1.xml") == "all"
+
+
+def test_frontier_hands_out_each_product_once():
+    frontier = UrlFrontier()
+    assert frontier.add_all(["/products/a", "/products/b"], "https://x.com/collections/all") == ["/products/a", "/products/b"]
+    assert frontier.add_all(["/products/b", "/products/c"], "https://x.com/collections/leggings") == ["/products/c"]
+    assert not frontier.add("/products/b", "https://x.com/collections/leggings")
+
+    assert len(frontier) == 3
+    assert "/products/c" in frontier
+    assert frontier.categories_of("/products/b") == ["all", "leggings"]
+    assert frontier.categories_of("/products/z") == []
+
+
+def test_crawl_extracts_each_product_once(make_crawler, store):
+    crawler = make_crawler()
+    crawler.crawl_brand('kica')
+
+    records = crawler.results.snapshot()
+    urls = [r['URL'] for r in records]
+    assert len(urls) == len(set(urls)) == len(store.stores['kica'].products)
+    # Found in /collections/all and at least one other collection, listed in both
+    assert all(r['Categories'].startswith('all | ') for r in records)
@@ -0,0 +1,85 @@
+"""Product variants: options from product JSON and pages, compact tuples and export rows"""
+
+import json
+
+from variants import (Variant, as_variants, export_rows, format_amount, parse_amount, summarize,
+                      variants_from_html, variants_from_product)
+
+PRODUCT = {
+    'options': [{'name': 'Colour'}, {'name': 'Size'}],
+    'variants': [
+        {'id': 1, 'sku': 'FL-BLK-S', 'title': 'Black / S', 'option1': 'Black', 'option2': 'S',
+         'price': '1299.00', 'compare_at_price': '1599.00', 'available': True},
+        {'id': 2, 'sku': '', 'title': 'Black / M', 'option1': 'Black', 'option2': 'M',
+         'price': '1299.00', 'compare_at_price': None, 'available': False},
+    ],
+}
+
+
+def test_variants_from_product_json():
+    small, medium = variants_from_product(PRODUCT)
+    assert small == Variant(1, 'FL-BLK-S', 'Black / S', 'S', 'Black', 1299.0, 1599.0, True)
+    assert (medium.sku, medium.size, medium.compare_at_price, medium.available) == (None, 'M', None, False)
+
+
+def test_variants_without_option_names_guess_the_size():
+    variants = variants_from_product({'variants': [{'title': 'Navy / XL', 'price': 129900}]})
+    assert (variants[0].size, variants[0].colour, variants[0].price) == ('XL', 'Navy', 1299.0)
+
+
+def test_variants_from_embedded_product_json():
+    html = f"<html><script type='application/json' data-product-json>{json.dumps({'product': PRODUCT})}</script></html>"
+    assert variants_from_html(html) == variants_from_product(PRODUCT)
+
+
+def test_variants_from_json_ld_offers():
+    ld = {'@type': 'Product', 'name': 'Flow Legging', 'offers': [
+        {'name': 'Flow Legging - L', 'sku': 'FL-L', 'price': 999, 'availability': 'https://schema.org/InStock'}]}
+    html = f"<script type='application/ld+json'>{json.dumps(ld)}</script>"
+    (variant,) = variants_from_html(html)
+    assert (variant.sku, variant.title, variant.size, variant.price, variant.available) == ('FL-L', 'L', 'L', 999.0, True)
+
+
+def test_variants_from_page_without_product_data():
+    assert variants_from_html("<html><body>Flow Legging</body></html>") == ()
+    assert variants_from_html(None) == ()
+
+
+def test_as_variants_round_trips_json():
+    variants = variants_from_product(PRODUCT)
+    assert as_variants(json.loads(json.dumps(variants))) == variants
+    assert as_variants(None) == ()
+
+
+def test_amounts():
+    assert parse_amount("1,299.00") == 1299.0
+    assert parse_amount(129950) == 1299.5
+    assert parse_amount("") is None
+    assert format_amount(1299.0) == "Rs. 1,299"
+    assert format_amount(1299.5) == "Rs. 1,299.50"
+    assert format_amount(None) == "N/A"
+
+
+def test_export_rows():
+    record = {"Product Name": "Flow Legging", "Variants": variants_from_product(PRODUCT)}
+
+    (row,) = export_rows(record)
+    assert "Variants" not in row
+    assert row == {"Product Name": "Flow Legging", **summarize(record["Variants"])}
+    assert (row["Sizes"], row["Colours"], row["Variant Count"], row["In Stock Variants"]) == ("S | M", "Black", 2, 1)
+
+    rows = export_rows(record, rows='variant')
+    assert [(r["SKU"], r["Size"], r["Availability"]) for r in rows] == [("FL-BLK-S", "S", "In stock"), ("N/A", "M", "Sold out")]
+    assert rows[1]["Compare At Price"] == "N/A"
+    # A product without variants still gets its row
+    assert [r["Variant ID"] for r in export_rows({"Product Name": "Gift Card"}, rows='variant')] == ["N/A"]
+
+
+def test_crawled_records_carry_their_variants(make_crawler, store):
+    crawler = make_crawler()
+    crawler.crawl_brand('kica')
+
+    catalog = store.stores['kica'].products
+    for record in crawler.results.snapshot():
+        product = catalog[record['URL'].rsplit('/', 1)[-1]]
+        assert [v.id for v in record['Variants']] == [v['id'] for v in product['variants']]
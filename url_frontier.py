@@ -0,0 +1,78 @@
+"""
+URL Frontier for Activewear Crawler
+Canonical product URLs, one global seen-set, and the collections each product was found in
+"""
+
+import threading
+from urllib.parse import urlsplit
+
+
+def canonical_product_url(url, base_url=None):
+    """
+    One URL per product, however the page linked to it
+    /collections/leggings/products/flow?variant=123#reviews -> https://<host>/products/flow
+    """
+    url = url.strip()
+    if url.startswith('//'):
+        url = 'https:' + url
+    elif not url.startswith('http') and base_url:
+        url = f"{base_url.rstrip('/')}/{url.lstrip('/')}"
+
+    parts = urlsplit(url)
+    path = parts.path.rstrip('/')
+    index = path.find('/products/')
+    if index != -1:
+        # Drop collection prefixes: /collections/x/products/y -> /products/y
+        path = path[index:]
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}{path}"
+
+
+def collection_name(category_url):
+    """https://kicaactive.com/collections/sports-bras -> sports-bras"""
+    path = urlsplit(category_url).path.rstrip('/')
+    if path.endswith(('.xml', '.xml.gz')):
+        # A sitemap lists the whole catalog, like /collections/all
+        return 'all'
+    return path.rsplit('/', 1)[-1] or category_url
+
+
+class UrlFrontier:
+    """
+    Every product URL discovered in this crawl, across all brands and categories
+    Each product is handed out for crawling once; later categories only add to its membership.
+    """
+
+    def __init__(self):
+        self._categories = {}
+        self._lock = threading.Lock()
+
+    def add(self, url, category_url):
+        """Record that a category lists a product; True if the product was not seen before"""
+        with self._lock:
+            return self._add(url, collection_name(category_url))
+
+    def add_all(self, urls, category_url):
+        """Record a category's products; returns the ones not seen before, in order"""
+        name = collection_name(category_url)
+        with self._lock:
+            return [url for url in urls if self._add(url, name)]
+
+    def _add(self, url, name):
+        categories = self._categories.get(url)
+        if categories is None:
+            self._categories[url] = [name]
+            return True
+        if name not in categories:
+            categories.append(name)
+        return False
+
+    def categories_of(self, url):
+        """Collections a product was found in, in discovery order"""
+        with self._lock:
+            return list(self._categories.get(url, ()))
+
+    def __contains__(self, url):
+        return url in self._categories
+
+    def __len__(self):
+        return len(self._categories)
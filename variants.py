@@ -0,0 +1,203 @@
+"""
+Product Variants for Activewear Crawler
+Size, colour, price, SKU and stock per variant - kept as compact tuples, expanded into export rows only when written
+"""
+
+import json
+import re
+from collections import namedtuple
+
+VARIANT_FIELDS = ('id', 'sku', 'title', 'size', 'colour', 'price', 'compare_at_price', 'available')
+
+# Export modes: one row per product (variants summarized) or one row per variant
+EXPORT_ROWS = ('product', 'variant')
+
+SIZE_OPTION_RE = re.compile(r'size', re.IGNORECASE)
+COLOUR_OPTION_RE = re.compile(r'colou?r|shade', re.IGNORECASE)
+SIZE_VALUE_RE = re.compile(r'^(?:\d*X{0,3}[SML]|XXS|\d{1,2}(?:/\d{1,2})?|free size|one size)$', re.IGNORECASE)
+
+# Product data themes embed in the page: <script data-product-json> / id="ProductJson-...",
+# ShopifyAnalytics' "var meta = {...};" and schema.org Product offers
+PRODUCT_JSON_RE = re.compile(
+    r'<script[^>]*(?:data-product-json|id=["\']ProductJson[^"\']*["\'])[^>]*>(.*?)</script>', re.IGNORECASE | re.DOTALL)
+META_JSON_RE = re.compile(r'var meta\s*=\s*(\{.*?\});\s*(?:\n|for|var|</script>)', re.DOTALL)
+LD_JSON_RE = re.compile(r'<script[^>]*application/ld\+json[^>]*>(.*?)</script>', re.IGNORECASE | re.DOTALL)
+
+
+class Variant(namedtuple('Variant', VARIANT_FIELDS)):
+    """
+    One purchasable variant of a product
+    A tuple with no per-instance dict, so ~10 per product stay cheap at full-catalog scale. It is written to
+    JSON (checkpoint journal, crawl state) as an array; as_variants() turns such arrays back into Variants.
+    """
+
+    __slots__ = ()
+
+
+def as_variants(value):
+    """Variants from a record's "Variants" value - Variant tuples, or JSON arrays read back from disk"""
+    return tuple(v if isinstance(v, Variant) else Variant(*v) for v in value or ())
+
+
+# ==================== PRICES ====================
+def parse_amount(raw):
+    """.json endpoints give rupee strings ("1299.00"), .js endpoints and page JSON give paise integers (129900)"""
+    if raw in (None, ''):
+        return None
+    if isinstance(raw, int):
+        return raw / 100
+    try:
+        return float(str(raw).replace(',', ''))
+    except ValueError:
+        return None
+
+
+def format_amount(amount):
+    """1299.0 -> "Rs. 1,299", like the storefront"""
+    if amount is None:
+        return "N/A"
+    if amount == int(amount):
+        return f"Rs. {amount:,.0f}"
+    return f"Rs. {amount:,.2f}"
+
+
+# ==================== EXTRACTION ====================
+def variants_from_product(product):
+    """Variants from Shopify product JSON (.json, .js or the page's embedded product JSON)"""
+    names = [o.get('name', '') if isinstance(o, dict) else str(o) for o in product.get('options') or []]
+    size_at = next((i for i, name in enumerate(names) if SIZE_OPTION_RE.search(name)), None)
+    colour_at = next((i for i, name in enumerate(names) if COLOUR_OPTION_RE.search(name)), None)
+
+    variants = []
+    for v in product.get('variants') or []:
+        title = v.get('title') or v.get('public_title') or v.get('name') or ""
+        values = [v.get(f'option{n}') for n in (1, 2, 3)]
+        if not any(values):
+            values = [part.strip() for part in title.split(' / ')]
+
+        size = values[size_at] if size_at is not None and size_at < len(values) else None
+        colour = values[colour_at] if colour_at is not None and colour_at < len(values) else None
+        if size_at is None and colour_at is None:
+            # No option names to go by: a size-like value is the size, the first other value the colour
+            size = next((value for value in values if value and SIZE_VALUE_RE.match(value)), None)
+            colour = next((value for value in values if value and value != size and value != 'Default Title'), None)
+
+        available = v.get('available')
+        variants.append(Variant(
+            id=v.get('id'),
+            sku=v.get('sku') or None,
+            title=title or None,
+            size=size,
+            colour=colour,
+            price=parse_amount(v.get('price')),
+            compare_at_price=parse_amount(v.get('compare_at_price')),
+            available=None if available is None else bool(available),
+        ))
+    return tuple(variants)
+
+
+def variants_from_offers(data):
+    """Variants from schema.org Product JSON-LD offers (no options - size/colour come from the offer name)"""
+    products = data if isinstance(data, list) else data.get('@graph', [data])
+    for product in products:
+        if not isinstance(product, dict) or product.get('@type') != 'Product':
+            continue
+        offers = product.get('offers') or []
+        offers = offers if isinstance(offers, list) else [offers]
+        prefix = f"{product.get('name')} - "
+        return variants_from_product({'variants': [
+            {
+                'id': None,
+                'sku': offer.get('sku'),
+                # Offer names are often "<product> - <variant>"
+                'title': (offer.get('name') or "").replace(prefix, '', 1) or None,
+                'price': str(offer.get('price')) if offer.get('price') is not None else None,
+                'available': 'instock' in str(offer.get('availability', '')).lower() if offer.get('availability') else None,
+            }
+            for offer in offers if isinstance(offer, dict)
+        ]})
+    return ()
+
+
+def variants_from_html(html):
+    """Variants from the product data a Shopify page embeds; () when the page has none"""
+    if not html:
+        return ()
+
+    for match in PRODUCT_JSON_RE.finditer(html):
+        try:
+            data = json.loads(match.group(1))
+        except ValueError:
+            continue
+        product = data.get('product', data) if isinstance(data, dict) else None
+        if product and product.get('variants'):
+            return variants_from_product(product)
+
+    match = META_JSON_RE.search(html)
+    if match:
+        try:
+            product = json.loads(match.group(1)).get('product') or {}
+        except ValueError:
+            product = {}
+        if product.get('variants'):
+            return variants_from_product(product)
+
+    for match in LD_JSON_RE.finditer(html):
+        try:
+            variants = variants_from_offers(json.loads(match.group(1)))
+        except (ValueError, AttributeError):
+            continue
+        if variants:
+            return variants
+    return ()
+
+
+# ==================== EXPORT ROWS ====================
+def availability(value):
+    if value is None:
+        return "N/A"
+    return "In stock" if value else "Sold out"
+
+
+def summarize(variants):
+    """Product-row summary of a product's variants"""
+    sizes = dict.fromkeys(v.size for v in variants if v.size)
+    colours = dict.fromkeys(v.colour for v in variants if v.colour)
+    return {
+        "Sizes": " | ".join(sizes) or "N/A",
+        "Colours": " | ".join(colours) or "N/A",
+        "Variant Count": len(variants),
+        "In Stock Variants": sum(1 for v in variants if v.available),
+    }
+
+
+def product_row(record):
+    """One flat row for a product, its variants summarized"""
+    row = {key: value for key, value in record.items() if key != "Variants"}
+    row.update(summarize(as_variants(record.get("Variants"))))
+    return row
+
+
+def variant_rows(record):
+    """One flat row per variant, each repeating the product's fields (one row with "N/A"s if it has none)"""
+    base = {key: value for key, value in record.items() if key != "Variants"}
+    for v in as_variants(record.get("Variants")) or (Variant(*[None] * len(VARIANT_FIELDS)),):
+        row = dict(base)
+        row.update({
+            "Variant ID": v.id if v.id is not None else "N/A",
+            "SKU": v.sku or "N/A",
+            "Size": v.size or "N/A",
+            "Colour": v.colour or "N/A",
+            "Variant Title": v.title or "N/A",
+            "Variant Price": format_amount(v.price),
+            "Compare At Price": format_amount(v.compare_at_price),
+            "Availability": availability(v.available),
+        })
+        yield row
+
+
+def export_rows(record, rows='product'):
+    """The rows one record becomes in an export ('product' or 'variant', see EXPORT_ROWS)"""
+    if rows == 'variant':
+        return list(variant_rows(record))
+    return [product_row(record)]